@@ -0,0 +1,83 @@
+"""Baseline schema (the five tables Base.metadata.create_all made before migrations)
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+question_type = sa.Enum("MULTIPLE_CHOICE", "SHORT_ANSWER", "ESSAY", name="questiontype")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "question_sets",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("file_name", sa.String(255), nullable=True),
+        sa.Column("file_path", sa.String(500), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_question_sets_id", "question_sets", ["id"])
+    
+    op.create_table(
+        "questions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("question_set_id", sa.Integer(), sa.ForeignKey("question_sets.id"), nullable=False),
+        sa.Column("type", question_type, nullable=False),
+        sa.Column("stem", sa.Text(), nullable=False),
+        sa.Column("answer", sa.Text(), nullable=False),
+        sa.Column("explanation", sa.Text(), nullable=True),
+        sa.Column("order_index", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_questions_id", "questions", ["id"])
+    
+    op.create_table(
+        "choices",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("question_id", sa.Integer(), sa.ForeignKey("questions.id"), nullable=False),
+        sa.Column("label", sa.String(10), nullable=False),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.Column("order_index", sa.Integer(), nullable=False),
+    )
+    op.create_index("ix_choices_id", "choices", ["id"])
+    
+    op.create_table(
+        "bookmarks",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("question_id", sa.Integer(), sa.ForeignKey("questions.id"), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_bookmarks_id", "bookmarks", ["id"])
+    
+    op.create_table(
+        "attempt_history",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("question_id", sa.Integer(), sa.ForeignKey("questions.id"), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("is_correct", sa.Boolean(), nullable=False),
+        sa.Column("user_answer", sa.Text(), nullable=True),
+        sa.Column("time_spent_seconds", sa.Float(), nullable=True),
+        sa.Column("attempted_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_attempt_history_id", "attempt_history", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("attempt_history")
+    op.drop_table("bookmarks")
+    op.drop_table("choices")
+    op.drop_table("questions")
+    op.drop_table("question_sets")
+    question_type.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,33 @@
+"""LLM response cache table
+
+Revision ID: 0002_llm_cache_entries
+Revises: 0001_baseline
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002_llm_cache_entries"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_cache_entries",
+        sa.Column("cache_key", sa.String(64), primary_key=True),
+        sa.Column("model_name", sa.String(100), nullable=False),
+        sa.Column("question_type", sa.String(50), nullable=True),
+        sa.Column("num_questions", sa.Integer(), nullable=False),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("last_accessed_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_llm_cache_entries_last_accessed_at", "llm_cache_entries", ["last_accessed_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("llm_cache_entries")
@@ -0,0 +1,44 @@
+"""Background upload job table
+
+Revision ID: 0003_upload_jobs
+Revises: 0002_llm_cache_entries
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003_upload_jobs"
+down_revision = "0002_llm_cache_entries"
+branch_labels = None
+depends_on = None
+
+
+job_status = sa.Enum("QUEUED", "RUNNING", "COMPLETED", "FAILED", name="jobstatus")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "upload_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("file_type", sa.String(10), nullable=False),
+        sa.Column("file_name", sa.String(255), nullable=False),
+        sa.Column("file_path", sa.String(500), nullable=False),
+        sa.Column("status", job_status, nullable=False),
+        sa.Column("stage", sa.String(50), nullable=False),
+        sa.Column("pages_total", sa.Integer(), nullable=True),
+        sa.Column("pages_done", sa.Integer(), nullable=True),
+        sa.Column("processing_mode", sa.String(20), nullable=True),
+        sa.Column("question_set_id", sa.Integer(), nullable=True),
+        sa.Column("questions_count", sa.Integer(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_upload_jobs_id", "upload_jobs", ["id"])
+    op.create_index("ix_upload_jobs_status", "upload_jobs", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_table("upload_jobs")
+    job_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,32 @@
+"""Per-question attempt statistics table
+
+Revision ID: 0004_question_stats
+Revises: 0003_upload_jobs
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004_question_stats"
+down_revision = "0003_upload_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing history is folded in with `python -m app.cli backfill-stats`
+    op.create_table(
+        "question_stats",
+        sa.Column("question_id", sa.Integer(), sa.ForeignKey("questions.id"), primary_key=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("corrects", sa.Integer(), nullable=False),
+        sa.Column("accuracy", sa.Float(), nullable=False),
+        sa.Column("rolling_accuracy", sa.Float(), nullable=False),
+        sa.Column("last_attempted_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_question_stats_accuracy_attempts", "question_stats", ["accuracy", "attempts"])
+
+
+def downgrade() -> None:
+    op.drop_table("question_stats")
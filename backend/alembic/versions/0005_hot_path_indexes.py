@@ -0,0 +1,35 @@
+"""Indexes for the hot query paths and unique bookmarks
+
+Revision ID: 0005_hot_path_indexes
+Revises: 0004_question_stats
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+
+revision = "0005_hot_path_indexes"
+down_revision = "0004_question_stats"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_questions_set_order", "questions", ["question_set_id", "order_index"])
+    op.create_index("ix_questions_type_set", "questions", ["type", "question_set_id"])
+    op.create_index("ix_choices_question_order", "choices", ["question_id", "order_index"])
+    op.create_index("ix_attempt_history_question_attempted", "attempt_history", ["question_id", "attempted_at"])
+    
+    # Keep the oldest bookmark per question before enforcing uniqueness
+    op.execute(
+        "DELETE FROM bookmarks a USING bookmarks b "
+        "WHERE a.question_id = b.question_id AND a.id > b.id"
+    )
+    op.create_unique_constraint("uq_bookmarks_question_id", "bookmarks", ["question_id"])
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_bookmarks_question_id", "bookmarks", type_="unique")
+    op.drop_index("ix_attempt_history_question_attempted", table_name="attempt_history")
+    op.drop_index("ix_choices_question_order", table_name="choices")
+    op.drop_index("ix_questions_type_set", table_name="questions")
+    op.drop_index("ix_questions_set_order", table_name="questions")
@@ -0,0 +1,23 @@
+"""Extend the (question_set_id, order_index) index with id for keyset pagination
+
+Revision ID: 0006_questions_keyset_index
+Revises: 0005_hot_path_indexes
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+
+revision = "0006_questions_keyset_index"
+down_revision = "0005_hot_path_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_questions_keyset", "questions", ["question_set_id", "order_index", "id"])
+    op.drop_index("ix_questions_set_order", table_name="questions")
+
+
+def downgrade() -> None:
+    op.create_index("ix_questions_set_order", "questions", ["question_set_id", "order_index"])
+    op.drop_index("ix_questions_keyset", table_name="questions")
@@ -0,0 +1,31 @@
+"""Server-side quiz sessions
+
+Revision ID: 0007_quiz_sessions
+Revises: 0006_questions_keyset_index
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007_quiz_sessions"
+down_revision = "0006_questions_keyset_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "quiz_sessions",
+        sa.Column("id", sa.String(32), primary_key=True),
+        sa.Column("question_ids", sa.LargeBinary(), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("seed", sa.Integer(), nullable=False),
+        sa.Column("shuffle_choices", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("quiz_sessions")
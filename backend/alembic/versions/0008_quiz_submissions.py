@@ -0,0 +1,27 @@
+"""Idempotency records for batch answer submissions
+
+Revision ID: 0008_quiz_submissions
+Revises: 0007_quiz_sessions
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008_quiz_submissions"
+down_revision = "0007_quiz_sessions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "quiz_submissions",
+        sa.Column("submission_id", sa.String(64), primary_key=True),
+        sa.Column("response", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("quiz_submissions")
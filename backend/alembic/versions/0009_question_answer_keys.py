@@ -0,0 +1,26 @@
+"""Precomputed normalized answer keys on questions
+
+Revision ID: 0009_question_answer_keys
+Revises: 0008_quiz_submissions
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009_question_answer_keys"
+down_revision = "0008_quiz_submissions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows keep NULL keys; grading derives them on the fly until
+    # `python -m app.cli backfill-answer-keys` fills them in.
+    op.add_column("questions", sa.Column("answer_key", sa.Text(), nullable=True))
+    op.add_column("questions", sa.Column("accepted_answers", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("questions", "accepted_answers")
+    op.drop_column("questions", "answer_key")
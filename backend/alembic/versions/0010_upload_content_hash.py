@@ -0,0 +1,28 @@
+"""SHA-256 content hash and size of uploaded files
+
+Revision ID: 0010_upload_content_hash
+Revises: 0009_question_answer_keys
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0010_upload_content_hash"
+down_revision = "0009_question_answer_keys"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("question_sets", sa.Column("content_hash", sa.String(64), nullable=True))
+    op.create_index("ix_question_sets_content_hash", "question_sets", ["content_hash"])
+    op.add_column("upload_jobs", sa.Column("file_size", sa.Integer(), nullable=True))
+    op.add_column("upload_jobs", sa.Column("content_hash", sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("upload_jobs", "content_hash")
+    op.drop_column("upload_jobs", "file_size")
+    op.drop_index("ix_question_sets_content_hash", table_name="question_sets")
+    op.drop_column("question_sets", "content_hash")
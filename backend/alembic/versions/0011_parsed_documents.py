@@ -0,0 +1,30 @@
+"""Parsed-question cache keyed by uploaded file hash
+
+Revision ID: 0011_parsed_documents
+Revises: 0010_upload_content_hash
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0011_parsed_documents"
+down_revision = "0010_upload_content_hash"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "parsed_documents",
+        sa.Column("content_hash", sa.String(64), primary_key=True),
+        sa.Column("file_type", sa.String(10), nullable=False),
+        sa.Column("processing_mode", sa.String(20), nullable=False),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.Column("questions_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("parsed_documents")
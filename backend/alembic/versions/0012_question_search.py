@@ -0,0 +1,47 @@
+"""Full-text and trigram search over question stems, answers and explanations
+
+Revision ID: 0012_question_search
+Revises: 0011_parsed_documents
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0012_question_search"
+down_revision = "0011_parsed_documents"
+branch_labels = None
+depends_on = None
+
+SEARCH_TEXT_SQL = "stem || ' ' || answer || ' ' || coalesce(explanation, '')"
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    
+    # Stored generated columns: Postgres maintains them on every insert/update
+    op.add_column(
+        "questions",
+        sa.Column("search_text", sa.Text(), sa.Computed(SEARCH_TEXT_SQL, persisted=True)),
+    )
+    op.add_column(
+        "questions",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(f"to_tsvector('simple', {SEARCH_TEXT_SQL})", persisted=True),
+        ),
+    )
+    op.create_index("ix_questions_search_vector", "questions", ["search_vector"], postgresql_using="gin")
+    op.create_index(
+        "ix_questions_search_trgm", "questions", ["search_text"],
+        postgresql_using="gin", postgresql_ops={"search_text": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_questions_search_trgm", table_name="questions")
+    op.drop_index("ix_questions_search_vector", table_name="questions")
+    op.drop_column("questions", "search_vector")
+    op.drop_column("questions", "search_text")
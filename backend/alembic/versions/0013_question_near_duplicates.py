@@ -0,0 +1,37 @@
+"""MinHash signatures and LSH buckets for near-duplicate questions
+
+Revision ID: 0013_question_near_duplicates
+Revises: 0012_question_search
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0013_question_near_duplicates"
+down_revision = "0012_question_search"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing questions get signatures from `python -m app.cli backfill-signatures`
+    op.create_table(
+        "question_signatures",
+        sa.Column("question_id", sa.Integer(), sa.ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("signature", sa.LargeBinary(), nullable=False),
+        sa.Column("duplicate_of_id", sa.Integer(), sa.ForeignKey("questions.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("similarity", sa.Float(), nullable=True),
+    )
+    op.create_table(
+        "question_lsh_buckets",
+        sa.Column("bucket_key", sa.BigInteger(), primary_key=True),
+        sa.Column("question_id", sa.Integer(), sa.ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True),
+    )
+    op.create_index("ix_question_lsh_buckets_question_id", "question_lsh_buckets", ["question_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_question_lsh_buckets_question_id", table_name="question_lsh_buckets")
+    op.drop_table("question_lsh_buckets")
+    op.drop_table("question_signatures")
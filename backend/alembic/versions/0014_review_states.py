@@ -0,0 +1,34 @@
+"""Spaced-repetition review state per question
+
+Revision ID: 0014_review_states
+Revises: 0013_question_near_duplicates
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0014_review_states"
+down_revision = "0013_question_near_duplicates"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing history is replayed with `python -m app.cli backfill-review-states`
+    op.create_table(
+        "review_states",
+        sa.Column("question_id", sa.Integer(), sa.ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("due_at", sa.DateTime(), nullable=False),
+        sa.Column("ease_factor", sa.Float(), nullable=False),
+        sa.Column("interval_days", sa.Float(), nullable=False),
+        sa.Column("repetitions", sa.Integer(), nullable=False),
+        sa.Column("lapses", sa.Integer(), nullable=False),
+        sa.Column("last_reviewed_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_review_states_due_at", "review_states", ["due_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_review_states_due_at", table_name="review_states")
+    op.drop_table("review_states")
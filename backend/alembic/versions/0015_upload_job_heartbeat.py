@@ -0,0 +1,23 @@
+"""Heartbeat column for claiming upload jobs across processes
+
+Revision ID: 0015_upload_job_heartbeat
+Revises: 0014_review_states
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0015_upload_job_heartbeat"
+down_revision = "0014_review_states"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # RUNNING jobs without a heartbeat count as expired and are re-queued
+    op.add_column("upload_jobs", sa.Column("heartbeat_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("upload_jobs", "heartbeat_at")
@@ -0,0 +1,71 @@
+"""
+Maintenance commands.
+
+Usage:
+    python -m app.cli backfill-stats
+    python -m app.cli backfill-answer-keys
+    python -m app.cli backfill-signatures
+    python -m app.cli rebuild-signatures
+    python -m app.cli backfill-review-states
+"""
+import argparse
+import asyncio
+
+from app.database import AsyncSessionLocal, engine
+from app.services.question_stats import backfill_question_stats
+from app.services.grading import backfill_answer_keys
+from app.services.near_duplicates import backfill_signatures
+from app.services.review_scheduler import backfill_review_states
+
+
+async def run_backfill_stats():
+    async with AsyncSessionLocal() as session:
+        written = await backfill_question_stats(session)
+        await session.commit()
+    print(f"Rebuilt statistics for {written} questions.")
+
+
+async def run_backfill_review_states():
+    async with AsyncSessionLocal() as session:
+        written = await backfill_review_states(session)
+        await session.commit()
+    print(f"Rebuilt review schedules for {written} questions.")
+
+
+async def run_backfill_answer_keys():
+    async with AsyncSessionLocal() as session:
+        updated = await backfill_answer_keys(session)
+    print(f"Computed answer keys for {updated} questions.")
+
+
+async def run_backfill_signatures(rebuild: bool = False):
+    async with AsyncSessionLocal() as session:
+        written = await backfill_signatures(session, rebuild=rebuild)
+    print(f"Computed near-duplicate signatures for {written} questions.")
+
+
+async def run_rebuild_signatures():
+    await run_backfill_signatures(rebuild=True)
+
+
+COMMANDS = {
+    "backfill-stats": run_backfill_stats,
+    "backfill-answer-keys": run_backfill_answer_keys,
+    "backfill-signatures": run_backfill_signatures,
+    "rebuild-signatures": run_rebuild_signatures,
+    "backfill-review-states": run_backfill_review_states,
+}
+
+
+async def main(command: str):
+    try:
+        await COMMANDS[command]()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Question bank maintenance commands")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    args = parser.parse_args()
+    asyncio.run(main(args.command))
@@ -9,10 +9,60 @@ class Settings(BaseSettings):
     
     # File storage
     file_storage_path: str = "./uploads"
+    max_upload_bytes: int = 200 * 1024 * 1024  # Larger uploads are rejected with 413
+    upload_chunk_bytes: int = 1024 * 1024  # Read/write size while streaming to disk
     
     # Ollama / LLM
     ollama_base_url: str = "http://localhost:11434"
     llm_model_name: str = "gemma3:12b"
+    ollama_timeout_seconds: float = 300.0  # Read timeout between streamed tokens
+    ollama_connect_timeout_seconds: float = 10.0
+    llm_max_in_flight: int = 2  # Concurrent generations sent to Ollama
+    
+    # Document chunking for generation
+    llm_chunk_max_tokens: int = 3000  # Token budget per document chunk
+    llm_chars_per_token: float = 1.5  # Rough estimate for Korean text
+    llm_chunk_concurrency: int = 2  # Chunks of one document generated at once
+    
+    # LLM response cache
+    llm_cache_enabled: bool = True
+    llm_cache_ttl_seconds: int = 7 * 24 * 3600
+    llm_cache_max_bytes: int = 256 * 1024 * 1024
+    
+    # Document parsing (process pool)
+    parse_workers: int = 2
+    parse_max_tasks_per_child: int = 20  # Recycle workers to release pdfplumber memory; 0 disables
+    pdf_min_pages_per_shard: int = 10  # Smaller PDFs are analyzed by a single worker
+    
+    # Background upload jobs
+    upload_job_workers: int = 4
+    upload_job_queue_size: int = 100  # Uploads beyond this are rejected with 503
+    upload_job_parse_slots: int = 2  # Jobs parsing at the same time
+    upload_job_llm_slots: int = 1  # Jobs generating with the LLM at the same time
+    upload_job_lease_seconds: int = 120  # Running jobs without a heartbeat for this long are taken over
+    
+    # Question import
+    bulk_copy_threshold: int = 2000  # Questions imported at once beyond this size are written with COPY
+    
+    # Near-duplicate detection at ingest (MinHash + LSH)
+    near_duplicate_action: str = "flag"  # flag, skip or off
+    near_duplicate_threshold: float = 0.8  # Estimated Jaccard similarity of stem+choice shingles
+    minhash_num_perm: int = 64  # Changing these requires `python -m app.cli rebuild-signatures`
+    minhash_bands: int = 16
+    minhash_shingle_size: int = 3
+    
+    # In-process cache of encoded question payloads (per API process)
+    question_cache_max_bytes: int = 64 * 1024 * 1024
+    question_cache_ttl_seconds: int = 300  # Bounds staleness from edits made outside this process
+    question_cache_unchecked_ttl_seconds: int = 10  # Max age served by GET /questions/{id}, which skips the existence query
+    
+    # Grading: minimum jamo-level similarity accepted for short answers (1.0 = exact only)
+    grading_fuzzy_threshold: float = 1.0  # Opt in with e.g. 0.85
+    grading_fuzzy_min_length: int = 6  # Shorter answer keys (jamo/letters) are always exact
+    grading_fuzzy_max_edits: int = 1
+    
+    # Question statistics
+    stats_rolling_alpha: float = 0.3  # Weight of the newest attempt in question_stats.rolling_accuracy
     
     # CORS
     cors_origins: list[str] = ["http://localhost:5173", "http://localhost:3000"]
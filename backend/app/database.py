@@ -1,3 +1,6 @@
+from pathlib import Path
+
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
@@ -39,7 +42,47 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+BASELINE_REVISION = "0001_baseline"
+# Tables create_all() added after the baseline, in the order they appeared,
+# with the revision that creates each one
+CREATE_ALL_REVISIONS = [
+    ("llm_cache_entries", "0002_llm_cache_entries"),
+    ("upload_jobs", "0003_upload_jobs"),
+    ("question_stats", "0004_question_stats"),
+]
+
+
+def create_all_revision(tables) -> str:
+    """The revision an unversioned database created by create_all() is at."""
+    revision = BASELINE_REVISION
+    for table, table_revision in CREATE_ALL_REVISIONS:
+        if table not in tables:
+            break
+        revision = table_revision
+    return revision
+
+
+def run_migrations(connection):
+    """Upgrade the schema to the latest Alembic revision (runs on a sync connection)."""
+    from alembic import command
+    from alembic.config import Config
+    
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    config.attributes["connection"] = connection
+    
+    # Databases created by the old create_all() have tables but no version:
+    # stamp the last revision whose tables they already have and migrate
+    # from there.
+    tables = inspect(connection).get_table_names()
+    if "alembic_version" not in tables and "questions" in tables:
+        command.stamp(config, create_all_revision(tables))
+    
+    command.upgrade(config, "head")
+
+
 async def init_db():
-    """Initialize database tables."""
+    """Initialize database tables by applying pending migrations."""
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(run_migrations)
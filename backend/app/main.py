@@ -4,7 +4,12 @@ from contextlib import asynccontextmanager
 
 from app.config import settings
 from app.database import init_db
+from app.responses import FastJSONResponse
 from app.routers import upload, questions, quiz, bookmarks
+from app.routers.upload import UploadSizeLimitMiddleware
+from app.services.parsing_service import shutdown_parser_pool
+from app.services.ollama_client import ollama_client
+from app.services.upload_jobs import upload_queue
 
 
 @asynccontextmanager
@@ -14,9 +19,13 @@ async def lifespan(app: FastAPI):
     print("Initializing database...")
     await init_db()
     print("Database initialized.")
+    await upload_queue.start()
     yield
     # Shutdown
     print("Shutting down...")
+    await upload_queue.stop()
+    shutdown_parser_pool()
+    await ollama_client.aclose()
 
 
 app = FastAPI(
@@ -24,9 +33,13 @@ app = FastAPI(
     description="AI-powered question extraction and quiz platform",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
-# CORS middleware
+# Reject oversized uploads before the multipart parser spools them to disk
+app.add_middleware(UploadSizeLimitMiddleware, path_prefix="/api/upload")
+
+# CORS middleware (added last so it wraps every response, 413s included)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, Text, Integer, Float, Boolean, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import String, Text, Integer, BigInteger, Float, Boolean, DateTime, LargeBinary, ForeignKey, Index, UniqueConstraint, Computed, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 import enum
 
@@ -14,6 +15,14 @@ class QuestionType(str, enum.Enum):
     ESSAY = "essay"
 
 
+class JobStatus(str, enum.Enum):
+    """Background upload job status."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
 class QuestionSet(Base):
     """Question set / file upload grouping."""
     __tablename__ = "question_sets"
@@ -23,15 +32,32 @@ class QuestionSet(Base):
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     file_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     file_path: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, index=True)  # SHA-256 of the uploaded file
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     
     # Relationships
     questions: Mapped[list["Question"]] = relationship("Question", back_populates="question_set", cascade="all, delete-orphan")
 
 
+# Everything searchable about a question, kept in sync by Postgres
+QUESTION_SEARCH_TEXT_SQL = "stem || ' ' || answer || ' ' || coalesce(explanation, '')"
+
+
 class Question(Base):
     """Question model."""
     __tablename__ = "questions"
+    __table_args__ = (
+        # Listing a set in order / filtering by set / keyset pagination
+        Index("ix_questions_keyset", "question_set_id", "order_index", "id"),
+        # Filtering by type (optionally narrowed by set)
+        Index("ix_questions_type_set", "type", "question_set_id"),
+        # Full-text search: whole words/prefixes, and substrings inside Korean words
+        Index("ix_questions_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_questions_search_trgm", "search_text",
+            postgresql_using="gin", postgresql_ops={"search_text": "gin_trgm_ops"}
+        ),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     question_set_id: Mapped[int] = mapped_column(Integer, ForeignKey("question_sets.id"), nullable=False)
@@ -39,19 +65,31 @@ class Question(Base):
     stem: Mapped[str] = mapped_column(Text, nullable=False)  # 문제 본문
     answer: Mapped[str] = mapped_column(Text, nullable=False)  # 정답 (JSON 또는 텍스트)
     explanation: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # 해설
+    answer_key: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # 채점용 정규화 정답
+    accepted_answers: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # 정규화된 동의어 정답 (JSON)
     order_index: Mapped[int] = mapped_column(Integer, default=0)  # 문제 순서
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    search_text: Mapped[str] = mapped_column(
+        Text, Computed(QUESTION_SEARCH_TEXT_SQL, persisted=True), deferred=True
+    )
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR, Computed(f"to_tsvector('simple', {QUESTION_SEARCH_TEXT_SQL})", persisted=True), deferred=True
+    )
     
     # Relationships
     question_set: Mapped["QuestionSet"] = relationship("QuestionSet", back_populates="questions")
     choices: Mapped[list["Choice"]] = relationship("Choice", back_populates="question", cascade="all, delete-orphan")
     bookmarks: Mapped[list["Bookmark"]] = relationship("Bookmark", back_populates="question", cascade="all, delete-orphan")
     attempts: Mapped[list["AttemptHistory"]] = relationship("AttemptHistory", back_populates="question", cascade="all, delete-orphan")
+    stats: Mapped[Optional["QuestionStat"]] = relationship("QuestionStat", back_populates="question", cascade="all, delete-orphan", uselist=False)
 
 
 class Choice(Base):
     """Multiple choice option."""
     __tablename__ = "choices"
+    __table_args__ = (
+        Index("ix_choices_question_order", "question_id", "order_index"),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     question_id: Mapped[int] = mapped_column(Integer, ForeignKey("questions.id"), nullable=False)
@@ -66,6 +104,9 @@ class Choice(Base):
 class Bookmark(Base):
     """Bookmarked questions."""
     __tablename__ = "bookmarks"
+    __table_args__ = (
+        UniqueConstraint("question_id", name="uq_bookmarks_question_id"),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     question_id: Mapped[int] = mapped_column(Integer, ForeignKey("questions.id"), nullable=False)
@@ -79,6 +120,9 @@ class Bookmark(Base):
 class AttemptHistory(Base):
     """Question attempt history for tracking correct/incorrect answers."""
     __tablename__ = "attempt_history"
+    __table_args__ = (
+        Index("ix_attempt_history_question_attempted", "question_id", "attempted_at"),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     question_id: Mapped[int] = mapped_column(Integer, ForeignKey("questions.id"), nullable=False)
@@ -90,3 +134,126 @@ class AttemptHistory(Base):
     
     # Relationships
     question: Mapped["Question"] = relationship("Question", back_populates="attempts")
+
+
+class QuestionStat(Base):
+    """Per-question attempt statistics, updated incrementally on every submission."""
+    __tablename__ = "question_stats"
+    __table_args__ = (
+        Index("ix_question_stats_accuracy_attempts", "accuracy", "attempts"),
+    )
+    
+    question_id: Mapped[int] = mapped_column(Integer, ForeignKey("questions.id"), primary_key=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    corrects: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    accuracy: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)  # corrects / attempts
+    rolling_accuracy: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)  # 최근 풀이 가중 정답률 (EMA)
+    last_attempted_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    
+    # Relationships
+    question: Mapped["Question"] = relationship("Question", back_populates="stats")
+
+
+class ReviewState(Base):
+    """Spaced-repetition (SM-2) schedule of a question, advanced on every graded attempt."""
+    __tablename__ = "review_states"
+    
+    question_id: Mapped[int] = mapped_column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True)
+    due_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    ease_factor: Mapped[float] = mapped_column(Float, default=2.5, nullable=False)
+    interval_days: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    repetitions: Mapped[int] = mapped_column(Integer, default=0, nullable=False)  # 연속 정답 횟수
+    lapses: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_reviewed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+
+class QuestionSignature(Base):
+    """MinHash signature of a question's stem and choices, and the near-duplicate it was flagged against."""
+    __tablename__ = "question_signatures"
+    
+    question_id: Mapped[int] = mapped_column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True)
+    signature: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)  # Packed uint32 array
+    duplicate_of_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("questions.id", ondelete="SET NULL"), nullable=True)
+    similarity: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # Estimated Jaccard with duplicate_of_id
+
+
+class QuestionLshBucket(Base):
+    """LSH band bucket membership; questions sharing any bucket are near-duplicate candidates."""
+    __tablename__ = "question_lsh_buckets"
+    __table_args__ = (
+        Index("ix_question_lsh_buckets_question_id", "question_id"),
+    )
+    
+    bucket_key: Mapped[int] = mapped_column(BigInteger, primary_key=True)  # Hash of (band, band values)
+    question_id: Mapped[int] = mapped_column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True)
+
+
+class LlmCacheEntry(Base):
+    """Cached LLM generation result, keyed by a hash of prompt and parameters."""
+    __tablename__ = "llm_cache_entries"
+    
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)  # SHA-256 hex
+    model_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    question_type: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    num_questions: Mapped[int] = mapped_column(Integer, nullable=False)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)  # 파싱된 문제 JSON
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    last_accessed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+
+
+class ParsedDocument(Base):
+    """Questions parsed (or generated) from an uploaded file, keyed by its SHA-256."""
+    __tablename__ = "parsed_documents"
+    
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)  # SHA-256 hex
+    file_type: Mapped[str] = mapped_column(String(10), nullable=False)  # pdf, docx
+    processing_mode: Mapped[str] = mapped_column(String(20), nullable=False)  # extracted, generated
+    payload: Mapped[str] = mapped_column(Text, nullable=False)  # 파싱된 문제 JSON
+    questions_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class UploadJob(Base):
+    """Background processing job for an uploaded file (parse -> generate -> persist)."""
+    __tablename__ = "upload_jobs"
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    file_type: Mapped[str] = mapped_column(String(10), nullable=False)  # pdf, docx
+    file_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    file_path: Mapped[str] = mapped_column(String(500), nullable=False)
+    file_size: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    status: Mapped[JobStatus] = mapped_column(SQLEnum(JobStatus), default=JobStatus.QUEUED, index=True)
+    stage: Mapped[str] = mapped_column(String(50), default="queued")  # queued, parsing, generating, saving, done
+    pages_total: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    pages_done: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    processing_mode: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)  # extracted, generated, reused, cloned, cached
+    question_set_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    questions_count: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)  # Refreshed while RUNNING
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class QuizSession(Base):
+    """Server-side quiz session: a seeded permutation of question ids served in pages."""
+    __tablename__ = "quiz_sessions"
+    
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)  # uuid4 hex
+    question_ids: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)  # Packed int32 array
+    total: Mapped[int] = mapped_column(Integer, nullable=False)
+    position: Mapped[int] = mapped_column(Integer, default=0, nullable=False)  # Next index to serve
+    seed: Mapped[int] = mapped_column(Integer, nullable=False)
+    shuffle_choices: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class QuizSubmission(Base):
+    """Processed batch submission, stored so client retries are idempotent."""
+    __tablename__ = "quiz_submissions"
+    
+    submission_id: Mapped[str] = mapped_column(String(64), primary_key=True)  # Client-supplied
+    response: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # 채점 결과 JSON
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
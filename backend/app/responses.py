@@ -0,0 +1,42 @@
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib encoder produces the same JSON
+    orjson = None
+
+
+def _encode_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def json_dumps(value: Any) -> bytes:
+    """
+    Encode a payload as compact UTF-8 JSON, non-ASCII kept as is.
+
+    Uses orjson when it is installed. Dates and datetimes become ISO 8601
+    strings with either encoder.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        value, ensure_ascii=False, separators=(",", ":"), default=_encode_default
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Default response class of the API, rendering through json_dumps.
+
+    Endpoints that build large payloads from plain dicts and lists return it
+    directly, which also skips FastAPI's jsonable_encoder pass.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
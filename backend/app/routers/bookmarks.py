@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from pydantic import BaseModel
 
 from app.database import get_db
@@ -23,29 +24,28 @@ async def create_bookmark(
     """Create a bookmark for a question."""
     
     # Check if question exists
-    result = await db.execute(
-        select(Question).where(Question.id == request.question_id)
+    question_id = await db.scalar(
+        select(Question.id).where(Question.id == request.question_id)
     )
-    question = result.scalar_one_or_none()
     
-    if not question:
+    if question_id is None:
         raise HTTPException(status_code=404, detail="Question not found")
     
-    # Check if already bookmarked
-    existing = await db.execute(
-        select(Bookmark).where(Bookmark.question_id == request.question_id)
+    # Insert unless already bookmarked; a concurrent create of the same
+    # bookmark waits on the unique constraint instead of failing with it
+    bookmark_id = await db.scalar(
+        pg_insert(Bookmark)
+        .values(question_id=request.question_id)
+        .on_conflict_do_nothing(index_elements=[Bookmark.question_id])
+        .returning(Bookmark.id)
     )
-    if existing.scalar_one_or_none():
+    if bookmark_id is None:
         raise HTTPException(status_code=400, detail="Question already bookmarked")
-    
-    # Create bookmark
-    bookmark = Bookmark(question_id=request.question_id)
-    db.add(bookmark)
     await db.commit()
     
     return {
         "message": "Bookmark created successfully",
-        "bookmark_id": bookmark.id,
+        "bookmark_id": bookmark_id,
         "question_id": request.question_id
     }
 
@@ -1,12 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import contextlib
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Literal
 
-from app.database import get_db
-from app.models import Question, Choice, QuestionSet, QuestionType
-from app.services.llm_service import generate_questions_from_content
+from app.config import settings
+from app.database import get_db, AsyncSessionLocal
+from app.responses import FastJSONResponse, json_dumps
+from app.models import Question, QuestionSet, QuestionType, QuestionSignature
+from app.services.llm_service import generate_questions_from_content, stream_questions_from_content
+from app.services import llm_cache
+from app.services.question_store import bulk_insert_questions
+from app.services.question_search import search_questions as run_search
+from app.services.near_duplicates import find_similar_questions
+from app.services.pagination import encode_cursor, decode_cursor
+from app.services.serializers import serialize_questions
+from app.services.payload_cache import (
+    get_question_payloads,
+    question_payloads,
+    raw_object,
+    render_questions,
+)
 
 
 router = APIRouter()
@@ -18,6 +35,7 @@ class GenerateQuestionsRequest(BaseModel):
     num_questions: int = 10
     question_type: Optional[str] = "multiple_choice"
     question_set_name: Optional[str] = "AI Generated Questions"
+    use_cache: bool = True  # False forces a fresh LLM generation
 
 
 class QuestionResponse(BaseModel):
@@ -36,13 +54,26 @@ class QuestionResponse(BaseModel):
 async def get_questions(
     question_set_id: Optional[int] = Query(None),
     question_type: Optional[str] = Query(None),
-    limit: int = Query(50, le=100),
-    offset: int = Query(0),
+    limit: int = Query(50, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    pagination: Literal["offset", "cursor"] = Query("offset"),
+    cursor: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get questions with optional filtering."""
+    """
+    Get questions with optional filtering.
+    
+    Results are ordered by (question_set_id, order_index, id). The default
+    offset mode returns a list. Cursor mode (pagination=cursor, or any
+    `cursor` value) returns {"items", "next_cursor"} and seeks directly
+    to the next page, so deep pages cost the same as the first.
+    
+    Only the sort key is read from the table; payloads come from the
+    question payload cache.
+    """
     
-    query = select(Question)
+    sort_key = (Question.question_set_id, Question.order_index, Question.id)
+    query = select(*sort_key)
     
     if question_set_id:
         query = query.where(Question.question_set_id == question_set_id)
@@ -54,28 +85,95 @@ async def get_questions(
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid question type")
     
-    query = query.offset(offset).limit(limit).order_by(Question.order_index)
+    query = query.order_by(*sort_key)
     
-    result = await db.execute(query)
-    questions = result.scalars().all()
+    if pagination == "offset" and cursor is None:
+        result = await db.execute(query.offset(offset).limit(limit))
+        entries = await get_question_payloads(db, [row.id for row in result.all()])
+        return Response(content=render_questions(entries), media_type="application/json")
     
-    # Load choices for each question
-    response = []
-    for q in questions:
-        choices_query = select(Choice).where(Choice.question_id == q.id).order_by(Choice.order_index)
-        choices_result = await db.execute(choices_query)
-        choices = choices_result.scalars().all()
-        
-        response.append({
-            "id": q.id,
-            "type": q.type.value,
-            "stem": q.stem,
-            "answer": q.answer,
-            "explanation": q.explanation,
-            "choices": [{"label": c.label, "text": c.text} for c in choices]
-        })
+    if cursor:
+        try:
+            last_key = decode_cursor(cursor, (int, int, int))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(tuple_(*sort_key) > tuple_(*last_key))
+    
+    # Fetch one extra row to know whether another page exists
+    result = await db.execute(query.limit(limit + 1))
+    rows = result.all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(tuple(rows[-1]))
+    
+    entries = await get_question_payloads(db, [row.id for row in rows])
+    return Response(
+        content=raw_object([
+            ("items", render_questions(entries)),
+            ("next_cursor", json_dumps(next_cursor)),
+        ]),
+        media_type="application/json"
+    )
+
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Get hit/miss counters of the LLM response cache and the question payload cache."""
+    return {
+        "llm_cache": llm_cache.stats.as_dict(),
+        "question_payloads": question_payloads.as_dict()
+    }
+
+
+@router.get("/search")
+async def search_questions(
+    q: str = Query(..., min_length=1, max_length=200),
+    question_set_id: Optional[int] = Query(None),
+    question_type: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Search question stems, answers and explanations.
     
-    return response
+    Returns {"items", "next_cursor"} ranked by relevance; each item carries
+    its `score`. Pass next_cursor back to get the following page.
+    """
+    
+    q_type = None
+    if question_type:
+        try:
+            q_type = QuestionType(question_type)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid question type")
+    
+    last_key = None
+    if cursor:
+        try:
+            last_key = decode_cursor(cursor, (float, int))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    # Fetch one extra row to know whether another page exists
+    results = await run_search(db, q, limit + 1, last_key, question_set_id, q_type)
+    
+    next_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        last_question, last_score = results[-1]
+        next_cursor = encode_cursor((last_score, last_question.id))
+    
+    items = await serialize_questions(db, [question for question, _ in results])
+    for item, (_, score) in zip(items, results):
+        item["score"] = score
+    
+    return FastJSONResponse({
+        "items": items,
+        "next_cursor": next_cursor
+    })
 
 
 @router.get("/{question_id}")
@@ -85,28 +183,59 @@ async def get_question(
 ):
     """Get a specific question by ID."""
     
-    result = await db.execute(
-        select(Question).where(Question.id == question_id)
+    # No existence check first: a question deleted by another worker is
+    # served for at most the short unchecked TTL
+    entries = await get_question_payloads(
+        db, [question_id], max_age=settings.question_cache_unchecked_ttl_seconds
     )
-    question = result.scalar_one_or_none()
     
+    if not entries:
+        raise HTTPException(status_code=404, detail="Question not found")
+    
+    return Response(content=entries[0].render(), media_type="application/json")
+
+
+@router.get("/{question_id}/similar")
+async def get_similar_questions(
+    question_id: int,
+    threshold: Optional[float] = Query(None, ge=0.0, le=1.0),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get near-duplicates of a question, most similar first.
+    
+    Similarity is the estimated Jaccard similarity of stem+choice shingles;
+    `threshold` defaults to NEAR_DUPLICATE_THRESHOLD. `duplicate_of_id` is
+    the question this one was flagged against when it was imported.
+    """
+    
+    question = await db.get(Question, question_id)
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
     
-    # Load choices
-    choices_result = await db.execute(
-        select(Choice).where(Choice.question_id == question.id).order_by(Choice.order_index)
+    signature = await db.get(QuestionSignature, question_id)
+    similar = await find_similar_questions(
+        db, question_id,
+        settings.near_duplicate_threshold if threshold is None else threshold,
+        limit
+    ) or []
+    
+    result = await db.execute(
+        select(Question).where(Question.id.in_([similar_id for similar_id, _ in similar]))
     )
-    choices = choices_result.scalars().all()
+    questions_by_id = {q.id: q for q in result.scalars().all()}
+    ranked = [(questions_by_id[similar_id], score) for similar_id, score in similar if similar_id in questions_by_id]
     
-    return {
-        "id": question.id,
-        "type": question.type.value,
-        "stem": question.stem,
-        "answer": question.answer,
-        "explanation": question.explanation,
-        "choices": [{"label": c.label, "text": c.text} for c in choices]
-    }
+    items = await serialize_questions(db, [q for q, _ in ranked])
+    for item, (_, score) in zip(items, ranked):
+        item["similarity"] = score
+    
+    return FastJSONResponse({
+        "question_id": question_id,
+        "duplicate_of_id": signature.duplicate_of_id if signature else None,
+        "items": items
+    })
 
 
 @router.post("/generate")
@@ -121,7 +250,8 @@ async def generate_questions(
         questions_data = await generate_questions_from_content(
             content=request.content,
             num_questions=request.num_questions,
-            question_type=request.question_type
+            question_type=request.question_type,
+            use_cache=request.use_cache
         )
         
         # Create question set
@@ -132,42 +262,102 @@ async def generate_questions(
         db.add(question_set)
         await db.flush()
         
-        # Create questions
-        for idx, q_data in enumerate(questions_data):
-            question = Question(
-                question_set_id=question_set.id,
-                type=QuestionType(q_data.get("type", request.question_type)),
-                stem=q_data["stem"],
-                answer=q_data["answer"],
-                explanation=q_data.get("explanation", ""),
-                order_index=idx
-            )
-            db.add(question)
-            await db.flush()
-            
-            # Add choices if multiple choice
-            if "choices" in q_data:
-                for choice_idx, choice_data in enumerate(q_data["choices"]):
-                    choice = Choice(
-                        question_id=question.id,
-                        label=choice_data["label"],
-                        text=choice_data["text"],
-                        order_index=choice_idx
-                    )
-                    db.add(choice)
+        # Create questions and choices in bulk
+        question_ids = await bulk_insert_questions(
+            db, question_set.id, questions_data, default_type=request.question_type
+        )
         
         await db.commit()
         
         return {
             "message": "Questions generated successfully",
             "question_set_id": question_set.id,
-            "questions_generated": len(questions_data)
+            "questions_generated": sum(1 for question_id in question_ids if question_id is not None)
         }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating questions: {str(e)}")
 
 
+def format_sse(event: str, data: dict) -> str:
+    """Format a Server-Sent Events message."""
+    return f"event: {event}\ndata: {json_dumps(data).decode('utf-8')}\n\n"
+
+
+@router.post("/generate/stream")
+async def generate_questions_stream(request: GenerateQuestionsRequest):
+    """
+    Generate questions from content using AI, streamed as Server-Sent Events.
+    
+    Each question is persisted and pushed to the client as soon as the model
+    finishes it. Events: `question_set`, `question` (one per question),
+    `error`, and a final `done`.
+    """
+    
+    async def event_stream():
+        # The request-scoped session is closed before a streaming body runs,
+        # so the stream owns its session.
+        async with AsyncSessionLocal() as db:
+            question_set = QuestionSet(
+                name=request.question_set_name,
+                description="AI-generated questions"
+            )
+            db.add(question_set)
+            await db.commit()
+            question_set_id = question_set.id
+            yield format_sse("question_set", {"question_set_id": question_set_id})
+            
+            count = 0
+            try:
+                # aclosing: a client disconnect closes the model stream and frees its slot
+                generated = stream_questions_from_content(
+                    content=request.content,
+                    num_questions=request.num_questions,
+                    question_type=request.question_type,
+                    use_cache=request.use_cache
+                )
+                async with contextlib.aclosing(generated):
+                    async for q_data in generated:
+                        try:
+                            question_type = QuestionType(q_data.get("type") or request.question_type)
+                            question_ids = await bulk_insert_questions(
+                                db, question_set_id, [q_data],
+                                default_type=request.question_type, start_index=count
+                            )
+                        except (KeyError, ValueError):
+                            # Rows are built before anything is sent to the database
+                            continue  # Skip malformed objects from the model
+                        await db.commit()
+                        if question_ids[0] is None:
+                            continue  # Near-duplicate skipped at ingest
+                        count += 1
+                        
+                        choices = (q_data.get("choices") or []) if question_type == QuestionType.MULTIPLE_CHOICE else []
+                        yield format_sse("question", {
+                            "index": count - 1,
+                            "id": question_ids[0],
+                            "type": question_type.value,
+                            "stem": q_data["stem"],
+                            "answer": q_data["answer"],
+                            "explanation": q_data.get("explanation", ""),
+                            "choices": [{"label": c["label"], "text": c["text"]} for c in choices]
+                        })
+            except Exception as e:
+                await db.rollback()
+                yield format_sse("error", {"detail": f"Error generating questions: {str(e)}"})
+            
+            yield format_sse("done", {
+                "question_set_id": question_set_id,
+                "questions_generated": count
+            })
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/sets/")
 async def get_question_sets(
     db: AsyncSession = Depends(get_db)
@@ -183,6 +373,7 @@ async def get_question_sets(
             "name": qs.name,
             "description": qs.description,
             "file_name": qs.file_name,
+            "content_hash": qs.content_hash,
             "created_at": qs.created_at.isoformat()
         }
         for qs in question_sets
@@ -206,6 +397,7 @@ async def delete_question(
     
     await db.delete(question)
     await db.commit()
+    question_payloads.invalidate([question_id])
     
     return {"message": "문제가 삭제되었습니다.", "id": question_id}
 
@@ -225,8 +417,14 @@ async def delete_question_set(
     if not question_set:
         raise HTTPException(status_code=404, detail="문제 세트를 찾을 수 없습니다.")
     
+    result = await db.execute(
+        select(Question.id).where(Question.question_set_id == question_set_id)
+    )
+    question_ids = list(result.scalars().all())
+    
     await db.delete(question_set)
     await db.commit()
+    question_payloads.invalidate(question_ids)
     
     return {"message": "문제 세트가 삭제되었습니다.", "id": question_set_id}
 
@@ -1,12 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from pydantic import BaseModel
-from typing import Optional, List
+from sqlalchemy import select, func, insert, update, any_, bindparam, Integer
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from pydantic import BaseModel, Field
+from typing import Optional, List, TypedDict
+from datetime import datetime
 import random
 
 from app.database import get_db
-from app.models import Question, Choice, AttemptHistory, Bookmark
+from app.responses import FastJSONResponse, json_dumps
+from app.models import Question, AttemptHistory, Bookmark, QuizSession, QuizSubmission, ReviewState
+from app.services.question_stats import record_attempts, frequently_wrong_question_ids
+from app.services.review_scheduler import schedule_reviews
+from app.services.serializers import QuestionPayload, load_choices, serialize_question
+from app.services.payload_cache import get_question_payloads, raw_object, render_questions
+from app.services import quiz_sessions
+from app.services.grading import grading_engine
 
 
 router = APIRouter()
@@ -37,16 +46,65 @@ class SubmitAnswerRequest(BaseModel):
     time_spent_seconds: Optional[float] = None
 
 
-@router.post("/count")
-async def get_question_count(
-    request: QuizCountRequest,
-    db: AsyncSession = Depends(get_db)
-):
-    """Get the count of questions matching the criteria."""
-    
-    query = select(func.count(Question.id))
+class SubmitBatchRequest(BaseModel):
+    """Request to submit many answers at once."""
+    submission_id: str = Field(..., min_length=1, max_length=64)  # Client-generated, reused on retry
+    answers: List[SubmitAnswerRequest] = Field(..., min_length=1, max_length=500)
+
+
+class QuizSessionCreateRequest(BaseModel):
+    """Request to create a server-side quiz session."""
+    question_set_ids: Optional[List[int]] = None
+    question_type: Optional[str] = None
+    shuffle_questions: bool = True
+    shuffle_choices: bool = True
+    bookmarked_only: bool = False
+    frequently_wrong_only: bool = False
+    limit: Optional[int] = Field(None, gt=0)  # Sample at most this many questions
+    seed: Optional[int] = None  # Fixed seed reproduces the same order
+
+
+class ReviewRequest(BaseModel):
+    """Request for the questions due for spaced-repetition review."""
+    question_set_ids: Optional[List[int]] = None
+    question_type: Optional[str] = None
+    bookmarked_only: bool = False
+    frequently_wrong_only: bool = False
+    limit: int = Field(20, gt=0, le=100)
+    include_new: bool = False  # Fill up with never-attempted questions
+    shuffle_choices: bool = True
+
+
+class AnswerFeedback(TypedDict):
+    """Grading result of one submitted answer."""
+    is_correct: bool
+    correct_answer: str
+    explanation: Optional[str]
+    user_answer: str
+
+
+class BatchAnswerResult(AnswerFeedback, total=False):
+    """Per-answer entry of a batch submission; unknown questions carry only an error."""
+    question_id: int
+    error: str
+
+
+class ReviewInfo(TypedDict):
+    due_at: str
+    interval_days: float
+    ease_factor: float
+    repetitions: int
+    lapses: int
+
+
+class ReviewQuestionPayload(QuestionPayload):
+    review: Optional[ReviewInfo]  # None for questions never attempted
+
+
+def apply_quiz_filters(query, request):
+    """Apply the common quiz filters (sets, type, bookmarked, frequently wrong)."""
     
-    # Filter by question sets
+    # Filter by question sets (multiple)
     if request.question_set_ids and len(request.question_set_ids) > 0:
         query = query.where(Question.question_set_id.in_(request.question_set_ids))
     
@@ -61,13 +119,21 @@ async def get_question_count(
     
     # Filter by frequently wrong only
     if request.frequently_wrong_only:
-        wrong_subquery = (
-            select(AttemptHistory.question_id)
-            .group_by(AttemptHistory.question_id)
-            .having(func.count(AttemptHistory.id) >= 2)
-            .having(func.avg(AttemptHistory.is_correct.cast(db.bind.dialect.NUMERIC)) < 0.5)
-        )
-        query = query.where(Question.id.in_(wrong_subquery))
+        query = query.where(Question.id.in_(frequently_wrong_question_ids()))
+    
+    return query
+
+
+@router.post("/count")
+async def get_question_count(
+    request: QuizCountRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the count of questions matching the criteria."""
+    
+    query = select(func.count(Question.id))
+    
+    query = apply_quiz_filters(query, request)
     
     result = await db.execute(query)
     count = result.scalar() or 0
@@ -82,64 +148,68 @@ async def start_quiz(
 ):
     """Start a quiz session with specified options."""
     
-    query = select(Question)
+    query = select(Question.id)
     
-    # Filter by question sets (multiple)
-    if request.question_set_ids and len(request.question_set_ids) > 0:
-        query = query.where(Question.question_set_id.in_(request.question_set_ids))
-    
-    # Filter by question type
-    if request.question_type:
-        query = query.where(Question.type == request.question_type)
-    
-    # Filter by bookmarked only
-    if request.bookmarked_only:
-        bookmarked_subquery = select(Bookmark.question_id)
-        query = query.where(Question.id.in_(bookmarked_subquery))
-    
-    # Filter by frequently wrong only
-    if request.frequently_wrong_only:
-        wrong_subquery = (
-            select(AttemptHistory.question_id)
-            .group_by(AttemptHistory.question_id)
-            .having(func.count(AttemptHistory.id) >= 2)
-            .having(func.avg(AttemptHistory.is_correct.cast(db.bind.dialect.NUMERIC)) < 0.5)
-        )
-        query = query.where(Question.id.in_(wrong_subquery))
+    query = apply_quiz_filters(query, request)
     
     result = await db.execute(query)
-    questions = list(result.scalars().all())
+    question_ids = list(result.scalars().all())
     
-    if not questions:
+    if not question_ids:
         raise HTTPException(status_code=404, detail="선택한 조건에 맞는 문제가 없습니다.")
     
     # Shuffle questions if requested
     if request.shuffle_questions:
-        random.shuffle(questions)
-    
-    # Prepare response
-    quiz_questions = []
-    for q in questions:
-        # Load choices
-        choices_result = await db.execute(
-            select(Choice).where(Choice.question_id == q.id).order_by(Choice.order_index)
-        )
-        choices = list(choices_result.scalars().all())
-        
-        # Shuffle choices if requested
-        if request.shuffle_choices and choices:
-            random.shuffle(choices)
-        
-        quiz_questions.append({
-            "id": q.id,
-            "type": q.type.value,
-            "stem": q.stem,
-            "choices": [{"label": c.label, "text": c.text} for c in choices]
-        })
+        random.shuffle(question_ids)
+    
+    # Payloads come pre-encoded from the cache; choices are shuffled per request
+    entries = await get_question_payloads(db, question_ids)
+    
+    return Response(
+        content=raw_object([
+            ("questions", render_questions(entries, include_answer=False, shuffle_choices=request.shuffle_choices)),
+            ("total_questions", json_dumps(len(entries))),
+            ("options", json_dumps({
+                "shuffle_questions": request.shuffle_questions,
+                "shuffle_choices": request.shuffle_choices
+            })),
+        ]),
+        media_type="application/json"
+    )
+
+
+@router.post("/sessions")
+async def create_quiz_session(
+    request: QuizSessionCreateRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create a server-side quiz session.
+    
+    The session stores only a seeded permutation of matching question ids;
+    questions are then fetched page by page from /sessions/{id}/next.
+    """
+    
+    query = apply_quiz_filters(select(Question.id), request)
+    
+    session = await quiz_sessions.create_session(
+        db,
+        query,
+        shuffle_questions=request.shuffle_questions,
+        shuffle_choices=request.shuffle_choices,
+        limit=request.limit,
+        seed=request.seed
+    )
+    
+    if session is None:
+        raise HTTPException(status_code=404, detail="선택한 조건에 맞는 문제가 없습니다.")
+    
+    await db.commit()
     
     return {
-        "questions": quiz_questions,
-        "total_questions": len(quiz_questions),
+        "session_id": session.id,
+        "total_questions": session.total,
+        "seed": session.seed,
         "options": {
             "shuffle_questions": request.shuffle_questions,
             "shuffle_choices": request.shuffle_choices
@@ -147,6 +217,109 @@ async def start_quiz(
     }
 
 
+@router.get("/sessions/{session_id}")
+async def get_quiz_session(
+    session_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the progress of a quiz session."""
+    
+    result = await db.execute(
+        select(QuizSession.position, QuizSession.total, QuizSession.created_at)
+        .where(QuizSession.id == session_id)
+    )
+    row = result.one_or_none()
+    
+    if row is None:
+        raise HTTPException(status_code=404, detail="퀴즈 세션을 찾을 수 없습니다.")
+    
+    position, total, created_at = row
+    return {
+        "session_id": session_id,
+        "position": position,
+        "total_questions": total,
+        "remaining": total - position,
+        "done": position >= total,
+        "created_at": created_at.isoformat()
+    }
+
+
+@router.get("/sessions/{session_id}/next")
+async def get_next_session_questions(
+    session_id: str,
+    size: int = Query(20, gt=0, le=100),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the next page of questions in a quiz session."""
+    
+    page = await quiz_sessions.next_page(db, session_id, size)
+    
+    if page is None:
+        raise HTTPException(status_code=404, detail="퀴즈 세션을 찾을 수 없습니다.")
+    
+    await db.commit()
+    return FastJSONResponse(page)
+
+
+@router.post("/review")
+async def get_review_questions(
+    request: ReviewRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get the questions due for review, most overdue first.
+    
+    Due dates come from the SM-2 schedule that every submitted answer
+    advances, and are read through the index on review_states.due_at.
+    """
+    
+    query = (
+        select(Question, ReviewState)
+        .join(ReviewState, ReviewState.question_id == Question.id)
+        .where(ReviewState.due_at <= datetime.utcnow())
+    )
+    query = apply_quiz_filters(query, request)
+    result = await db.execute(query.order_by(ReviewState.due_at).limit(request.limit))
+    due = list(result.all())
+    
+    if request.include_new and len(due) < request.limit:
+        new_query = (
+            select(Question)
+            .outerjoin(ReviewState, ReviewState.question_id == Question.id)
+            .where(ReviewState.question_id.is_(None))
+        )
+        new_query = apply_quiz_filters(new_query, request)
+        result = await db.execute(
+            new_query
+            .order_by(Question.question_set_id, Question.order_index, Question.id)
+            .limit(request.limit - len(due))
+        )
+        due.extend((question, None) for question in result.scalars().all())
+    
+    choices_by_question = await load_choices(db, [question.id for question, _ in due])
+    
+    review_questions: List[ReviewQuestionPayload] = []
+    for question, state in due:
+        choices = list(choices_by_question.get(question.id, ()))
+        if request.shuffle_choices and choices:
+            random.shuffle(choices)
+        
+        item: ReviewQuestionPayload = serialize_question(question, choices, include_answer=False)
+        item["review"] = {
+            "due_at": state.due_at.isoformat(),
+            "interval_days": state.interval_days,
+            "ease_factor": state.ease_factor,
+            "repetitions": state.repetitions,
+            "lapses": state.lapses
+        } if state else None
+        review_questions.append(item)
+    
+    return FastJSONResponse({
+        "questions": review_questions,
+        "total_questions": len(review_questions)
+    })
+
+
 @router.post("/submit")
 async def submit_answer(
     request: SubmitAnswerRequest,
@@ -162,13 +335,7 @@ async def submit_answer(
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
     
-    # Normalize answers for comparison
-    def normalize(text):
-        import re
-        # Remove all whitespace and punctuation
-        return re.sub(r'[\s\.,\?!]', '', text).lower()
-
-    is_correct = normalize(request.user_answer) == normalize(question.answer)
+    is_correct = grading_engine.grade_question(question, request.user_answer)
     
     attempt = AttemptHistory(
         question_id=request.question_id,
@@ -177,43 +344,117 @@ async def submit_answer(
         time_spent_seconds=request.time_spent_seconds
     )
     db.add(attempt)
+    await record_attempts(db, [(request.question_id, is_correct)])
+    await schedule_reviews(db, [(request.question_id, is_correct)])
     await db.commit()
     
-    return {
+    feedback: AnswerFeedback = {
         "is_correct": is_correct,
         "correct_answer": question.answer,
         "explanation": question.explanation,
         "user_answer": request.user_answer
     }
+    return FastJSONResponse(feedback)
 
 
-@router.get("/bookmarked")
-async def get_bookmarked_questions(
+@router.post("/submit-batch")
+async def submit_answers_batch(
+    request: SubmitBatchRequest,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all bookmarked questions."""
+    """
+    Submit many answers in one request and get feedback for each.
     
-    query = select(Question).join(Bookmark).where(Bookmark.question_id == Question.id)
-    result = await db.execute(query)
-    questions = result.scalars().all()
+    All questions are fetched with one query, graded in memory, and the
+    attempts are inserted in one transaction. Retrying with the same
+    submission_id returns the stored result without recording anything twice.
+    """
     
-    response = []
-    for q in questions:
-        choices_result = await db.execute(
-            select(Choice).where(Choice.question_id == q.id).order_by(Choice.order_index)
+    # Claim the submission id first; a concurrent retry blocks here until we commit
+    claimed = await db.execute(
+        pg_insert(QuizSubmission)
+        .values(submission_id=request.submission_id)
+        .on_conflict_do_nothing(index_elements=[QuizSubmission.submission_id])
+        .returning(QuizSubmission.submission_id)
+    )
+    if claimed.scalar_one_or_none() is None:
+        await db.rollback()
+        existing = await db.get(QuizSubmission, request.submission_id)
+        # Stored already encoded; send it back as is
+        return Response(content=existing.response, media_type="application/json")
+    
+    question_ids = list({answer.question_id for answer in request.answers})
+    result = await db.execute(
+        select(Question).where(
+            Question.id == any_(bindparam("question_ids", question_ids, type_=ARRAY(Integer)))
         )
-        choices = choices_result.scalars().all()
+    )
+    questions_by_id = {q.id: q for q in result.scalars().all()}
+    
+    results: List[BatchAnswerResult] = []
+    attempt_rows = []
+    graded = []
+    # One timestamp for the whole batch, so a backfill replays it as one review
+    attempted_at = datetime.utcnow()
+    for answer in request.answers:
+        question = questions_by_id.get(answer.question_id)
+        if question is None:
+            results.append({
+                "question_id": answer.question_id,
+                "error": "Question not found"
+            })
+            continue
         
-        response.append({
-            "id": q.id,
-            "type": q.type.value,
-            "stem": q.stem,
-            "answer": q.answer,
-            "explanation": q.explanation,
-            "choices": [{"label": c.label, "text": c.text} for c in choices]
+        is_correct = grading_engine.grade_question(question, answer.user_answer)
+        attempt_rows.append({
+            "question_id": answer.question_id,
+            "is_correct": is_correct,
+            "user_answer": answer.user_answer,
+            "time_spent_seconds": answer.time_spent_seconds,
+            "attempted_at": attempted_at
         })
+        graded.append((answer.question_id, is_correct))
+        results.append({
+            "question_id": answer.question_id,
+            "is_correct": is_correct,
+            "correct_answer": question.answer,
+            "explanation": question.explanation,
+            "user_answer": answer.user_answer
+        })
+    
+    if attempt_rows:
+        await db.execute(insert(AttemptHistory), attempt_rows)
+        await record_attempts(db, graded)
+        await schedule_reviews(db, graded, attempted_at)
     
-    return response
+    response = {
+        "submission_id": request.submission_id,
+        "results": results,
+        "correct_count": sum(1 for _, is_correct in graded if is_correct),
+        "graded_count": len(graded)
+    }
+    encoded = json_dumps(response)
+    
+    await db.execute(
+        update(QuizSubmission)
+        .where(QuizSubmission.submission_id == request.submission_id)
+        .values(response=encoded.decode("utf-8"))
+    )
+    await db.commit()
+    
+    return Response(content=encoded, media_type="application/json")
+
+
+@router.get("/bookmarked")
+async def get_bookmarked_questions(
+    db: AsyncSession = Depends(get_db)
+):
+    """Get all bookmarked questions."""
+    
+    result = await db.execute(select(Bookmark.question_id).order_by(Bookmark.id))
+    entries = await get_question_payloads(db, list(result.scalars().all()))
+    
+    return Response(content=render_questions(entries), media_type="application/json")
 
 
 @router.get("/frequently-wrong")
@@ -223,36 +464,7 @@ async def get_frequently_wrong_questions(
 ):
     """Get questions with low correct rate."""
     
-    subquery = (
-        select(
-            AttemptHistory.question_id,
-            func.avg(AttemptHistory.is_correct.cast(db.bind.dialect.NUMERIC)).label("correct_rate"),
-            func.count(AttemptHistory.id).label("attempt_count")
-        )
-        .group_by(AttemptHistory.question_id)
-        .having(func.count(AttemptHistory.id) >= 2)
-        .having(func.avg(AttemptHistory.is_correct.cast(db.bind.dialect.NUMERIC)) < threshold)
-        .alias()
-    )
-    
-    query = select(Question).join(subquery, Question.id == subquery.c.question_id)
-    result = await db.execute(query)
-    questions = result.scalars().all()
-    
-    response = []
-    for q in questions:
-        choices_result = await db.execute(
-            select(Choice).where(Choice.question_id == q.id).order_by(Choice.order_index)
-        )
-        choices = choices_result.scalars().all()
-        
-        response.append({
-            "id": q.id,
-            "type": q.type.value,
-            "stem": q.stem,
-            "answer": q.answer,
-            "explanation": q.explanation,
-            "choices": [{"label": c.label, "text": c.text} for c in choices]
-        })
+    result = await db.execute(frequently_wrong_question_ids(threshold))
+    entries = await get_question_payloads(db, list(result.scalars().all()))
     
-    return response
+    return Response(content=render_questions(entries), media_type="application/json")
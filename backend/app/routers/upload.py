@@ -1,59 +1,89 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from pathlib import Path
-import os
+from typing import Tuple
+import aiofiles
+import aiofiles.os
+import hashlib
 from datetime import datetime
 
 from app.database import get_db
 from app.config import settings
-from app.models import QuestionSet, Question, Choice, QuestionType
-from app.services.pdf_parser import parse_pdf_questions, extract_pdf_text
-from app.services.docx_parser import parse_docx_questions, extract_docx_text
-from app.services.llm_service import generate_questions_from_content
+from app.models import UploadJob, JobStatus
+from app.responses import FastJSONResponse
+from app.services.upload_jobs import upload_queue, serialize_job, QueueFullError
+from app.services.document_cache import complete_from_existing
 
 
 router = APIRouter()
 
+# Room for multipart boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
 
-async def save_questions_to_db(questions_data: list, question_set: QuestionSet, db: AsyncSession):
-    """Helper function to save questions to database."""
-    for idx, q_data in enumerate(questions_data):
-        question = Question(
-            question_set_id=question_set.id,
-            type=QuestionType(q_data.get("type", "multiple_choice")),
-            stem=q_data["stem"],
-            answer=q_data["answer"],
-            explanation=q_data.get("explanation", ""),
-            order_index=idx
-        )
-        db.add(question)
-        await db.flush()
-        
-        if question.type == QuestionType.MULTIPLE_CHOICE and "choices" in q_data:
-            for choice_idx, choice_data in enumerate(q_data["choices"]):
-                choice = Choice(
-                    question_id=question.id,
-                    label=choice_data["label"],
-                    text=choice_data["text"],
-                    order_index=choice_idx
-                )
-                db.add(choice)
-
-
-@router.post("/pdf")
-async def upload_pdf(
-    file: UploadFile = File(...),
-    db: AsyncSession = Depends(get_db)
-):
+
+class UploadTooLargeError(Exception):
+    """Uploaded file exceeds settings.max_upload_bytes."""
+
+
+def upload_too_large() -> HTTPException:
+    limit_mb = settings.max_upload_bytes // (1024 * 1024)
+    return HTTPException(status_code=413, detail=f"파일이 너무 큽니다. 최대 {limit_mb}MB까지 업로드할 수 있습니다.")
+
+
+class UploadSizeLimitMiddleware:
     """
-    Upload PDF file and process it intelligently:
-    1. Try to extract questions if file contains practice problems
-    2. If no questions found, generate questions from content using AI
+    Cap request bodies under path_prefix before the multipart parser reads them.
+    
+    FastAPI parses the whole form, spooling the file to a temporary file,
+    before an endpoint runs, so a check in the endpoint comes too late. A
+    Content-Length above the cap is answered with 413 without reading the
+    body; bodies without one (chunked) are counted as they arrive and the
+    request fails with 413 as soon as the cap is passed.
     """
     
-    if not file.filename.endswith('.pdf'):
-        raise HTTPException(status_code=400, detail="PDF 파일만 업로드할 수 있습니다.")
+    def __init__(self, app: ASGIApp, path_prefix: str = "/api/upload"):
+        self.app = app
+        self.path_prefix = path_prefix
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+        
+        limit = settings.max_upload_bytes + MULTIPART_OVERHEAD_BYTES
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            error = upload_too_large()
+            response = FastJSONResponse({"detail": error.detail}, status_code=error.status_code)
+            await response(scope, receive, send)
+            return
+        
+        received = 0
+        
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # FastAPI re-raises HTTPExceptions from body parsing as is
+                    raise upload_too_large()
+            return message
+        
+        await self.app(scope, limited_receive, send)
+
+
+async def save_upload_file(file: UploadFile) -> Tuple[Path, int, str]:
+    """
+    Stream an uploaded file to the storage directory.
     
+    The file is copied in chunks from the multipart spool through an async
+    writer, so memory use stays at one chunk per upload, and the SHA-256 is
+    computed on the fly. The request body was already capped by
+    UploadSizeLimitMiddleware; the exact per-file limit is checked again
+    here. Returns (path, size, hex digest).
+    """
     upload_dir = Path(settings.file_storage_path)
     upload_dir.mkdir(parents=True, exist_ok=True)
     
@@ -61,146 +91,139 @@ async def upload_pdf(
     safe_filename = f"{timestamp}_{file.filename}"
     file_path = upload_dir / safe_filename
     
-    content = await file.read()
-    with open(file_path, "wb") as f:
-        f.write(content)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(file_path, "wb") as f:
+            while chunk := await file.read(settings.upload_chunk_bytes):
+                size += len(chunk)
+                if size > settings.max_upload_bytes:
+                    raise UploadTooLargeError()
+                digest.update(chunk)
+                await f.write(chunk)
+    except BaseException:
+        # Never leave a partial file behind (limit hit, client gone, disk full)
+        if await aiofiles.os.path.exists(file_path):
+            await aiofiles.os.remove(file_path)
+        raise
+    
+    return file_path, size, digest.hexdigest()
+
+
+async def enqueue_upload(file: UploadFile, file_type: str, force_reprocess: bool, db: AsyncSession) -> dict:
+    """
+    Save the file, record a job and hand it to the background queue.
+    
+    Unless force_reprocess is set, a file whose bytes were processed before
+    completes immediately from the earlier result without being parsed.
+    """
+    
+    # Back-pressure: reject before touching the disk when the queue is full
+    if not upload_queue.has_capacity():
+        raise HTTPException(status_code=503, detail="업로드 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.")
+    
+    # The middleware capped the whole body; this is the exact per-file limit
+    if file.size is not None and file.size > settings.max_upload_bytes:
+        raise upload_too_large()
     
     try:
-        # Step 1: Try to extract questions from the file
-        questions_data = await parse_pdf_questions(str(file_path))
-        
-        processing_mode = "extracted"  # 문제 추출 모드
-        
-        # Step 2: If no questions found, generate using AI
-        if not questions_data or len(questions_data) == 0:
-            processing_mode = "generated"  # AI 생성 모드
-            
-            # Extract text from PDF
-            text_content = await extract_pdf_text(str(file_path))
-            
-            if not text_content or len(text_content.strip()) < 100:
-                raise HTTPException(
-                    status_code=400, 
-                    detail="파일에서 충분한 텍스트를 추출할 수 없습니다."
-                )
-            
-            # Generate questions using AI
-            questions_data = await generate_questions_from_content(
-                content=text_content,
-                num_questions=10,
-                question_type="multiple_choice"
-            )
-        
-        # Create question set
-        question_set = QuestionSet(
-            name=file.filename,
-            description=f"{'문제 추출' if processing_mode == 'extracted' else 'AI 생성'}: {file.filename}",
-            file_name=file.filename,
-            file_path=str(file_path)
-        )
-        db.add(question_set)
-        await db.flush()
-        
-        # Save questions
-        await save_questions_to_db(questions_data, question_set, db)
+        file_path, file_size, content_hash = await save_upload_file(file)
+    except UploadTooLargeError:
+        raise upload_too_large()
+    
+    job = UploadJob(
+        file_type=file_type,
+        file_name=file.filename,
+        file_path=str(file_path),
+        file_size=file_size,
+        content_hash=content_hash,
+        status=JobStatus.QUEUED,
+        stage="queued"
+    )
+    db.add(job)
+    
+    if not force_reprocess and await complete_from_existing(db, job):
         await db.commit()
-        
+        if job.file_path != str(file_path) and await aiofiles.os.path.exists(file_path):
+            await aiofiles.os.remove(file_path)
         return {
-            "message": f"파일 처리 완료 ({processing_mode})",
-            "processing_mode": processing_mode,
-            "question_set_id": question_set.id,
-            "questions_count": len(questions_data),
-            "file_path": str(file_path)
+            "message": "이미 처리된 파일입니다. 기존 결과를 사용했습니다.",
+            **serialize_job(job)
         }
-        
-    except HTTPException:
-        if file_path.exists():
-            os.remove(file_path)
-        raise
-    except Exception as e:
-        if file_path.exists():
-            os.remove(file_path)
-        raise HTTPException(status_code=500, detail=f"파일 처리 중 오류 발생: {str(e)}")
+    
+    await db.commit()
+    
+    try:
+        upload_queue.submit(job.id)
+    except QueueFullError:
+        job.status = JobStatus.FAILED
+        job.stage = "failed"
+        job.error = "업로드 대기열이 가득 찼습니다."
+        await db.commit()
+        if await aiofiles.os.path.exists(file_path):
+            await aiofiles.os.remove(file_path)
+        raise HTTPException(status_code=503, detail="업로드 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.")
+    
+    return {
+        "message": "파일이 접수되었습니다. 처리 상태는 job_id로 조회하세요.",
+        **serialize_job(job)
+    }
+
+
+@router.post("/pdf", status_code=202)
+async def upload_pdf(
+    file: UploadFile = File(...),
+    force_reprocess: bool = Query(False),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Upload PDF file and process it in the background:
+    1. Try to extract questions if file contains practice problems
+    2. If no questions found, generate questions from content using AI
+    
+    Returns a job immediately; poll GET /api/upload/jobs/{job_id} for progress.
+    A file uploaded before comes back as an already completed job unless
+    force_reprocess=true.
+    """
+    
+    if not file.filename.endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="PDF 파일만 업로드할 수 있습니다.")
+    
+    return await enqueue_upload(file, "pdf", force_reprocess, db)
 
 
-@router.post("/docx")
+@router.post("/docx", status_code=202)
 async def upload_docx(
     file: UploadFile = File(...),
+    force_reprocess: bool = Query(False),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Upload DOCX file and process it intelligently:
+    Upload DOCX file and process it in the background:
     1. Try to extract questions if file contains practice problems
     2. If no questions found, generate questions from content using AI
+    
+    Returns a job immediately; poll GET /api/upload/jobs/{job_id} for progress.
+    A file uploaded before comes back as an already completed job unless
+    force_reprocess=true.
     """
     
     if not file.filename.endswith('.docx'):
         raise HTTPException(status_code=400, detail="DOCX 파일만 업로드할 수 있습니다.")
     
-    upload_dir = Path(settings.file_storage_path)
-    upload_dir.mkdir(parents=True, exist_ok=True)
+    return await enqueue_upload(file, "docx", force_reprocess, db)
+
+
+@router.get("/jobs/{job_id}")
+async def get_upload_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the status of an upload job (stage, page progress, result)."""
     
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    safe_filename = f"{timestamp}_{file.filename}"
-    file_path = upload_dir / safe_filename
+    job = await db.get(UploadJob, job_id)
     
-    content = await file.read()
-    with open(file_path, "wb") as f:
-        f.write(content)
+    if not job:
+        raise HTTPException(status_code=404, detail="업로드 작업을 찾을 수 없습니다.")
     
-    try:
-        # Step 1: Try to extract questions from the file
-        questions_data = await parse_docx_questions(str(file_path))
-        
-        processing_mode = "extracted"
-        
-        # Step 2: If no questions found, generate using AI
-        if not questions_data or len(questions_data) == 0:
-            processing_mode = "generated"
-            
-            # Extract text from DOCX
-            text_content = await extract_docx_text(str(file_path))
-            
-            if not text_content or len(text_content.strip()) < 100:
-                raise HTTPException(
-                    status_code=400, 
-                    detail="파일에서 충분한 텍스트를 추출할 수 없습니다."
-                )
-            
-            # Generate questions using AI
-            questions_data = await generate_questions_from_content(
-                content=text_content,
-                num_questions=10,
-                question_type="multiple_choice"
-            )
-        
-        # Create question set
-        question_set = QuestionSet(
-            name=file.filename,
-            description=f"{'문제 추출' if processing_mode == 'extracted' else 'AI 생성'}: {file.filename}",
-            file_name=file.filename,
-            file_path=str(file_path)
-        )
-        db.add(question_set)
-        await db.flush()
-        
-        # Save questions
-        await save_questions_to_db(questions_data, question_set, db)
-        await db.commit()
-        
-        return {
-            "message": f"파일 처리 완료 ({processing_mode})",
-            "processing_mode": processing_mode,
-            "question_set_id": question_set.id,
-            "questions_count": len(questions_data),
-            "file_path": str(file_path)
-        }
-        
-    except HTTPException:
-        if file_path.exists():
-            os.remove(file_path)
-        raise
-    except Exception as e:
-        if file_path.exists():
-            os.remove(file_path)
-        raise HTTPException(status_code=500, detail=f"파일 처리 중 오류 발생: {str(e)}")
+    return serialize_job(job)
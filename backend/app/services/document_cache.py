@@ -0,0 +1,111 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal
+from app.models import ParsedDocument, Question, QuestionSet, UploadJob, JobStatus
+from app.services.question_store import clone_questions, save_questions_to_db
+
+
+async def get_parsed_document(content_hash: str) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+    """Return (processing_mode, questions) cached for a file hash, or None."""
+    try:
+        async with AsyncSessionLocal() as session:
+            entry = await session.get(ParsedDocument, content_hash)
+            if entry is None:
+                return None
+            return entry.processing_mode, json.loads(entry.payload)
+    except Exception:
+        # The cache is an optimization; fall back to parsing
+        return None
+
+
+async def store_parsed_document(
+    content_hash: str,
+    file_type: str,
+    processing_mode: str,
+    questions: List[Dict[str, Any]]
+):
+    """Remember what a file parsed into; a forced reprocess overwrites the entry."""
+    try:
+        async with AsyncSessionLocal() as session:
+            await session.merge(ParsedDocument(
+                content_hash=content_hash,
+                file_type=file_type,
+                processing_mode=processing_mode,
+                payload=json.dumps(questions, ensure_ascii=False),
+                questions_count=len(questions),
+            ))
+            await session.commit()
+    except Exception:
+        pass
+
+
+async def find_question_set_by_hash(db: AsyncSession, content_hash: str) -> Optional[QuestionSet]:
+    """Most recent question set created from a file with this hash."""
+    result = await db.execute(
+        select(QuestionSet)
+        .where(QuestionSet.content_hash == content_hash)
+        .order_by(QuestionSet.id.desc())
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def complete_from_existing(db: AsyncSession, job: UploadJob) -> bool:
+    """
+    Finish an upload job from earlier work on identical bytes, if there is any.
+
+    - same file name as an existing set: reuse that set as is
+    - different name: clone the set's rows in SQL under the new name
+    - set since deleted: rebuild it from the cached parse
+
+    Returns False when the content has never been processed. Does not commit.
+    """
+    existing = await find_question_set_by_hash(db, job.content_hash)
+    if existing is not None and existing.file_path:
+        # Identical bytes are already on disk; the caller drops the new copy
+        job.file_path = existing.file_path
+
+    if existing is not None and existing.file_name == job.file_name:
+        result = await db.execute(
+            select(func.count()).select_from(Question).where(Question.question_set_id == existing.id)
+        )
+        question_set = existing
+        processing_mode = "reused"
+        questions_count = result.scalar_one()
+    else:
+        if existing is not None:
+            processing_mode = "cloned"
+            description = f"{existing.name} 복제: {job.file_name}"
+        else:
+            cached = await get_parsed_document(job.content_hash)
+            if cached is None:
+                return False
+            source_mode, questions_data = cached
+            processing_mode = "cached"
+            description = f"{'문제 추출' if source_mode == 'extracted' else 'AI 생성'}: {job.file_name}"
+
+        question_set = QuestionSet(
+            name=job.file_name,
+            description=description,
+            file_name=job.file_name,
+            file_path=job.file_path,
+            content_hash=job.content_hash
+        )
+        db.add(question_set)
+        await db.flush()
+
+        if existing is not None:
+            questions_count = await clone_questions(db, existing.id, question_set.id)
+        else:
+            questions_count = await save_questions_to_db(questions_data, question_set, db)
+
+    job.status = JobStatus.COMPLETED
+    job.stage = "done"
+    job.processing_mode = processing_mode
+    job.question_set_id = question_set.id
+    job.questions_count = questions_count
+    return True
@@ -1,9 +1,17 @@
 from docx import Document
-import re
 from typing import List, Dict, Any
 
+from app.services.question_grammar import (
+    CHOICE_ANSWER_PATTERN,
+    QUESTION_BLOCK_PATTERN,
+    TEXT_ANSWER_PATTERN,
+    find_choices,
+    find_explanation,
+    normalize_choice_label,
+)
 
-async def extract_docx_text(file_path: str) -> str:
+
+def extract_docx_text(file_path: str) -> str:
     """
     Extract raw text from DOCX file.
     """
@@ -15,87 +23,61 @@ async def extract_docx_text(file_path: str) -> str:
         raise Exception(f"Failed to extract DOCX text: {str(e)}")
 
 
-async def parse_docx_questions(file_path: str) -> List[Dict[str, Any]]:
+def parse_docx_questions(file_path: str) -> List[Dict[str, Any]]:
     """
     Parse DOCX file to extract questions.
     Returns empty list if no questions found (for AI generation fallback).
     """
+    return parse_docx_text(extract_docx_text(file_path))
+
+
+def parse_docx_text(full_text: str) -> List[Dict[str, Any]]:
+    """
+    Parse questions from text already extracted from a DOCX file.
+    Returns empty list if no questions found (for AI generation fallback).
+    """
     questions = []
     
     try:
-        full_text = await extract_docx_text(file_path)
-        
         if not full_text:
             return []
         
-        # Pattern matching for common question formats
-        question_pattern = r'(?:^|\n)(\d+|Q\d+)[\.\\)]\s*(.+?)(?=\n(?:\d+|Q\d+)[\.\\)]|\Z)'
-        matches = list(re.finditer(question_pattern, full_text, re.MULTILINE | re.DOTALL))
+        matches = list(QUESTION_BLOCK_PATTERN.finditer(full_text))
         
         # If no question patterns found, return empty for AI fallback
         if not matches:
             return []
         
-        for idx, match in enumerate(matches):
+        for match in matches:
             question_text = match.group(2).strip()
             
-            # Try to extract choices
-            choice_pattern = r'([A-D]|[①-④])[\.\\)]\s*([^\n]+)'
-            choices_matches = re.findall(choice_pattern, question_text)
+            # A lone "(1)" or "①" is usually a reference in the stem, not a choice list
+            choices, first_choice_pos = find_choices(question_text, min_choices=2)
             
-            if choices_matches:
+            if choices:
                 # Multiple choice question
-                stem_match = re.match(r'(.+?)(?=[A-D①-④][\.\\)])', question_text, re.DOTALL)
-                stem = stem_match.group(1).strip() if stem_match else question_text
-                
-                choices = []
-                for choice_label, choice_text in choices_matches:
-                    label_map = {'①': 'A', '②': 'B', '③': 'C', '④': 'D'}
-                    normalized_label = label_map.get(choice_label, choice_label)
-                    
-                    choices.append({
-                        "label": normalized_label,
-                        "text": choice_text.strip()
-                    })
-                
-                # Extract answer
-                answer_pattern = r'(?:정답|답)\s*[:：]\s*([A-D]|[①-④])'
-                answer_match = re.search(answer_pattern, question_text)
-                answer = answer_match.group(1) if answer_match else "A"
-                
-                label_map = {'①': 'A', '②': 'B', '③': 'C', '④': 'D'}
-                answer = label_map.get(answer, answer)
+                stem = question_text[:first_choice_pos].strip() if first_choice_pos else question_text
                 
-                # Extract explanation
-                explanation_pattern = r'(?:해설|설명)\s*[:：]\s*(.+?)(?=\n(?:\d+|Q\d+)[\.\\)]|\Z)'
-                explanation_match = re.search(explanation_pattern, question_text, re.DOTALL)
-                explanation = explanation_match.group(1).strip() if explanation_match else ""
+                answer_match = CHOICE_ANSWER_PATTERN.search(question_text)
+                answer = normalize_choice_label(answer_match.group(1)) if answer_match else "A"
                 
                 questions.append({
                     "type": "multiple_choice",
                     "stem": stem,
                     "choices": choices,
                     "answer": answer,
-                    "explanation": explanation
+                    "explanation": find_explanation(question_text)
                 })
             else:
                 # Short answer question
-                answer_pattern = r'(?:정답|답)\s*[:：]\s*(.+?)(?:\n|$)'
-                answer_match = re.search(answer_pattern, question_text)
+                answer_match = TEXT_ANSWER_PATTERN.search(question_text)
                 
                 if answer_match:
-                    stem = re.sub(answer_pattern, '', question_text).strip()
-                    answer = answer_match.group(1).strip()
-                    
-                    explanation_pattern = r'(?:해설|설명)\s*[:：]\s*(.+?)(?=\n(?:\d+|Q\d+)[\.\\)]|\Z)'
-                    explanation_match = re.search(explanation_pattern, question_text, re.DOTALL)
-                    explanation = explanation_match.group(1).strip() if explanation_match else ""
-                    
                     questions.append({
                         "type": "short_answer",
-                        "stem": stem,
-                        "answer": answer,
-                        "explanation": explanation
+                        "stem": TEXT_ANSWER_PATTERN.sub('', question_text).strip(),
+                        "answer": answer_match.group(1).strip(),
+                        "explanation": find_explanation(question_text)
                     })
     
     except Exception as e:
@@ -0,0 +1,158 @@
+import json
+import re
+import unicodedata
+from typing import Iterable, List, Sequence, Tuple
+
+from sqlalchemy import select, update, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import Question, QuestionType
+
+
+ANSWER_NORMALIZE_PATTERN = re.compile(r'[\s\.,\?!]')
+DIGIT_PATTERN = re.compile(r'\d')
+FUZZY_QUESTION_TYPES = {QuestionType.SHORT_ANSWER, QuestionType.ESSAY}
+
+
+def normalize_answer(text: str) -> str:
+    """Remove all whitespace and punctuation for answer comparison."""
+    return ANSWER_NORMALIZE_PATTERN.sub('', text).lower()
+
+
+def decompose_hangul(text: str) -> str:
+    """Split Hangul syllables into jamo so one wrong 받침 costs one edit, not one syllable."""
+    return unicodedata.normalize("NFD", text)
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Levenshtein distance, stopping early once it must exceed max_distance.
+    
+    Returns max_distance + 1 when the cutoff is hit.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if len(a) < len(b):
+        a, b = b, a
+    
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, cb in enumerate(b, 1):
+            cost = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            )
+            current.append(cost)
+            row_min = min(row_min, cost)
+        if row_min > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+class GradingEngine:
+    """
+    Grades answers against precomputed normalized answer keys.
+    
+    Keys are built once when questions are saved (build_answer_key). Multiple
+    choice is graded by exact key match; short answer and essay questions
+    also accept accepted synonyms.
+    
+    Fuzzy matching is opt-in (fuzzy_threshold below 1.0). It then accepts near
+    matches whose jamo-level similarity reaches the threshold, within at most
+    fuzzy_max_edits edits. Answers with digits, and keys shorter than
+    fuzzy_min_length jamo/letters, are always graded exactly: there a single
+    edit usually changes the meaning ("2,000,000" vs "3,000,000").
+    """
+    
+    def __init__(self, fuzzy_threshold: float, fuzzy_min_length: int = 6, fuzzy_max_edits: int = 1):
+        self.fuzzy_threshold = fuzzy_threshold
+        self.fuzzy_min_length = fuzzy_min_length
+        self.fuzzy_max_edits = fuzzy_max_edits
+    
+    def build_answer_key(self, answer: str, accepted_answers: Iterable[str] = ()) -> Tuple[str, List[str]]:
+        """Return the normalized key and normalized accepted synonyms for a question."""
+        answer_key = normalize_answer(answer)
+        accepted = []
+        for alternative in accepted_answers:
+            normalized = normalize_answer(str(alternative))
+            if normalized and normalized != answer_key and normalized not in accepted:
+                accepted.append(normalized)
+        return answer_key, accepted
+    
+    def is_fuzzy_match(self, expected: str, actual: str) -> bool:
+        if DIGIT_PATTERN.search(expected) or DIGIT_PATTERN.search(actual):
+            return False
+        expected = decompose_hangul(expected)
+        actual = decompose_hangul(actual)
+        if len(expected) < self.fuzzy_min_length:
+            return False
+        longest = max(len(expected), len(actual))
+        max_distance = min(int(longest * (1 - self.fuzzy_threshold)), self.fuzzy_max_edits)
+        if max_distance <= 0:
+            return False
+        return edit_distance(expected, actual, max_distance) <= max_distance
+    
+    def grade(
+        self,
+        question_type: QuestionType,
+        answer_key: str,
+        accepted: Sequence[str],
+        user_answer: str
+    ) -> bool:
+        normalized = normalize_answer(user_answer)
+        if normalized == answer_key or normalized in accepted:
+            return True
+        
+        if question_type not in FUZZY_QUESTION_TYPES or self.fuzzy_threshold >= 1.0 or not normalized:
+            return False
+        
+        return any(self.is_fuzzy_match(expected, normalized) for expected in (answer_key, *accepted))
+    
+    def grade_question(self, question: Question, user_answer: str) -> bool:
+        """Grade against the stored key, deriving it for rows saved before keys existed."""
+        if question.answer_key is None:
+            answer_key, accepted = self.build_answer_key(question.answer)
+        else:
+            answer_key = question.answer_key
+            accepted = json.loads(question.accepted_answers) if question.accepted_answers else []
+        return self.grade(question.type, answer_key, accepted, user_answer)
+
+
+grading_engine = GradingEngine(
+    fuzzy_threshold=settings.grading_fuzzy_threshold,
+    fuzzy_min_length=settings.grading_fuzzy_min_length,
+    fuzzy_max_edits=settings.grading_fuzzy_max_edits,
+)
+
+
+async def backfill_answer_keys(db: AsyncSession, batch_size: int = 1000) -> int:
+    """Compute answer keys for questions saved before keys existed. Returns rows updated."""
+    updated = 0
+    while True:
+        result = await db.execute(
+            select(Question.id, Question.answer)
+            .where(Question.answer_key.is_(None))
+            .order_by(Question.id)
+            .limit(batch_size)
+        )
+        rows = result.all()
+        if not rows:
+            return updated
+        
+        params = [
+            {"question_id": question_id, "key": grading_engine.build_answer_key(answer)[0]}
+            for question_id, answer in rows
+        ]
+        await db.execute(
+            update(Question.__table__)
+            .where(Question.__table__.c.id == bindparam("question_id"))
+            .values(answer_key=bindparam("key")),
+            params
+        )
+        await db.commit()
+        updated += len(rows)
@@ -0,0 +1,58 @@
+import json
+from typing import Any, Dict, List
+
+
+class JsonObjectStreamParser:
+    """
+    Incrementally extract complete top-level objects from a streamed JSON array.
+    
+    Tokens are fed as they arrive from the model; every object whose closing
+    brace has been seen is returned immediately, so callers don't have to
+    wait for the whole array. Text outside objects (the array brackets,
+    commas, markdown fences) is ignored.
+    """
+    
+    def __init__(self):
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._current: List[str] = []
+    
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """Consume a chunk of text and return the objects it completed."""
+        completed = []
+        
+        for ch in text:
+            if self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                    self._current = [ch]
+                continue
+            
+            self._current.append(ch)
+            
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            
+            if ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        obj = json.loads("".join(self._current))
+                    except json.JSONDecodeError:
+                        obj = None
+                    if isinstance(obj, dict):
+                        completed.append(obj)
+                    self._current = []
+        
+        return completed
@@ -0,0 +1,117 @@
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select, delete, func
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import LlmCacheEntry
+
+
+class LlmCacheStats:
+    """In-process counters for the LLM response cache."""
+    
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.errors = 0
+    
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "errors": self.errors,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+stats = LlmCacheStats()
+
+
+def make_cache_key(prompt: str, model_name: str, question_type: Optional[str], num_questions: int) -> str:
+    """Content-addressed key: SHA-256 over the prompt and generation parameters."""
+    digest = hashlib.sha256()
+    for part in (model_name, question_type or "", str(num_questions), prompt):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+async def get_cached_questions(cache_key: str) -> Optional[List[Dict[str, Any]]]:
+    """Return cached questions for a key, or None on a miss or expired entry."""
+    try:
+        async with AsyncSessionLocal() as session:
+            entry = await session.get(LlmCacheEntry, cache_key)
+            
+            if entry is None:
+                stats.misses += 1
+                return None
+            
+            now = datetime.utcnow()
+            if entry.created_at < now - timedelta(seconds=settings.llm_cache_ttl_seconds):
+                await session.delete(entry)
+                await session.commit()
+                stats.misses += 1
+                return None
+            
+            entry.last_accessed_at = now
+            await session.commit()
+            stats.hits += 1
+            return json.loads(entry.payload)
+    except Exception:
+        # The cache is an optimization; never fail generation because of it
+        stats.errors += 1
+        return None
+
+
+async def store_cached_questions(
+    cache_key: str,
+    questions: List[Dict[str, Any]],
+    model_name: str,
+    question_type: Optional[str],
+    num_questions: int
+):
+    """Store generated questions and evict least recently used entries over the size cap."""
+    payload = json.dumps(questions, ensure_ascii=False)
+    
+    try:
+        async with AsyncSessionLocal() as session:
+            await session.merge(LlmCacheEntry(
+                cache_key=cache_key,
+                model_name=model_name,
+                question_type=question_type,
+                num_questions=num_questions,
+                payload=payload,
+                size_bytes=len(payload.encode("utf-8")),
+                created_at=datetime.utcnow(),
+                last_accessed_at=datetime.utcnow(),
+            ))
+            await session.flush()
+            
+            # LRU eviction: drop everything past the size cap, most recently used first
+            running_size = (
+                select(
+                    LlmCacheEntry.cache_key,
+                    func.sum(LlmCacheEntry.size_bytes).over(
+                        order_by=LlmCacheEntry.last_accessed_at.desc()
+                    ).label("running_size"),
+                )
+                .subquery()
+            )
+            await session.execute(
+                delete(LlmCacheEntry).where(
+                    LlmCacheEntry.cache_key.in_(
+                        select(running_size.c.cache_key)
+                        .where(running_size.c.running_size > settings.llm_cache_max_bytes)
+                    )
+                )
+            )
+            await session.commit()
+            stats.stores += 1
+    except Exception:
+        stats.errors += 1
@@ -1,37 +1,43 @@
-from langchain_community.llms import Ollama
+import asyncio
+import contextlib
 import json
-from typing import List, Dict, Any, Optional
+import re
+from typing import List, Dict, Any, Optional, AsyncIterator
 
 from app.config import settings
+from app.services.ollama_client import ollama_client
+from app.services.llm_cache import make_cache_key, get_cached_questions, store_cached_questions
+from app.services.json_stream import JsonObjectStreamParser
+from app.services.text_chunker import split_into_chunks, distribute_questions
 
 
-# Initialize Ollama LLM
-llm = Ollama(
-    model=settings.llm_model_name,
-    base_url=settings.ollama_base_url,
-    temperature=0.7,
-)
+STEM_NORMALIZE_PATTERN = re.compile(r'[\s\.,\?!·:;\'"“”‘’()\[\]]')
 
 
-async def generate_questions_from_content(
-    content: str,
-    num_questions: int = 10,
-    question_type: Optional[str] = "multiple_choice"
-) -> List[Dict[str, Any]]:
-    """
-    Generate questions from content using Ollama.
+def extract_json_array(response: str) -> Any:
+    """Parse the JSON array out of a raw LLM response."""
+    response = response.strip()
     
-    Args:
-        content: The learning material content
-        num_questions: Number of questions to generate
-        question_type: "multiple_choice" or "short_answer"
+    # Remove markdown code blocks if present
+    if response.startswith("```"):
+        lines = response.split("\n")
+        response = "\n".join(lines[1:-1])
     
-    Returns:
-        List of generated questions
-    """
-    try:
-        if question_type == "short_answer":
-            prompt = f"""다음 학습 내용을 바탕으로 한국어 단답형 문제 {num_questions}개를 생성해줘.
+    # Try to find JSON array in the response
+    start_idx = response.find("[")
+    end_idx = response.rfind("]")
+    
+    if start_idx != -1 and end_idx != -1:
+        return json.loads(response[start_idx:end_idx + 1])
+    
+    # Fallback: try to parse entire response
+    return json.loads(response)
+
+
+def build_generation_prompt(content: str, num_questions: int, question_type: Optional[str]) -> str:
+    """Build the question generation prompt for a piece of learning material."""
+    if question_type == "short_answer":
+        prompt = f"""다음 학습 내용을 바탕으로 한국어 단답형 문제 {num_questions}개를 생성해줘.
 
 각 문항은 다음 JSON 형식을 따라야 해:
 {{
@@ -45,8 +51,8 @@ async def generate_questions_from_content(
 
 생성된 문제들을 JSON 배열로 반환해줘. 다른 텍스트 없이 오직 JSON만 반환해.
 """
-        else:
-            prompt = f"""다음 학습 내용을 바탕으로 한국어 객관식 문제 {num_questions}개를 생성해줘.
+    else:
+        prompt = f"""다음 학습 내용을 바탕으로 한국어 객관식 문제 {num_questions}개를 생성해줘.
 
 각 문항은 다음 JSON 형식을 따라야 해:
 {{
@@ -66,41 +72,77 @@ async def generate_questions_from_content(
 
 생성된 문제들을 JSON 배열로 반환해줘. 다른 텍스트 없이 오직 JSON만 반환해.
 """
-        
-        # Call LLM
-        response = llm.invoke(prompt)
-        
-        # Parse JSON response
-        response = response.strip()
-        
-        # Remove markdown code blocks if present
-        if response.startswith("```"):
-            lines = response.split("\n")
-            response = "\n".join(lines[1:-1])
-        
-        # Try to find JSON array in the response
-        start_idx = response.find("[")
-        end_idx = response.rfind("]")
-        
-        if start_idx != -1 and end_idx != -1:
-            json_str = response[start_idx:end_idx + 1]
-            questions = json.loads(json_str)
-        else:
-            # Fallback: try to parse entire response
-            questions = json.loads(response)
-        
-        # Add type field if not present
-        for q in questions:
-            if "type" not in q:
-                q["type"] = question_type
-        
-        return questions
+    
+    return prompt
+
+
+async def request_questions(
+    content: str,
+    num_questions: int,
+    question_type: Optional[str],
+    use_cache: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Call the LLM once and parse its question array.
+    
+    Results are served from / stored in the LLM cache unless use_cache is False.
+    Raises json.JSONDecodeError (with the raw response attached as `doc`)
+    if the model did not return valid JSON.
+    """
+    prompt = build_generation_prompt(content, num_questions, question_type)
+    
+    use_cache = use_cache and settings.llm_cache_enabled
+    if use_cache:
+        cache_key = make_cache_key(prompt, settings.llm_model_name, question_type, num_questions)
+        cached = await get_cached_questions(cache_key)
+        if cached is not None:
+            return cached
+    
+    # Call LLM
+    response = await ollama_client.generate(prompt)
+    
+    # Parse JSON response
+    questions = extract_json_array(response)
+    
+    # Add type field if not present
+    for q in questions:
+        if "type" not in q:
+            q["type"] = question_type
+    
+    if use_cache:
+        await store_cached_questions(
+            cache_key, questions, settings.llm_model_name, question_type, num_questions
+        )
+    
+    return questions
+
+
+async def generate_questions_from_content(
+    content: str,
+    num_questions: int = 10,
+    question_type: Optional[str] = "multiple_choice",
+    use_cache: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Generate questions from content using Ollama.
+    
+    Args:
+        content: The learning material content
+        num_questions: Number of questions to generate
+        question_type: "multiple_choice" or "short_answer"
+        use_cache: Serve identical requests from the LLM cache
+    
+    Returns:
+        List of generated questions
+    """
+    try:
+        return await request_questions(content, num_questions, question_type, use_cache)
     
     except json.JSONDecodeError as e:
         # If JSON parsing fails, return a fallback error question
         return [{
             "type": "short_answer",
-            "stem": f"LLM 응답 파싱 실패. 원본 응답: {response[:200]}...",
+            "stem": f"LLM 응답 파싱 실패. 원본 응답: {e.doc[:200]}...",
             "answer": "",
             "explanation": f"JSON 파싱 오류: {str(e)}"
         }]
@@ -108,6 +150,102 @@ async def generate_questions_from_content(
         raise Exception(f"Failed to generate questions: {str(e)}")
 
 
+async def stream_questions_from_content(
+    content: str,
+    num_questions: int = 10,
+    question_type: Optional[str] = "multiple_choice",
+    use_cache: bool = True
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Generate questions and yield each one as soon as the model finishes it.
+    
+    Tokens are consumed as they arrive and complete question objects are
+    parsed out of the partial JSON array. Shares the LLM cache with
+    request_questions: a hit is replayed without calling the model, and a
+    completed stream is stored unless use_cache is False.
+    """
+    prompt = build_generation_prompt(content, num_questions, question_type)
+    
+    use_cache = use_cache and settings.llm_cache_enabled
+    if use_cache:
+        cache_key = make_cache_key(prompt, settings.llm_model_name, question_type, num_questions)
+        cached = await get_cached_questions(cache_key)
+        if cached is not None:
+            for q in cached:
+                yield q
+            return
+    
+    parser = JsonObjectStreamParser()
+    questions = []
+    
+    # Closing this generator early (client disconnect) closes the model stream too
+    async with contextlib.aclosing(ollama_client.stream_generate(prompt)) as tokens:
+        async for token in tokens:
+            for q in parser.feed(token):
+                if "type" not in q:
+                    q["type"] = question_type
+                questions.append(dict(q))
+                yield q
+    
+    if use_cache and questions:
+        await store_cached_questions(
+            cache_key, questions, settings.llm_model_name, question_type, num_questions
+        )
+
+
+def deduplicate_questions(questions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop questions whose normalized stem was already seen, keeping order."""
+    seen = set()
+    unique = []
+    for q in questions:
+        key = STEM_NORMALIZE_PATTERN.sub('', str(q.get("stem", ""))).lower()
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        unique.append(q)
+    return unique
+
+
+async def generate_questions_from_document(
+    content: str,
+    num_questions: int = 10,
+    question_type: Optional[str] = "multiple_choice",
+    use_cache: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Generate questions from a long document with chunked map-reduce.
+    
+    The text is split on section/paragraph boundaries to the configured token
+    budget, num_questions is spread across chunks by size, chunks are generated
+    concurrently (bounded by LLM_CHUNK_CONCURRENCY) and the results are merged
+    and deduplicated.
+    
+    A document that fits one chunk takes the same path. Chunks whose response
+    is not valid JSON are dropped; if no chunk produced questions this raises
+    instead of returning a placeholder, so callers never store a failed
+    generation as if it were a result.
+    """
+    chunks = split_into_chunks(content, settings.llm_chunk_max_tokens, settings.llm_chars_per_token)
+    counts = distribute_questions(num_questions, chunks)
+    semaphore = asyncio.Semaphore(settings.llm_chunk_concurrency)
+    
+    async def generate_chunk(chunk: str, count: int) -> List[Dict[str, Any]]:
+        async with semaphore:
+            return await request_questions(chunk, count, question_type, use_cache)
+    
+    results = await asyncio.gather(
+        *(generate_chunk(chunk, count) for chunk, count in zip(chunks, counts) if count > 0),
+        return_exceptions=True,
+    )
+    
+    questions = [q for result in results if not isinstance(result, BaseException) for q in result]
+    if not questions:
+        errors = [result for result in results if isinstance(result, BaseException)]
+        raise Exception(f"Failed to generate questions: {str(errors[0]) if errors else 'empty response'}")
+    
+    return deduplicate_questions(questions)[:num_questions]
+
+
 async def parse_text_with_llm(text: str) -> List[Dict[str, Any]]:
     """
     Use LLM to parse unstructured text into questions.
@@ -127,24 +265,8 @@ JSON 배열만 반환해줘.
 """
     
     try:
-        response = llm.invoke(prompt)
-        
-        # Parse JSON
-        response = response.strip()
-        if response.startswith("```"):
-            lines = response.split("\n")
-            response = "\n".join(lines[1:-1])
-        
-        start_idx = response.find("[")
-        end_idx = response.rfind("]")
-        
-        if start_idx != -1 and end_idx != -1:
-            json_str = response[start_idx:end_idx + 1]
-            questions = json.loads(json_str)
-        else:
-            questions = json.loads(response)
-        
-        return questions
+        response = await ollama_client.generate(prompt)
+        return extract_json_array(response)
     
     except Exception as e:
         raise Exception(f"Failed to parse with LLM: {str(e)}")
@@ -0,0 +1,304 @@
+import hashlib
+import random
+import sys
+import zlib
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select, delete, insert, any_, bindparam, Integer, BigInteger
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import Question, QuestionLshBucket, QuestionSignature
+from app.services.grading import normalize_answer
+from app.services.serializers import load_choices
+
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+# (question id or None for an earlier item of the same batch, batch index or None, similarity)
+Match = Tuple[Optional[int], Optional[int], float]
+
+
+def pack_signature(signature: Sequence[int]) -> bytes:
+    """Pack a signature into a little-endian uint32 array."""
+    packed = array("I", signature)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_signature(data: bytes) -> List[int]:
+    packed = array("I")
+    packed.frombytes(data)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tolist()
+
+
+def question_text(stem: str, choices: Iterable[str] = ()) -> str:
+    """The text a question is compared on: its stem followed by its choices."""
+    return " ".join([stem, *choices])
+
+
+def estimate_similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """Estimated Jaccard similarity: the share of MinHash slots that agree."""
+    if not a or len(a) != len(b):
+        return 0.0
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+class MinHasher:
+    """
+    MinHash signatures over character shingles, with LSH banding.
+
+    Shingles are taken from the normalized text (no whitespace or punctuation),
+    so spacing and punctuation changes do not matter. Permutations are seeded,
+    which keeps signatures stable across processes and restarts.
+    """
+
+    def __init__(self, num_perm: int, bands: int, shingle_size: int, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("minhash_num_perm must be a multiple of minhash_bands")
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.permutations = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def shingles(self, text: str) -> Set[int]:
+        normalized = normalize_answer(text)
+        size = min(self.shingle_size, len(normalized)) or 1
+        return {
+            zlib.crc32(normalized[i:i + size].encode("utf-8"))
+            for i in range(max(1, len(normalized) - size + 1))
+        }
+
+    def signature(self, text: str) -> List[int]:
+        shingles = self.shingles(text)
+        return [
+            min(((a * shingle + b) % MERSENNE_PRIME) & MAX_HASH for shingle in shingles)
+            for a, b in self.permutations
+        ]
+
+    def bucket_keys(self, signature: Sequence[int]) -> List[int]:
+        """One signed 64-bit key per band; equal keys mean an identical band."""
+        keys = []
+        for band in range(self.bands):
+            digest = hashlib.blake2b(digest_size=8)
+            digest.update(band.to_bytes(2, "little"))
+            digest.update(pack_signature(signature[band * self.rows:(band + 1) * self.rows]))
+            keys.append(int.from_bytes(digest.digest(), "little", signed=True))
+        return keys
+
+
+minhasher = MinHasher(settings.minhash_num_perm, settings.minhash_bands, settings.minhash_shingle_size)
+
+
+def compute_signatures(texts: Sequence[str]) -> List[List[int]]:
+    """
+    Signatures of a batch of texts.
+
+    Top-level so the parser pool can run it; workers build the same seeded
+    minhasher on import, so their signatures match the parent's.
+    """
+    return [minhasher.signature(text) for text in texts]
+
+
+async def load_candidates(db: AsyncSession, bucket_keys: Sequence[int]) -> Dict[int, List[int]]:
+    """
+    Signatures of every stored question sharing at least one bucket.
+
+    Two indexed lookups regardless of bank size: bucket keys -> question ids
+    via the (bucket_key, question_id) primary key, then their signatures.
+    """
+    if not bucket_keys:
+        return {}
+
+    result = await db.execute(
+        select(QuestionLshBucket.question_id).distinct().where(
+            QuestionLshBucket.bucket_key == any_(bindparam("keys", type_=ARRAY(BigInteger)))
+        ),
+        {"keys": list(set(bucket_keys))}
+    )
+    candidate_ids = list(result.scalars().all())
+    if not candidate_ids:
+        return {}
+
+    result = await db.execute(
+        select(QuestionSignature.question_id, QuestionSignature.signature).where(
+            QuestionSignature.question_id == any_(bindparam("ids", type_=ARRAY(Integer)))
+        ),
+        {"ids": candidate_ids}
+    )
+    return {question_id: unpack_signature(data) for question_id, data in result.all()}
+
+
+async def find_near_duplicates(
+    db: AsyncSession,
+    signatures: Sequence[List[int]],
+    threshold: float,
+    skip: bool = False
+) -> List[Optional[Match]]:
+    """
+    Best match at or above `threshold` for each signature of a batch.
+
+    Items are compared with stored questions and with earlier items of the
+    same batch. With `skip`, an item already matched is not offered as a
+    match for later items (it will not be stored).
+    """
+    keys_per_item = [minhasher.bucket_keys(signature) for signature in signatures]
+    stored = await load_candidates(db, [key for keys in keys_per_item for key in keys])
+
+    # Buckets of stored questions are only needed for the candidates found above
+    stored_buckets: Dict[int, List[int]] = {}
+    for question_id, signature in stored.items():
+        for key in minhasher.bucket_keys(signature):
+            stored_buckets.setdefault(key, []).append(question_id)
+
+    batch_buckets: Dict[int, List[int]] = {}
+    matches: List[Optional[Match]] = []
+
+    for index, (signature, keys) in enumerate(zip(signatures, keys_per_item)):
+        best: Optional[Match] = None
+        seen: Set[Tuple[bool, int]] = set()
+
+        for key in keys:
+            for question_id in stored_buckets.get(key, ()):
+                if (False, question_id) in seen:
+                    continue
+                seen.add((False, question_id))
+                similarity = estimate_similarity(signature, stored[question_id])
+                if similarity >= threshold and (best is None or similarity > best[2]):
+                    best = (question_id, None, similarity)
+
+            for other in batch_buckets.get(key, ()):
+                if (True, other) in seen:
+                    continue
+                seen.add((True, other))
+                similarity = estimate_similarity(signature, signatures[other])
+                if similarity >= threshold and (best is None or similarity > best[2]):
+                    best = (None, other, similarity)
+
+        matches.append(best)
+        if best is None or not skip:
+            for key in keys:
+                batch_buckets.setdefault(key, []).append(index)
+
+    return matches
+
+
+def build_signature_rows(
+    question_ids: Sequence[Optional[int]],
+    signatures: Sequence[List[int]],
+    matches: Sequence[Optional[Match]]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    `question_signatures` and `question_lsh_buckets` rows for stored questions.
+
+    `question_ids` lines up with the batch, with None for items that were not
+    stored; matches against earlier batch items resolve to their new ids.
+    """
+    signature_rows = []
+    bucket_rows = []
+
+    for question_id, signature, match in zip(question_ids, signatures, matches):
+        if question_id is None:
+            continue
+
+        duplicate_of_id = None
+        similarity = None
+        if match is not None:
+            matched_id, batch_index, similarity = match
+            duplicate_of_id = matched_id if matched_id is not None else question_ids[batch_index]
+
+        signature_rows.append({
+            "question_id": question_id,
+            "signature": pack_signature(signature),
+            "duplicate_of_id": duplicate_of_id,
+            "similarity": similarity,
+        })
+        bucket_rows.extend(
+            {"bucket_key": key, "question_id": question_id}
+            for key in set(minhasher.bucket_keys(signature))
+        )
+
+    return signature_rows, bucket_rows
+
+
+async def find_similar_questions(
+    db: AsyncSession,
+    question_id: int,
+    threshold: float,
+    limit: int
+) -> Optional[List[Tuple[int, float]]]:
+    """
+    Stored questions similar to one question, best first, as (id, similarity).
+
+    Returns None when the question has no signature yet.
+    """
+    result = await db.execute(
+        select(QuestionSignature.signature).where(QuestionSignature.question_id == question_id)
+    )
+    data = result.scalar_one_or_none()
+    if data is None:
+        return None
+
+    signature = unpack_signature(data)
+    candidates = await load_candidates(db, minhasher.bucket_keys(signature))
+
+    similar = [
+        (candidate_id, estimate_similarity(signature, candidate))
+        for candidate_id, candidate in candidates.items()
+        if candidate_id != question_id
+    ]
+    similar = [item for item in similar if item[1] >= threshold]
+    similar.sort(key=lambda item: (-item[1], item[0]))
+    return similar[:limit]
+
+
+async def backfill_signatures(db: AsyncSession, batch_size: int = 1000, rebuild: bool = False) -> int:
+    """
+    Compute signatures for questions stored without one. Returns rows written.
+
+    `rebuild` drops every signature and bucket first, which is required after
+    changing the MINHASH_* settings; existing near-duplicate flags are lost.
+    """
+    if rebuild:
+        await db.execute(delete(QuestionLshBucket))
+        await db.execute(delete(QuestionSignature))
+        await db.commit()
+
+    written = 0
+    last_id = 0
+    while True:
+        result = await db.execute(
+            select(Question.id, Question.stem)
+            .outerjoin(QuestionSignature, QuestionSignature.question_id == Question.id)
+            .where(QuestionSignature.question_id.is_(None), Question.id > last_id)
+            .order_by(Question.id)
+            .limit(batch_size)
+        )
+        rows = result.all()
+        if not rows:
+            return written
+
+        question_ids = [question_id for question_id, _ in rows]
+        choices_by_question = await load_choices(db, question_ids)
+        signatures = compute_signatures([
+            question_text(stem, (c.text for c in choices_by_question.get(question_id, ())))
+            for question_id, stem in rows
+        ])
+        signature_rows, bucket_rows = build_signature_rows(question_ids, signatures, [None] * len(rows))
+        await db.execute(insert(QuestionSignature), signature_rows)
+        await db.execute(insert(QuestionLshBucket), bucket_rows)
+        await db.commit()
+
+        written += len(rows)
+        last_id = question_ids[-1]
@@ -0,0 +1,131 @@
+import asyncio
+import contextlib
+import json
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from app.config import settings
+
+
+class OllamaError(Exception):
+    """Raised when the Ollama server reports an error."""
+    pass
+
+
+class OllamaClient:
+    """
+    Async client for Ollama's /api/generate endpoint.
+    
+    Uses one pooled keep-alive HTTP connection pool and streams tokens as the
+    model produces them, so generation never blocks the event loop. A semaphore
+    caps the number of generations in flight.
+    """
+    
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        temperature: float = 0.7,
+        timeout: float = 300.0,
+        connect_timeout: float = 10.0,
+        max_in_flight: int = 2,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.temperature = temperature
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_in_flight = max_in_flight
+        self.transport = transport
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                transport=self.transport,
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_in_flight,
+                    max_keepalive_connections=self.max_in_flight,
+                ),
+            )
+        return self._client
+    
+    async def stream_generate(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Yield response tokens from the model as they arrive.
+        
+        A background task reads the response into a queue, so a generation
+        slot is held only while the request to Ollama is open, not while the
+        caller is busy between tokens. Closing the generator (aclose, or a
+        client disconnect) cancels the request and frees its slot.
+        """
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": True,
+            "options": {"temperature": self.temperature},
+        }
+        
+        tokens: asyncio.Queue = asyncio.Queue()
+        reader = asyncio.create_task(self._read_stream(payload, tokens))
+        try:
+            while (token := await tokens.get()) is not None:
+                yield token
+            await reader  # Raises the reader's OllamaError, if any
+        finally:
+            # No-op once the reader has finished; retrieving its result here
+            # also covers an error the caller stopped reading before reaching
+            reader.cancel()
+            with contextlib.suppress(asyncio.CancelledError, OllamaError):
+                await reader
+    
+    async def _read_stream(self, payload: dict, tokens: asyncio.Queue):
+        """Put each response token on the queue, then None when the response ends."""
+        try:
+            async with self._semaphore, self._get_client().stream(
+                "POST", "/api/generate", json=payload
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        raise OllamaError(chunk["error"])
+                    token = chunk.get("response")
+                    if token:
+                        tokens.put_nowait(token)
+                    if chunk.get("done"):
+                        break
+        except httpx.HTTPError as e:
+            raise OllamaError(f"Ollama request failed: {str(e)}")
+        finally:
+            tokens.put_nowait(None)
+    
+    async def generate(self, prompt: str) -> str:
+        """Return the full model response for a prompt."""
+        tokens = []
+        async with contextlib.aclosing(self.stream_generate(prompt)) as stream:
+            async for token in stream:
+                tokens.append(token)
+        return "".join(tokens)
+    
+    async def aclose(self):
+        """Close pooled connections (called on application shutdown)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+ollama_client = OllamaClient(
+    base_url=settings.ollama_base_url,
+    model=settings.llm_model_name,
+    timeout=settings.ollama_timeout_seconds,
+    connect_timeout=settings.ollama_connect_timeout_seconds,
+    max_in_flight=settings.llm_max_in_flight,
+)
@@ -0,0 +1,45 @@
+import base64
+import json
+import math
+from typing import Any, List, Sequence
+
+
+# Integer key columns are int4; larger values would fail in the database instead
+INT32_MIN = -2 ** 31
+INT32_MAX = 2 ** 31 - 1
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row as an opaque, URL-safe cursor."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _is_valid_value(value: Any, value_type: type) -> bool:
+    if value_type is int:
+        # bool is an int subclass; a cursor never holds one
+        return type(value) is int and INT32_MIN <= value <= INT32_MAX
+    if value_type is float:
+        return type(value) in (int, float) and math.isfinite(value)
+    return isinstance(value, value_type)
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    `types` gives the expected type of each sort key field (int or float);
+    raises ValueError if the cursor is malformed or any field does not match,
+    so a tampered cursor never reaches the database.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError("Invalid cursor")
+    if not all(_is_valid_value(value, value_type) for value, value_type in zip(values, types)):
+        raise ValueError("Invalid cursor")
+    return [float(value) if value_type is float else value for value, value_type in zip(values, types)]
@@ -0,0 +1,110 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.services.pdf_parser import (
+    PdfDocumentAnalysis,
+    analyze_pdf_pages,
+    count_pdf_pages,
+    parse_pdf_analysis,
+    plan_page_shards,
+)
+from app.services.docx_parser import extract_docx_text, parse_docx_text
+
+
+ParseResult = Tuple[List[Dict[str, Any]], str]
+ProgressCallback = Callable[[int, int], Awaitable[None]]  # (pages_done, pages_total)
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_parser_pool() -> ProcessPoolExecutor:
+    """Return the shared parsing process pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.parse_workers,
+            max_tasks_per_child=settings.parse_max_tasks_per_child or None,
+        )
+    return _executor
+
+
+def shutdown_parser_pool():
+    """Stop the parsing process pool (called on application shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+
+async def run_in_parser_pool(func: Callable, *args) -> Any:
+    """Run a CPU-bound function in the parsing pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_parser_pool(), func, *args)
+
+
+def _parse_pdf_analysis(analysis: PdfDocumentAnalysis) -> ParseResult:
+    """Parse questions and keep the text for the AI fallback."""
+    return parse_pdf_analysis(analysis), analysis.text
+
+
+def _parse_docx_file(file_path: str) -> ParseResult:
+    """Worker entry point: parse questions and keep the text for the AI fallback."""
+    full_text = extract_docx_text(file_path)
+    return parse_docx_text(full_text), full_text
+
+
+async def analyze_pdf_sharded(
+    file_path: str,
+    on_progress: Optional[ProgressCallback] = None
+) -> PdfDocumentAnalysis:
+    """
+    Analyze a PDF with page-range sharding across the parsing pool.
+    
+    Every shard opens the file in its own worker; results are merged in page
+    order, so text spanning a page boundary is stitched exactly as in a
+    sequential pass. on_progress is awaited as shards finish.
+    """
+    page_count = await run_in_parser_pool(count_pdf_pages, file_path)
+    shards = plan_page_shards(page_count, settings.parse_workers, settings.pdf_min_pages_per_shard)
+    
+    tasks = [
+        asyncio.ensure_future(run_in_parser_pool(analyze_pdf_pages, file_path, start, stop))
+        for start, stop in shards
+    ]
+    
+    if on_progress:
+        await on_progress(0, page_count)
+        pages_done = 0
+        for finished in asyncio.as_completed(tasks):
+            pages_done += len(await finished)
+            await on_progress(pages_done, page_count)
+    
+    results = await asyncio.gather(*tasks)
+    return PdfDocumentAnalysis([page for pages in results for page in pages])
+
+
+async def parse_pdf(file_path: str, on_progress: Optional[ProgressCallback] = None) -> ParseResult:
+    """
+    Parse a PDF: page analysis in the process pool, question parsing here.
+    
+    The merged analysis is already in this process, and pickling it back to
+    a worker would cost about as much as the regex pass itself. The pass runs
+    in a thread so the event loop keeps getting scheduled while it runs.
+    
+    Returns:
+        (extracted questions, full document text)
+    """
+    analysis = await analyze_pdf_sharded(file_path, on_progress)
+    return await asyncio.to_thread(_parse_pdf_analysis, analysis)
+
+
+async def parse_docx(file_path: str) -> ParseResult:
+    """
+    Parse a DOCX in the process pool.
+    
+    Returns:
+        (extracted questions, full document text)
+    """
+    return await run_in_parser_pool(_parse_docx_file, file_path)
@@ -0,0 +1,240 @@
+import random
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event, select, any_, bindparam, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Question, Choice
+from app.responses import json_dumps
+from app.services.serializers import load_choices
+
+
+# Rough per-entry bookkeeping cost (dict slot, object, list) counted against the cap
+ENTRY_OVERHEAD_BYTES = 200
+
+
+def raw_object(fields: Iterable[Tuple[str, bytes]]) -> bytes:
+    """Assemble a JSON object from already encoded member values."""
+    return b"{" + b",".join(json_dumps(name) + b":" + value for name, value in fields) + b"}"
+
+
+def raw_array(items: Iterable[bytes]) -> bytes:
+    return b"[" + b",".join(items) + b"]"
+
+
+class CachedQuestion:
+    """
+    A question payload pre-encoded in fragments.
+
+    Rendering joins the fragments, so the same entry serves the full view, the
+    quiz view (no answer/explanation) and any choice order without re-encoding.
+    """
+
+    __slots__ = ("head", "answer", "choices")
+
+    def __init__(self, head: bytes, answer: bytes, choices: List[bytes]):
+        self.head = head  # {"id":..,"type":..,"stem":..
+        self.answer = answer  # ,"answer":..,"explanation":..
+        self.choices = choices  # One encoded {"label","text"} object per choice
+
+    @classmethod
+    def encode(cls, question: Question, choices: Iterable[Choice]) -> "CachedQuestion":
+        head = (
+            b'{"id":' + json_dumps(question.id)
+            + b',"type":' + json_dumps(question.type.value)
+            + b',"stem":' + json_dumps(question.stem)
+        )
+        answer = (
+            b',"answer":' + json_dumps(question.answer)
+            + b',"explanation":' + json_dumps(question.explanation)
+        )
+        return cls(head, answer, [json_dumps({"label": c.label, "text": c.text}) for c in choices])
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.head) + len(self.answer) + sum(len(c) for c in self.choices) + ENTRY_OVERHEAD_BYTES
+
+    def render(self, include_answer: bool = True, shuffle_choices: bool = False) -> bytes:
+        """Same JSON as serializers.serialize_question."""
+        choices = self.choices
+        if shuffle_choices and len(choices) > 1:
+            choices = random.sample(choices, len(choices))
+        return b"".join((
+            self.head,
+            self.answer if include_answer else b"",
+            b',"choices":',
+            raw_array(choices),
+            b"}",
+        ))
+
+
+class QuestionPayloadCache:
+    """
+    Bounded in-process LRU of CachedQuestion entries keyed by question id.
+
+    Every API process has its own cache, and invalidation only reaches the
+    process that made the change. Entries therefore expire after ttl_seconds,
+    which bounds how long an edit made elsewhere (another worker, a script,
+    SQL) can go unseen. A lookup can ask for a shorter max_age where the id
+    was not just read from the database (see get_question_payloads).
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.size_bytes = 0
+        self._entries: "OrderedDict[int, CachedQuestion]" = OrderedDict()
+        self._cached_at: Dict[int, float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, question_id: int, max_age: Optional[float] = None) -> Optional[CachedQuestion]:
+        entry = self._entries.get(question_id)
+        max_age = self.ttl_seconds if max_age is None else min(max_age, self.ttl_seconds)
+        if entry is not None and self._cached_at[question_id] + max_age <= time.monotonic():
+            self._discard(question_id)
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(question_id)
+        self.hits += 1
+        return entry
+
+    def put(self, question_id: int, entry: CachedQuestion):
+        size = entry.size_bytes
+        if size > self.max_bytes:
+            return
+        self._discard(question_id)
+        self._entries[question_id] = entry
+        self._cached_at[question_id] = time.monotonic()
+        self.size_bytes += size
+        while self.size_bytes > self.max_bytes:
+            self._discard(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, question_ids: Iterable[int]):
+        for question_id in question_ids:
+            if self._discard(question_id):
+                self.invalidations += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._cached_at.clear()
+        self.size_bytes = 0
+
+    def _discard(self, question_id: int) -> bool:
+        entry = self._entries.pop(question_id, None)
+        if entry is None:
+            return False
+        del self._cached_at[question_id]
+        self.size_bytes -= entry.size_bytes
+        return True
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+question_payloads = QuestionPayloadCache(settings.question_cache_max_bytes, settings.question_cache_ttl_seconds)
+
+
+async def get_question_payloads(
+    db: AsyncSession,
+    question_ids: Sequence[int],
+    max_age: Optional[float] = None
+) -> List[CachedQuestion]:
+    """
+    Cached payloads for the given ids, in the given order.
+
+    Misses are loaded with one query for the questions and one for their
+    choices, then cached. Ids that no longer exist are left out.
+
+    Hits are served without touching the database. List and quiz paths pass
+    ids from a query in the same transaction, so deleted questions never
+    reach the cache lookup. Callers with an id straight from the client pass
+    a short max_age instead, which bounds how long a question deleted by
+    another process is still served.
+    """
+    entries: Dict[int, CachedQuestion] = {}
+    missing = []
+    for question_id in question_ids:
+        if question_id in entries:
+            continue
+        entry = question_payloads.get(question_id, max_age)
+        if entry is None:
+            missing.append(question_id)
+        else:
+            entries[question_id] = entry
+
+    if missing:
+        result = await db.execute(
+            select(Question).where(
+                Question.id == any_(bindparam("question_ids", missing, type_=ARRAY(Integer)))
+            )
+        )
+        questions = result.scalars().all()
+        choices_by_question = await load_choices(db, [q.id for q in questions])
+        for question in questions:
+            entry = CachedQuestion.encode(question, choices_by_question.get(question.id, ()))
+            question_payloads.put(question.id, entry)
+            entries[question.id] = entry
+
+    return [entries[question_id] for question_id in question_ids if question_id in entries]
+
+
+def render_questions(
+    entries: Iterable[CachedQuestion],
+    include_answer: bool = True,
+    shuffle_choices: bool = False
+) -> bytes:
+    return raw_array(entry.render(include_answer, shuffle_choices) for entry in entries)
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_edited_questions(session: Session, flush_context):
+    """Drop cached payloads of questions or choices changed through the ORM."""
+    question_ids = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Question) and obj not in session.new:
+            question_ids.add(obj.id)
+        elif isinstance(obj, Choice):
+            question_ids.add(obj.question_id)
+    if question_ids:
+        question_payloads.invalidate(question_ids)
+        # Again after commit, in case a concurrent read re-cached the old rows
+        session.info.setdefault("edited_question_ids", set()).update(question_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_questions(session: Session):
+    question_ids = session.info.pop("edited_question_ids", None)
+    if question_ids:
+        question_payloads.invalidate(question_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_edited_questions(session: Session):
+    session.info.pop("edited_question_ids", None)
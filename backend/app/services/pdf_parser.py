@@ -1,6 +1,214 @@
 import pdfplumber
-import re
-from typing import List, Dict, Any
+from bisect import bisect_left
+from typing import List, Dict, Any, Tuple
+
+from app.services.question_grammar import (
+    CHOICE_ANSWER_PATTERN,
+    MAX_CHOICES,
+    QUESTION_BOUNDARY_PATTERN,
+    QUESTION_LINE_PATTERN,
+    QUESTION_NUMBER_PATTERN,
+    QUESTION_SPLIT_PATTERN,
+    SHORT_ANSWER_SECTION_MARKERS,
+    SYMBOL_CHOICE_LABELS,
+    find_choices,
+    split_short_answer,
+)
+
+# Vertical distance (pt) between glyph baselines that starts a new line
+LINE_BREAK_TOLERANCE = 3
+
+
+def is_red_color(color) -> bool:
+    """Check whether a pdfplumber fill color is (mostly) red."""
+    if color and len(color) == 3:
+        r, g, b = color
+        return r > 0.5 and g < 0.4 and b < 0.4
+    return False
+
+
+def scan_chars(chars) -> Tuple[str, List[int], List[str]]:
+    """
+    Walk a page's glyphs exactly once.
+
+    Returns the glyph text (with a newline inserted at every line break),
+    and the offsets and normalized labels of red choice symbols, in order.
+    """
+    text_parts = []
+    red_offsets = []
+    red_labels = []
+    offset = 0
+    last_top = None
+    
+    for char in chars:
+        top = char.get('top')
+        if last_top is not None and top is not None and abs(top - last_top) > LINE_BREAK_TOLERANCE:
+            text_parts.append("\n")
+            offset += 1
+        if top is not None:
+            last_top = top
+        
+        text = char['text']
+        if text in SYMBOL_CHOICE_LABELS and is_red_color(char.get('non_stroking_color')):
+            red_offsets.append(offset)
+            red_labels.append(SYMBOL_CHOICE_LABELS[text])
+        
+        text_parts.append(text)
+        offset += len(text)
+    
+    return "".join(text_parts), red_offsets, red_labels
+
+
+def map_red_choices(text: str, red_offsets: List[int], red_labels: List[str]) -> Dict[int, str]:
+    """
+    Map each question number to the first red choice symbol in its span.
+    
+    A question spans from its number up to the next line that starts with a
+    question number. Both lookups are binary searches over sorted offsets.
+    """
+    question_answers = {}
+    boundaries = [m.start() for m in QUESTION_BOUNDARY_PATTERN.finditer(text)]
+    
+    for match in QUESTION_NUMBER_PATTERN.finditer(text):
+        start_pos = match.end()
+        
+        boundary_idx = bisect_left(boundaries, start_pos)
+        end_pos = boundaries[boundary_idx] if boundary_idx < len(boundaries) else len(text)
+        
+        red_idx = bisect_left(red_offsets, start_pos)
+        if red_idx < len(red_offsets) and red_offsets[red_idx] < end_pos:
+            question_answers[int(match.group(1))] = red_labels[red_idx]
+    
+    return question_answers
+
+
+class PdfPageAnalysis:
+    """Everything later stages need from one PDF page, collected in one visit."""
+    
+    def __init__(
+        self,
+        page_number: int,
+        text: str,
+        glyph_text: str,
+        red_offsets: List[int],
+        red_labels: List[str],
+        width: float,
+        height: float,
+    ):
+        self.page_number = page_number
+        self.text = text  # Layout-aware text from pdfplumber
+        self.glyph_text = glyph_text  # Raw glyph stream used for color lookups
+        self.red_offsets = red_offsets
+        self.red_labels = red_labels
+        self.width = width
+        self.height = height
+
+
+def analyze_page(page) -> PdfPageAnalysis:
+    """Extract text, glyph colors and layout from a pdfplumber page."""
+    glyph_text, red_offsets, red_labels = scan_chars(page.chars)
+    return PdfPageAnalysis(
+        page_number=page.page_number,
+        text=page.extract_text() or "",
+        glyph_text=glyph_text,
+        red_offsets=red_offsets,
+        red_labels=red_labels,
+        width=float(page.width),
+        height=float(page.height),
+    )
+
+
+class PdfDocumentAnalysis:
+    """
+    Result of a single pass over a PDF.
+    
+    Page text, glyph colors and page layout are collected together so that
+    answer detection, question parsing and the AI fallback never re-open the file.
+    """
+    
+    def __init__(self, pages: List[PdfPageAnalysis]):
+        self.pages = pages
+        self._text = None
+        self._red_answers = None
+    
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+    
+    @property
+    def text(self) -> str:
+        """Full document text, pages separated by newlines."""
+        if self._text is None:
+            self._text = "\n".join(page.text for page in self.pages if page.text).strip()
+        return self._text
+    
+    @property
+    def red_answers(self) -> Dict[int, str]:
+        """Question number -> label of the red (correct) choice symbol."""
+        if self._red_answers is None:
+            glyph_parts = []
+            red_offsets = []
+            red_labels = []
+            offset = 0
+            for page in self.pages:
+                if glyph_parts:
+                    glyph_parts.append("\n")
+                    offset += 1
+                glyph_parts.append(page.glyph_text)
+                red_offsets.extend(offset + pos for pos in page.red_offsets)
+                red_labels.extend(page.red_labels)
+                offset += len(page.glyph_text)
+            self._red_answers = map_red_choices("".join(glyph_parts), red_offsets, red_labels)
+        return self._red_answers
+
+
+def analyze_pdf(file_path: str) -> PdfDocumentAnalysis:
+    """Open a PDF once and analyze every page in a single pass."""
+    try:
+        with pdfplumber.open(file_path) as pdf:
+            return PdfDocumentAnalysis([analyze_page(page) for page in pdf.pages])
+    except Exception as e:
+        raise Exception(f"Failed to analyze PDF: {str(e)}")
+
+
+def count_pdf_pages(file_path: str) -> int:
+    """Return the number of pages without extracting any content."""
+    try:
+        with pdfplumber.open(file_path) as pdf:
+            return len(pdf.pages)
+    except Exception as e:
+        raise Exception(f"Failed to analyze PDF: {str(e)}")
+
+
+def analyze_pdf_pages(file_path: str, start: int, stop: int) -> List[PdfPageAnalysis]:
+    """
+    Analyze pages [start, stop) of a PDF.
+    
+    Each parsing worker opens the file itself and handles only its own slice;
+    the slices are merged in order with PdfDocumentAnalysis(pages).
+    """
+    try:
+        with pdfplumber.open(file_path) as pdf:
+            return [analyze_page(page) for page in pdf.pages[start:stop]]
+    except Exception as e:
+        raise Exception(f"Failed to analyze PDF: {str(e)}")
+
+
+def plan_page_shards(page_count: int, workers: int, min_pages_per_shard: int) -> List[Tuple[int, int]]:
+    """Split pages into at most `workers` contiguous, evenly sized ranges."""
+    if page_count <= 0:
+        return []
+    
+    shard_count = max(1, min(workers, page_count // max(1, min_pages_per_shard)))
+    base, extra = divmod(page_count, shard_count)
+    
+    shards = []
+    start = 0
+    for i in range(shard_count):
+        stop = start + base + (1 if i < extra else 0)
+        shards.append((start, stop))
+        start = stop
+    return shards
 
 
 def extract_red_text_choices(pdf_path: str) -> Dict[int, str]:
@@ -8,80 +216,37 @@ def extract_red_text_choices(pdf_path: str) -> Dict[int, str]:
     Extract red-colored choice symbols from PDF.
     Returns a dict mapping question number to the red (correct) choice symbol.
     """
-    question_answers = {}
-    label_map = {'①': 'A', '②': 'B', '③': 'C', '④': 'D'}
-    
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            all_chars = []
-            for page in pdf.pages:
-                all_chars.extend(page.chars)
-            
-            full_text = ""
-            red_positions = set()
-            
-            for i, char in enumerate(all_chars):
-                full_text += char['text']
-                color = char.get('non_stroking_color', None)
-                
-                if color and len(color) == 3:
-                    r, g, b = color
-                    if r > 0.5 and g < 0.4 and b < 0.4:
-                        red_positions.add(i)
-            
-            question_pattern = r'(\d+)\s*[\.）\)]\s*'
-            
-            for match in re.finditer(question_pattern, full_text):
-                q_num = int(match.group(1))
-                start_pos = match.end()
-                
-                next_match = re.search(r'\n\d+\s*[\.）\)]', full_text[start_pos:])
-                end_pos = start_pos + next_match.start() if next_match else len(full_text)
-                
-                for pos in range(start_pos, min(end_pos, len(full_text))):
-                    if pos in red_positions:
-                        char = full_text[pos] if pos < len(full_text) else ''
-                        if char in label_map:
-                            question_answers[q_num] = label_map[char]
-                            break
+        return analyze_pdf(pdf_path).red_answers
     except Exception:
-        pass
-    
-    return question_answers
+        return {}
 
 
-async def extract_pdf_text(file_path: str) -> str:
+def extract_pdf_text(file_path: str) -> str:
     """Extract raw text from PDF file."""
     try:
-        with pdfplumber.open(file_path) as pdf:
-            full_text = ""
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text:
-                    full_text += text + "\n"
-        return full_text.strip()
+        return analyze_pdf(file_path).text
     except Exception as e:
         raise Exception(f"Failed to extract PDF text: {str(e)}")
 
 
-async def parse_pdf_questions(file_path: str) -> List[Dict[str, Any]]:
+def parse_pdf_analysis(analysis: PdfDocumentAnalysis) -> List[Dict[str, Any]]:
     """
-    Parse PDF file to extract questions.
-    Handles both multiple choice (①②③④) and short answer questions.
+    Extract questions from an already analyzed PDF.
+    Handles both multiple choice (①②③④, 가나다라, (1)-(4), A-D) and short answer questions.
     """
     questions = []
     
     try:
-        red_answers = extract_red_text_choices(file_path)
-        full_text = await extract_pdf_text(file_path)
+        red_answers = analysis.red_answers
+        full_text = analysis.text
         
         if not full_text:
             return []
         
         # Detect if there's a short answer section
         short_answer_section = None
-        short_answer_markers = ['※ 주관식', '주관식 문제', '서술형 문제', '단답형 문제']
-        for marker in short_answer_markers:
+        for marker in SHORT_ANSWER_SECTION_MARKERS:
             if marker in full_text:
                 idx = full_text.find(marker)
                 short_answer_section = full_text[idx:]
@@ -103,11 +268,24 @@ async def parse_pdf_questions(file_path: str) -> List[Dict[str, Any]]:
     return questions
 
 
+def parse_pdf_questions(file_path: str) -> List[Dict[str, Any]]:
+    """
+    Parse PDF file to extract questions.
+    Handles both multiple choice (①②③④, 가나다라, (1)-(4), A-D) and short answer questions.
+    """
+    try:
+        analysis = analyze_pdf(file_path)
+    except Exception as e:
+        raise Exception(f"Failed to parse PDF: {str(e)}")
+    
+    return parse_pdf_analysis(analysis)
+
+
 def parse_multiple_choice(text: str, red_answers: Dict[int, str]) -> List[Dict[str, Any]]:
     """Parse multiple choice questions from text."""
     questions = []
     
-    question_splits = re.split(r'(?:^|\n)(\d+)\s*[\.）\)]\s*', text)
+    question_splits = QUESTION_SPLIT_PATTERN.split(text)
     
     i = 1
     while i < len(question_splits) - 1:
@@ -119,38 +297,19 @@ def parse_multiple_choice(text: str, red_answers: Dict[int, str]) -> List[Dict[s
             i += 2
             continue
         
-        # Extract choices
-        choice_pattern = r'([①②③④])\s*([^①②③④\n]+)'
-        choices_matches = re.findall(choice_pattern, q_text)
-        
-        if not choices_matches:
-            choice_pattern = r'([A-D])\s*[\.）\)]\s*([^\n]+)'
-            choices_matches = re.findall(choice_pattern, q_text)
+        choices, first_choice_pos = find_choices(q_text, min_choices=2)
         
-        if choices_matches and len(choices_matches) >= 2:
-            first_choice_match = re.search(r'[①②③④]|[A-D]\s*[\.）\)]', q_text)
-            if first_choice_match:
-                stem = q_text[:first_choice_match.start()].strip()
-            else:
-                stem = q_text
-            
-            choices = []
-            label_map = {'①': 'A', '②': 'B', '③': 'C', '④': 'D'}
-            for choice_label, choice_text in choices_matches:
-                normalized_label = label_map.get(choice_label, choice_label)
-                choices.append({
-                    "label": normalized_label,
-                    "text": choice_text.strip()
-                })
+        if choices:
+            stem = q_text[:first_choice_pos].strip() if first_choice_pos is not None else q_text
             
             answer = red_answers.get(q_num, "A")
-            stem = re.sub(r'(?:정답|답)\s*[:：]\s*[①②③④A-D]', '', stem).strip()
+            stem = CHOICE_ANSWER_PATTERN.sub('', stem).strip()
             
             if stem and len(choices) >= 2:
                 questions.append({
                     "type": "multiple_choice",
                     "stem": stem,
-                    "choices": choices[:4],
+                    "choices": choices[:MAX_CHOICES],
                     "answer": answer,
                     "explanation": ""
                 })
@@ -176,7 +335,7 @@ def parse_short_answer(text: str) -> List[Dict[str, Any]]:
             continue
         
         # Check if this is a new question (starts with number)
-        q_match = re.match(r'^(\d+)\s*[\.）\)]\s*(.+)', line)
+        q_match = QUESTION_LINE_PATTERN.match(line)
         
         if q_match:
             # Save previous question
@@ -217,27 +376,4 @@ def extract_short_answer_parts(text: str) -> tuple:
     - "문제 내용? 정답"
     - "~를 쓰시오. 정답"
     """
-    # Common question endings
-    endings = ['쓰시오', '하시오', '서술하시오', '설명하시오', '무엇인가', '무엇입니까']
-    
-    # Try to find where the answer starts after a question ending
-    for ending in endings:
-        pattern = rf'(.*?{ending}[\.?]?)\s*(.+)'
-        match = re.search(pattern, text, re.DOTALL)
-        if match:
-            stem = match.group(1).strip()
-            answer = match.group(2).strip()
-            return stem, answer
-    
-    # Fallback: Last sentence might be the answer
-    # Split by periods and assume last part is answer
-    parts = re.split(r'[\?？]', text)
-    if len(parts) >= 2:
-        stem = parts[0].strip() + '?'
-        answer = ''.join(parts[1:]).strip()
-        # Clean up answer (remove trailing punctuation patterns)
-        answer = re.sub(r'^[\.\s]+', '', answer)
-        if answer:
-            return stem, answer
-    
-    return None, None
+    return split_short_answer(text)
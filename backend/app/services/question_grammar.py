@@ -0,0 +1,212 @@
+"""
+Shared grammar for question documents.
+
+Numbering, choice markers, answer/explanation keywords and short-answer
+endings are plain tables; every pattern the PDF and DOCX parsers use is
+compiled from them once at import time. Supporting a new numbering or
+choice style means adding a table entry, not a new regex.
+"""
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class ChoiceStyle(NamedTuple):
+    """
+    One way of marking choices, e.g. ①②③④ or A. B. C. D.
+
+    Markers are listed in order and map to labels A, B, C, ... by position.
+    `delimited` styles need a '.', ')' or '）' after the marker and run to the
+    end of the line; the others may sit several to a line, and a delimiter
+    after them ("①.") is optional. `standalone` markers must start a line or
+    follow whitespace, for markers that also occur inside ordinary words.
+    """
+    name: str
+    markers: Tuple[str, ...]
+    delimited: bool = False
+    standalone: bool = False
+
+
+# Tried in order; the first style found in a question wins.
+CHOICE_STYLES: Tuple[ChoiceStyle, ...] = (
+    ChoiceStyle("circled", ("①", "②", "③", "④", "⑤")),
+    ChoiceStyle("parenthesized", ("(1)", "(2)", "(3)", "(4)", "(5)"), standalone=True),
+    ChoiceStyle("hangul", ("가", "나", "다", "라", "마"), delimited=True, standalone=True),
+    ChoiceStyle("latin", ("A", "B", "C", "D", "E"), delimited=True),
+)
+
+CHOICE_LABELS = ("A", "B", "C", "D", "E")
+MAX_CHOICES = len(CHOICE_LABELS)
+
+# Question numbers look like "12.", "12)", "Q12." or "문12)"
+QUESTION_NUMBER_PREFIXES = ("Q", "문제", "문")
+QUESTION_NUMBER_DELIMITERS = (".", ")", "）")
+
+ANSWER_KEYWORDS = ("정답", "답")
+EXPLANATION_KEYWORDS = ("해설", "설명")
+KEYWORD_SEPARATORS = (":", "：")
+
+# Sentence endings that close a short-answer stem; the answer follows
+SHORT_ANSWER_ENDINGS = ("쓰시오", "하시오", "서술하시오", "설명하시오", "무엇인가", "무엇입니까")
+
+# Headings that start the short-answer part of an exam, checked in order
+SHORT_ANSWER_SECTION_MARKERS = ("※ 주관식", "주관식 문제", "서술형 문제", "단답형 문제")
+
+
+def _alternation(options) -> str:
+    # Longest first so that e.g. "문제" is preferred over "문"
+    return "|".join(re.escape(option) for option in sorted(options, key=len, reverse=True))
+
+
+def _char_class(options) -> str:
+    return "[" + "".join(re.escape(option) for option in options) + "]"
+
+
+_DELIMITER = _char_class(QUESTION_NUMBER_DELIMITERS)
+_NUMBER = rf'(?:{_alternation(QUESTION_NUMBER_PREFIXES)})?(\d+)'
+_BOUNDARY = rf'\n(?:{_alternation(QUESTION_NUMBER_PREFIXES)})?\d+\s*{_DELIMITER}'
+_SEPARATOR = _char_class(KEYWORD_SEPARATORS)
+_ANSWER = rf'(?:{_alternation(ANSWER_KEYWORDS)})\s*{_SEPARATOR}\s*'
+_EXPLANATION = rf'(?:{_alternation(EXPLANATION_KEYWORDS)})\s*{_SEPARATOR}\s*'
+
+# Any question number, anywhere (used to anchor answer spans in glyph text)
+QUESTION_NUMBER_PATTERN = re.compile(rf'{_NUMBER}\s*{_DELIMITER}\s*')
+# A line that starts a new question
+QUESTION_BOUNDARY_PATTERN = re.compile(_BOUNDARY)
+# Splitter whose captured group is the question number
+QUESTION_SPLIT_PATTERN = re.compile(rf'(?:^|\n){_NUMBER}\s*{_DELIMITER}\s*')
+# One numbered line: (number, rest of line)
+QUESTION_LINE_PATTERN = re.compile(rf'^{_NUMBER}\s*{_DELIMITER}\s*(.+)')
+# A whole question block: (number, body up to the next question)
+QUESTION_BLOCK_PATTERN = re.compile(
+    rf'(?:^|\n){_NUMBER}\s*{_DELIMITER}\s*(.+?)(?={_BOUNDARY}|\Z)',
+    re.DOTALL,
+)
+
+
+def _choice_marker_pattern(style: ChoiceStyle) -> str:
+    marker = rf'({_alternation(style.markers)})'
+    if style.delimited:
+        marker += rf'\s*{_DELIMITER}'
+    if style.standalone:
+        marker = rf'(?:(?<=\s)|^){marker}'
+    return marker
+
+
+def _choice_item_pattern(style: ChoiceStyle) -> str:
+    marker = _choice_marker_pattern(style)
+    if style.delimited:
+        return rf'{marker}\s*([^\n]+)'
+    # Inline choices end at the next marker of the same style or the line end
+    return rf'{marker}{_DELIMITER}?\s*(.+?)(?=\s*(?:{_alternation(style.markers)})|\n|\Z)'
+
+
+CHOICE_PATTERNS: Tuple[Tuple[ChoiceStyle, "re.Pattern"], ...] = tuple(
+    (style, re.compile(_choice_item_pattern(style), re.MULTILINE))
+    for style in CHOICE_STYLES
+)
+
+# Marker -> normalized label, across every style
+CHOICE_MARKER_LABELS: Dict[str, str] = {
+    marker: label
+    for style in CHOICE_STYLES
+    for marker, label in zip(style.markers, CHOICE_LABELS)
+}
+# Single-glyph markers that need no delimiter, looked up per glyph in PDFs
+SYMBOL_CHOICE_LABELS: Dict[str, str] = {
+    marker: label
+    for style in CHOICE_STYLES
+    if not style.delimited and all(len(marker) == 1 for marker in style.markers)
+    for marker, label in zip(style.markers, CHOICE_LABELS)
+}
+
+# Letter markers must not run into a word ("정답: 다음" is not choice 다)
+_ANY_CHOICE_MARKER = "|".join(
+    re.escape(marker) + (r'(?!\w)' if marker.isalpha() else '')
+    for marker in sorted(CHOICE_MARKER_LABELS, key=len, reverse=True)
+)
+
+# "정답: ③" -> "③"
+CHOICE_ANSWER_PATTERN = re.compile(rf'{_ANSWER}({_ANY_CHOICE_MARKER})')
+# "정답: 광합성" -> "광합성"
+TEXT_ANSWER_PATTERN = re.compile(rf'{_ANSWER}(.+?)(?:\n|$)')
+EXPLANATION_PATTERN = re.compile(rf'{_EXPLANATION}(.+?)(?={_BOUNDARY}|\Z)', re.DOTALL)
+
+# (stem through the first question ending, answer)
+SHORT_ANSWER_ENDING_PATTERN = re.compile(
+    rf'(.*?(?:{_alternation(SHORT_ANSWER_ENDINGS)})[\.?]?)\s*(.+)',
+    re.DOTALL,
+)
+QUESTION_MARK_PATTERN = re.compile(r'[\?？]')
+LEADING_PUNCTUATION_PATTERN = re.compile(r'^[\.\s]+')
+
+
+def normalize_choice_label(marker: str) -> str:
+    """Map any choice marker (③, 다, (3), C) to its letter label."""
+    return CHOICE_MARKER_LABELS.get(marker.strip(), marker.strip())
+
+
+def _longest_marker_run(style: ChoiceStyle, matches: List["re.Match"]) -> List["re.Match"]:
+    """The longest run of matches whose markers go first, second, third, ... in order."""
+    best: List["re.Match"] = []
+    run: List["re.Match"] = []
+    for match in matches:
+        marker = match.group(1)
+        if len(run) < len(style.markers) and marker == style.markers[len(run)]:
+            run.append(match)
+        elif marker == style.markers[0]:
+            run = [match]
+        else:
+            run = []
+        if len(run) > len(best):
+            best = list(run)
+    return best
+
+
+def find_choices(text: str, min_choices: int = 1) -> Tuple[List[Dict[str, str]], Optional[int]]:
+    """
+    Find the choices of one question.
+
+    Choices are the longest run of a style's markers in order (①②③..., never
+    a lone "(1)" quoted in the stem). Styles are tried in CHOICE_STYLES order
+    and the first whose run has at least `min_choices` markers is used.
+    Returns the choices (normalized labels) and the offset of the first
+    marker, or ([], None).
+    """
+    for style, item_pattern in CHOICE_PATTERNS:
+        run = _longest_marker_run(style, list(item_pattern.finditer(text)))
+        if len(run) < max(1, min_choices):
+            continue
+
+        choices = [
+            {"label": normalize_choice_label(match.group(1)), "text": match.group(2).strip()}
+            for match in run
+        ]
+        return choices, run[0].start(1)
+
+    return [], None
+
+
+def find_explanation(text: str) -> str:
+    match = EXPLANATION_PATTERN.search(text)
+    return match.group(1).strip() if match else ""
+
+
+def split_short_answer(text: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Split "문제 내용을 쓰시오. 정답" into (stem, answer).
+
+    The stem ends at the earliest known question ending; failing that, at
+    the first question mark.
+    """
+    match = SHORT_ANSWER_ENDING_PATTERN.search(text)
+    if match:
+        return match.group(1).strip(), match.group(2).strip()
+
+    parts = QUESTION_MARK_PATTERN.split(text)
+    if len(parts) >= 2:
+        stem = parts[0].strip() + '?'
+        answer = LEADING_PUNCTUATION_PATTERN.sub('', ''.join(parts[1:]).strip())
+        if answer:
+            return stem, answer
+
+    return None, None
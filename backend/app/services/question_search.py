@@ -0,0 +1,83 @@
+import re
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, select, func, or_, tuple_, cast, Float
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Question, QuestionType
+
+
+SEARCH_TERM_PATTERN = re.compile(r'\w+')
+LIKE_SPECIAL_PATTERN = re.compile(r'([\\%_])')
+
+
+def build_tsquery(query: str) -> Optional[str]:
+    """
+    Turn free text into a `simple` tsquery that prefix-matches every term.
+
+    Prefix matching lets "광합성" find "광합성은" and "광합성이다", which the
+    `simple` configuration otherwise treats as different words.
+    """
+    terms = SEARCH_TERM_PATTERN.findall(query.lower())
+    if not terms:
+        return None
+    return " & ".join(f"'{term}':*" for term in terms)
+
+
+def escape_like(value: str) -> str:
+    return LIKE_SPECIAL_PATTERN.sub(r'\\\1', value)
+
+
+def build_search_statement(
+    query: str,
+    after: Optional[Sequence] = None,
+    question_set_id: Optional[int] = None,
+    question_type: Optional[QuestionType] = None
+) -> Select:
+    """
+    The ranked search query, without a limit; see search_questions.
+
+    A question matches when all terms prefix-match its words (GIN over
+    search_vector) or the whole string appears inside its text (trigram GIN
+    over search_text).
+    """
+    query = query.strip()
+    tsquery_text = build_tsquery(query)
+
+    conditions = [Question.search_text.ilike(f"%{escape_like(query)}%")]
+    score = cast(func.word_similarity(query, Question.search_text), Float)
+
+    if tsquery_text:
+        tsquery = func.to_tsquery("simple", tsquery_text)
+        conditions.append(Question.search_vector.op("@@")(tsquery))
+        score = score + cast(func.ts_rank_cd(Question.search_vector, tsquery), Float)
+
+    statement = select(Question, score.label("score")).where(or_(*conditions))
+
+    if question_set_id:
+        statement = statement.where(Question.question_set_id == question_set_id)
+    if question_type:
+        statement = statement.where(Question.type == question_type)
+    if after is not None:
+        statement = statement.where(tuple_(score, Question.id) < tuple_(*after))
+
+    return statement.order_by(score.desc(), Question.id.desc())
+
+
+async def search_questions(
+    db: AsyncSession,
+    query: str,
+    limit: int,
+    after: Optional[Sequence] = None,
+    question_set_id: Optional[int] = None,
+    question_type: Optional[QuestionType] = None
+) -> List[Tuple[Question, float]]:
+    """
+    Rank questions against a search string; returns (question, score) pairs.
+
+    Results are ordered by (score desc, id desc), and `after` is the
+    (score, id) of the last row of the previous page.
+    """
+    statement = build_search_statement(query, after, question_set_id, question_type)
+    result = await db.execute(statement.limit(limit))
+    return [(question, float(question_score)) for question, question_score in result.all()]
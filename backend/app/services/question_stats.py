@@ -0,0 +1,167 @@
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Float, Integer, case, cast, column, delete, insert, select, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import AttemptHistory, QuestionStat
+
+
+# Frequently wrong: at least this many attempts with accuracy below the threshold
+FREQUENTLY_WRONG_MIN_ATTEMPTS = 2
+FREQUENTLY_WRONG_THRESHOLD = 0.5
+
+
+def rolling_update(outcomes: Sequence[bool], alpha: float) -> Tuple[float, float, float]:
+    """
+    Fold a sequence of outcomes into an exponential moving average.
+    
+    Returns (decay, contribution, fresh) such that an existing average r
+    becomes r * decay + contribution, and a question with no prior attempts
+    gets `fresh` (the EMA seeded with the first outcome).
+    """
+    decay = (1 - alpha) ** len(outcomes)
+    contribution = 0.0
+    for outcome in outcomes:
+        contribution = contribution * (1 - alpha) + alpha * float(outcome)
+    
+    fresh = float(outcomes[0])
+    for outcome in outcomes[1:]:
+        fresh = fresh * (1 - alpha) + alpha * float(outcome)
+    
+    return decay, contribution, fresh
+
+
+async def record_attempts(
+    db: AsyncSession,
+    attempts: Sequence[Tuple[int, bool]],
+    attempted_at: Optional[datetime] = None
+):
+    """
+    Fold graded attempts into question_stats in the caller's transaction.
+    
+    Uses two statements regardless of batch size: one INSERT ... ON CONFLICT
+    DO NOTHING for first-time questions, and one UPDATE ... FROM (VALUES ...)
+    that applies the per-question deltas.
+    """
+    if not attempts:
+        return
+    
+    attempted_at = attempted_at or datetime.utcnow()
+    alpha = settings.stats_rolling_alpha
+    
+    outcomes_by_question: Dict[int, List[bool]] = OrderedDict()
+    for question_id, is_correct in attempts:
+        outcomes_by_question.setdefault(question_id, []).append(bool(is_correct))
+    
+    await db.execute(
+        pg_insert(QuestionStat)
+        .values([
+            {"question_id": question_id, "attempts": 0, "corrects": 0, "accuracy": 0.0, "rolling_accuracy": 0.0}
+            for question_id in outcomes_by_question
+        ])
+        .on_conflict_do_nothing(index_elements=[QuestionStat.question_id])
+    )
+    
+    rows = []
+    for question_id, outcomes in outcomes_by_question.items():
+        decay, contribution, fresh = rolling_update(outcomes, alpha)
+        rows.append((question_id, len(outcomes), sum(outcomes), decay, contribution, fresh))
+    
+    delta = values(
+        column("question_id", Integer),
+        column("attempts", Integer),
+        column("corrects", Integer),
+        column("decay", Float),
+        column("contribution", Float),
+        column("fresh", Float),
+        name="delta",
+    ).data(rows)
+    
+    new_attempts = QuestionStat.attempts + delta.c.attempts
+    new_corrects = QuestionStat.corrects + delta.c.corrects
+    await db.execute(
+        update(QuestionStat)
+        .where(QuestionStat.question_id == delta.c.question_id)
+        .values(
+            attempts=new_attempts,
+            corrects=new_corrects,
+            accuracy=cast(new_corrects, Float) / new_attempts,
+            rolling_accuracy=case(
+                (QuestionStat.attempts == 0, delta.c.fresh),
+                else_=QuestionStat.rolling_accuracy * delta.c.decay + delta.c.contribution,
+            ),
+            last_attempted_at=attempted_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def frequently_wrong_question_ids(threshold: float = FREQUENTLY_WRONG_THRESHOLD):
+    """Subquery of question ids answered wrong more often than not (index lookup)."""
+    return (
+        select(QuestionStat.question_id)
+        .where(QuestionStat.accuracy < threshold)
+        .where(QuestionStat.attempts >= FREQUENTLY_WRONG_MIN_ATTEMPTS)
+    )
+
+
+async def backfill_question_stats(db: AsyncSession, batch_size: int = 1000) -> int:
+    """
+    Rebuild question_stats from the full attempt_history table.
+    
+    History is streamed in (question_id, attempted_at) order so only one
+    question's outcomes are held in memory at a time. Returns the number
+    of questions written.
+    """
+    alpha = settings.stats_rolling_alpha
+    await db.execute(delete(QuestionStat))
+    
+    stream = await db.stream(
+        select(AttemptHistory.question_id, AttemptHistory.is_correct, AttemptHistory.attempted_at)
+        .order_by(AttemptHistory.question_id, AttemptHistory.attempted_at, AttemptHistory.id)
+        .execution_options(yield_per=batch_size)
+    )
+    
+    pending = []
+    written = 0
+    current_id = None
+    outcomes: List[bool] = []
+    last_attempted_at = None
+    
+    def flush_question():
+        if current_id is None:
+            return
+        _, _, rolling = rolling_update(outcomes, alpha)
+        corrects = sum(outcomes)
+        pending.append({
+            "question_id": current_id,
+            "attempts": len(outcomes),
+            "corrects": corrects,
+            "accuracy": corrects / len(outcomes),
+            "rolling_accuracy": rolling,
+            "last_attempted_at": last_attempted_at,
+        })
+    
+    async for question_id, is_correct, attempted_at in stream:
+        if question_id != current_id:
+            flush_question()
+            current_id = question_id
+            outcomes = []
+        outcomes.append(bool(is_correct))
+        last_attempted_at = attempted_at
+        
+        if len(pending) >= batch_size:
+            await db.execute(insert(QuestionStat), pending)
+            written += len(pending)
+            pending = []
+    
+    flush_question()
+    if pending:
+        await db.execute(insert(QuestionStat), pending)
+        written += len(pending)
+    
+    return written
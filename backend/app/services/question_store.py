@@ -0,0 +1,302 @@
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import QuestionSet, Question, Choice, QuestionType, QuestionSignature, QuestionLshBucket
+from app.services.grading import grading_engine
+from app.services.near_duplicates import (
+    build_signature_rows,
+    compute_signatures,
+    find_near_duplicates,
+    question_text,
+)
+from app.services.parsing_service import run_in_parser_pool
+
+
+QUESTION_COPY_COLUMNS = [
+    "id", "question_set_id", "type", "stem", "answer", "explanation",
+    "answer_key", "accepted_answers", "order_index", "created_at",
+]
+CHOICE_COPY_COLUMNS = ["question_id", "label", "text", "order_index"]
+SIGNATURE_COPY_COLUMNS = ["question_id", "signature", "duplicate_of_id", "similarity"]
+BUCKET_COPY_COLUMNS = ["bucket_key", "question_id"]
+
+# Smaller batches are hashed inline (~1.5 ms per question); the pool round
+# trip would cost about as much and could queue behind a long parse
+SIGNATURE_POOL_MIN_QUESTIONS = 8
+
+
+def build_question_rows(
+    questions_data: Sequence[Dict[str, Any]],
+    question_set_id: int,
+    default_type: str = "multiple_choice",
+    start_index: int = 0
+) -> Tuple[List[Dict[str, Any]], List[List[Tuple[str, str]]]]:
+    """
+    Turn parsed/generated question dicts into `questions` rows plus each
+    question's (label, text) choices.
+    
+    Everything is validated here, before any SQL runs, so a malformed item
+    raises KeyError/ValueError without leaving partial rows behind.
+    """
+    now = datetime.utcnow()
+    question_rows = []
+    question_choices = []
+    
+    for idx, q_data in enumerate(questions_data):
+        question_type = QuestionType(q_data.get("type") or default_type)
+        answer_key, accepted = grading_engine.build_answer_key(
+            q_data["answer"], q_data.get("accepted_answers") or ()
+        )
+        question_rows.append({
+            "question_set_id": question_set_id,
+            "type": question_type,
+            "stem": q_data["stem"],
+            "answer": q_data["answer"],
+            "explanation": q_data.get("explanation", ""),
+            "answer_key": answer_key,
+            "accepted_answers": json.dumps(accepted, ensure_ascii=False) if accepted else None,
+            "order_index": start_index + idx,
+            "created_at": now,
+        })
+        
+        if question_type == QuestionType.MULTIPLE_CHOICE and "choices" in q_data:
+            question_choices.append([(c["label"], c["text"]) for c in q_data["choices"]])
+        else:
+            question_choices.append([])
+    
+    return question_rows, question_choices
+
+
+def build_choice_rows(question_choices: List[List[Tuple[str, str]]], question_ids: List[int]) -> List[Dict[str, Any]]:
+    """Build `choices` rows once the question ids are known."""
+    return [
+        {
+            "question_id": question_id,
+            "label": label,
+            "text": choice_text,
+            "order_index": choice_idx,
+        }
+        for choices, question_id in zip(question_choices, question_ids)
+        for choice_idx, (label, choice_text) in enumerate(choices)
+    ]
+
+
+async def _get_asyncpg_connection(db: AsyncSession):
+    """Return the driver-level asyncpg connection of the session's transaction."""
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    return raw_connection.driver_connection
+
+
+async def _copy_questions(db: AsyncSession, question_rows: List[Dict[str, Any]]) -> List[int]:
+    """COPY question rows with ids reserved from the table's sequence up front."""
+    result = await db.execute(
+        text("SELECT nextval(pg_get_serial_sequence('questions', 'id')) FROM generate_series(1, :count)"),
+        {"count": len(question_rows)}
+    )
+    question_ids = list(result.scalars().all())
+    
+    driver_connection = await _get_asyncpg_connection(db)
+    await driver_connection.copy_records_to_table(
+        "questions",
+        columns=QUESTION_COPY_COLUMNS,
+        records=[
+            (
+                question_id,
+                row["question_set_id"],
+                row["type"].name,  # Enum columns store member names
+                row["stem"],
+                row["answer"],
+                row["explanation"],
+                row["answer_key"],
+                row["accepted_answers"],
+                row["order_index"],
+                row["created_at"],
+            )
+            for question_id, row in zip(question_ids, question_rows)
+        ],
+    )
+    return question_ids
+
+
+async def _copy_rows(db: AsyncSession, table: str, columns: List[str], rows: List[Dict[str, Any]]):
+    driver_connection = await _get_asyncpg_connection(db)
+    await driver_connection.copy_records_to_table(
+        table,
+        columns=columns,
+        records=[tuple(row[column] for column in columns) for row in rows],
+    )
+
+
+async def _copy_choices(db: AsyncSession, choice_rows: List[Dict[str, Any]]):
+    await _copy_rows(db, "choices", CHOICE_COPY_COLUMNS, choice_rows)
+
+
+async def compute_question_signatures(texts: List[str]) -> List[List[int]]:
+    """MinHash signatures of question texts, computed off the event loop for real batches."""
+    if len(texts) < SIGNATURE_POOL_MIN_QUESTIONS:
+        return compute_signatures(texts)
+    return await run_in_parser_pool(compute_signatures, texts)
+
+
+async def bulk_insert_questions(
+    db: AsyncSession,
+    question_set_id: int,
+    questions_data: Sequence[Dict[str, Any]],
+    default_type: str = "multiple_choice",
+    start_index: int = 0
+) -> List[Optional[int]]:
+    """
+    Insert questions and their choices in bulk; returns the new question ids
+    in input order, with None for near-duplicates that were skipped.
+    
+    Questions go in with one multi-row INSERT ... RETURNING id and choices with
+    one executemany, instead of a flush per question. Batches of at least
+    BULK_COPY_THRESHOLD questions use asyncpg's COPY protocol instead.
+    
+    Every stored question gets a MinHash signature, computed in the parser
+    pool; only the bucket lookup and the inserts run on the event loop.
+    Depending on NEAR_DUPLICATE_ACTION, near-duplicates of stored questions
+    (or of earlier items in the batch) are flagged on their signature row or
+    skipped.
+    """
+    if not questions_data:
+        return []
+    
+    question_rows, question_choices = build_question_rows(
+        questions_data, question_set_id, default_type, start_index
+    )
+    signatures = await compute_question_signatures([
+        question_text(row["stem"], (text for _, text in choices))
+        for row, choices in zip(question_rows, question_choices)
+    ])
+    
+    action = settings.near_duplicate_action
+    if action in ("flag", "skip"):
+        matches = await find_near_duplicates(
+            db, signatures, settings.near_duplicate_threshold, skip=action == "skip"
+        )
+    else:
+        matches = [None] * len(question_rows)
+    
+    kept = [
+        index for index, match in enumerate(matches)
+        if not (action == "skip" and match is not None)
+    ]
+    if not kept:
+        return [None] * len(question_rows)
+    
+    use_copy = (
+        len(kept) >= settings.bulk_copy_threshold
+        and db.bind.dialect.driver == "asyncpg"
+    )
+    kept_rows = [question_rows[index] for index in kept]
+    
+    if use_copy:
+        kept_ids = await _copy_questions(db, kept_rows)
+    else:
+        result = await db.execute(
+            insert(Question).returning(Question.id, sort_by_parameter_order=True),
+            kept_rows
+        )
+        kept_ids = list(result.scalars().all())
+    
+    question_ids: List[Optional[int]] = [None] * len(question_rows)
+    for index, question_id in zip(kept, kept_ids):
+        question_ids[index] = question_id
+    
+    choice_rows = build_choice_rows([question_choices[index] for index in kept], kept_ids)
+    signature_rows, bucket_rows = build_signature_rows(question_ids, signatures, matches)
+    
+    if use_copy:
+        if choice_rows:
+            await _copy_choices(db, choice_rows)
+        await _copy_rows(db, "question_signatures", SIGNATURE_COPY_COLUMNS, signature_rows)
+        await _copy_rows(db, "question_lsh_buckets", BUCKET_COPY_COLUMNS, bucket_rows)
+    else:
+        if choice_rows:
+            await db.execute(insert(Choice), choice_rows)
+        await db.execute(insert(QuestionSignature), signature_rows)
+        await db.execute(insert(QuestionLshBucket), bucket_rows)
+    
+    return question_ids
+
+
+async def clone_questions(db: AsyncSession, source_set_id: int, target_set_id: int) -> int:
+    """
+    Copy every question and choice of one set into another without leaving SQL.
+    
+    New ids are reserved from the sequence first so each choice can follow
+    its question through an (old_id, new_id) mapping. Returns the number of
+    questions copied.
+    """
+    result = await db.execute(
+        text(
+            "SELECT id, nextval(pg_get_serial_sequence('questions', 'id')) "
+            "FROM questions WHERE question_set_id = :source ORDER BY order_index, id"
+        ),
+        {"source": source_set_id}
+    )
+    id_pairs = result.all()
+    if not id_pairs:
+        return 0
+    
+    mapping = {
+        "old_ids": [old_id for old_id, _ in id_pairs],
+        "new_ids": [new_id for _, new_id in id_pairs],
+    }
+    await db.execute(
+        text(
+            "INSERT INTO questions (id, question_set_id, type, stem, answer, explanation, "
+            "answer_key, accepted_answers, order_index, created_at) "
+            "SELECT m.new_id, :target, q.type, q.stem, q.answer, q.explanation, "
+            "q.answer_key, q.accepted_answers, q.order_index, now() AT TIME ZONE 'utc' "
+            "FROM questions q "
+            "JOIN unnest(CAST(:old_ids AS integer[]), CAST(:new_ids AS bigint[])) AS m(old_id, new_id) "
+            "ON q.id = m.old_id"
+        ),
+        {"target": target_set_id, **mapping}
+    )
+    await db.execute(
+        text(
+            "INSERT INTO choices (question_id, label, text, order_index) "
+            "SELECT m.new_id, c.label, c.text, c.order_index "
+            "FROM choices c "
+            "JOIN unnest(CAST(:old_ids AS integer[]), CAST(:new_ids AS bigint[])) AS m(old_id, new_id) "
+            "ON c.question_id = m.old_id"
+        ),
+        mapping
+    )
+    # A deliberate copy is not flagged as a near-duplicate of its source
+    await db.execute(
+        text(
+            "INSERT INTO question_signatures (question_id, signature) "
+            "SELECT m.new_id, s.signature "
+            "FROM question_signatures s "
+            "JOIN unnest(CAST(:old_ids AS integer[]), CAST(:new_ids AS bigint[])) AS m(old_id, new_id) "
+            "ON s.question_id = m.old_id"
+        ),
+        mapping
+    )
+    await db.execute(
+        text(
+            "INSERT INTO question_lsh_buckets (bucket_key, question_id) "
+            "SELECT b.bucket_key, m.new_id "
+            "FROM question_lsh_buckets b "
+            "JOIN unnest(CAST(:old_ids AS integer[]), CAST(:new_ids AS bigint[])) AS m(old_id, new_id) "
+            "ON b.question_id = m.old_id"
+        ),
+        mapping
+    )
+    return len(id_pairs)
+
+
+async def save_questions_to_db(questions_data: list, question_set: QuestionSet, db: AsyncSession) -> int:
+    """Helper function to save questions to database. Returns how many were stored."""
+    question_ids = await bulk_insert_questions(db, question_set.id, questions_data)
+    return sum(1 for question_id in question_ids if question_id is not None)
@@ -0,0 +1,139 @@
+import random
+import sys
+import uuid
+from array import array
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import select, update, func, any_, bindparam, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Question, QuizSession
+from app.services.serializers import load_choices, serialize_question
+
+
+ID_SIZE = 4  # Bytes per packed question id (int32)
+MAX_SEED = 2 ** 31 - 1
+
+
+def pack_ids(question_ids: Sequence[int]) -> bytes:
+    """Pack question ids into a compact little-endian int32 array."""
+    packed = array("i", question_ids)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_ids(data: bytes) -> List[int]:
+    packed = array("i")
+    packed.frombytes(data)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tolist()
+
+
+async def create_session(
+    db: AsyncSession,
+    id_query,
+    shuffle_questions: bool,
+    shuffle_choices: bool,
+    limit: Optional[int] = None,
+    seed: Optional[int] = None
+) -> Optional[QuizSession]:
+    """
+    Create a session from a query selecting Question.id.
+    
+    Only ids are loaded. With shuffle and a limit, N questions are sampled in
+    SQL (ORDER BY random() LIMIT N); otherwise the ids are read in bank order
+    and permuted with a seeded RNG. Returns None if nothing matches.
+    """
+    seed = seed if seed is not None else random.randint(0, MAX_SEED)
+    
+    if shuffle_questions and limit:
+        id_query = id_query.order_by(func.random()).limit(limit)
+    else:
+        id_query = id_query.order_by(Question.question_set_id, Question.order_index, Question.id)
+        if limit:
+            id_query = id_query.limit(limit)
+    
+    result = await db.execute(id_query)
+    question_ids = list(result.scalars().all())
+    if not question_ids:
+        return None
+    
+    if shuffle_questions:
+        random.Random(seed).shuffle(question_ids)
+    
+    session = QuizSession(
+        id=uuid.uuid4().hex,
+        question_ids=pack_ids(question_ids),
+        total=len(question_ids),
+        position=0,
+        seed=seed,
+        shuffle_choices=shuffle_choices,
+    )
+    db.add(session)
+    await db.flush()
+    return session
+
+
+async def next_page(db: AsyncSession, session_id: str, size: int) -> Optional[Dict[str, Any]]:
+    """
+    Serve the next `size` questions of a session and advance its position.
+    
+    Only the slice of the packed id array for this page is read from the
+    database, so memory and response size are bounded by `size`, not by the
+    bank. Returns None if the session does not exist.
+    """
+    result = await db.execute(
+        select(QuizSession.position, QuizSession.total, QuizSession.seed, QuizSession.shuffle_choices)
+        .where(QuizSession.id == session_id)
+        .with_for_update()
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+    
+    position, total, seed, shuffle_choices = row
+    count = max(0, min(size, total - position))
+    
+    questions = []
+    if count:
+        # bytea substring is 1-based
+        slice_result = await db.execute(
+            select(func.substring(QuizSession.question_ids, position * ID_SIZE + 1, count * ID_SIZE))
+            .where(QuizSession.id == session_id)
+        )
+        page_ids = unpack_ids(slice_result.scalar_one())
+        
+        questions_result = await db.execute(
+            select(Question).where(
+                Question.id == any_(bindparam("page_ids", page_ids, type_=ARRAY(Integer)))
+            )
+        )
+        questions_by_id = {q.id: q for q in questions_result.scalars().all()}
+        choices_by_question = await load_choices(db, page_ids)
+        
+        for question_id in page_ids:
+            question = questions_by_id.get(question_id)
+            if question is None:
+                continue  # Deleted since the session was created
+            choices = list(choices_by_question.get(question_id, ()))
+            if shuffle_choices and choices:
+                random.Random(f"{seed}:{question_id}").shuffle(choices)
+            questions.append(serialize_question(question, choices, include_answer=False))
+        
+        await db.execute(
+            update(QuizSession)
+            .where(QuizSession.id == session_id)
+            .values(position=position + count)
+        )
+    
+    return {
+        "session_id": session_id,
+        "questions": questions,
+        "position": position + count,
+        "total_questions": total,
+        "remaining": total - position - count,
+        "done": position + count >= total,
+    }
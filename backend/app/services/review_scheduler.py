@@ -0,0 +1,216 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import select, delete, insert, any_, bindparam, Integer
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import AttemptHistory, ReviewState
+
+
+# SM-2 answer quality (0-5) assigned to a graded attempt
+QUALITY_CORRECT = 4
+QUALITY_WRONG = 1
+PASSING_QUALITY = 3
+
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+FIRST_INTERVAL_DAYS = 1.0
+SECOND_INTERVAL_DAYS = 6.0
+# A missed question comes back within the same study session
+RELEARN_DELAY = timedelta(minutes=10)
+
+
+class ReviewSchedule(NamedTuple):
+    ease_factor: float
+    interval_days: float
+    repetitions: int
+    lapses: int
+    due_at: datetime
+
+
+def sm2_step(
+    ease_factor: float,
+    interval_days: float,
+    repetitions: int,
+    lapses: int,
+    quality: int,
+    reviewed_at: datetime
+) -> ReviewSchedule:
+    """Advance one question's SM-2 state by one answer of the given quality."""
+    ease_factor = max(
+        MIN_EASE,
+        ease_factor + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+    )
+
+    if quality < PASSING_QUALITY:
+        return ReviewSchedule(ease_factor, 0.0, 0, lapses + 1, reviewed_at + RELEARN_DELAY)
+
+    if repetitions == 0:
+        interval_days = FIRST_INTERVAL_DAYS
+    elif repetitions == 1:
+        interval_days = SECOND_INTERVAL_DAYS
+    else:
+        interval_days = interval_days * ease_factor
+
+    return ReviewSchedule(
+        ease_factor, interval_days, repetitions + 1, lapses,
+        reviewed_at + timedelta(days=interval_days)
+    )
+
+
+def review_outcome(outcomes: Sequence[bool]) -> bool:
+    """
+    Collapse several answers to one question in one submission into one review.
+
+    Repeating a question seconds later tests short-term memory, not recall
+    after an interval, so the review passes only if every answer was correct.
+    """
+    return all(outcomes)
+
+
+def apply_review(
+    state: Optional[ReviewSchedule],
+    is_correct: bool,
+    reviewed_at: datetime
+) -> ReviewSchedule:
+    """
+    Apply one review to a question's state, starting from a fresh one if it has none.
+
+    A correct answer before the question is due (reviewing ahead, or a retry
+    within the relearn delay) leaves the schedule as it is: SM-2 only grows
+    the interval for recall after the full interval. A wrong answer lapses
+    the question whenever it comes.
+    """
+    if state is None:
+        state = ReviewSchedule(INITIAL_EASE, 0.0, 0, 0, reviewed_at)
+    if is_correct and reviewed_at < state.due_at:
+        return state
+    return sm2_step(
+        state.ease_factor, state.interval_days, state.repetitions, state.lapses,
+        QUALITY_CORRECT if is_correct else QUALITY_WRONG, reviewed_at
+    )
+
+
+def _state_row(question_id: int, state: ReviewSchedule, reviewed_at: datetime) -> dict:
+    return {
+        "question_id": question_id,
+        "due_at": state.due_at,
+        "ease_factor": state.ease_factor,
+        "interval_days": state.interval_days,
+        "repetitions": state.repetitions,
+        "lapses": state.lapses,
+        "last_reviewed_at": reviewed_at,
+    }
+
+
+async def schedule_reviews(
+    db: AsyncSession,
+    attempts: Sequence[Tuple[int, bool]],
+    reviewed_at: Optional[datetime] = None
+):
+    """
+    Advance the review schedule of every attempted question in the caller's transaction.
+
+    Repeats of a question within `attempts` count as a single review (see
+    review_outcome). Costs one primary-key read (locked) and one upsert
+    however long the attempt history is: only the current state of each
+    question is needed.
+    """
+    if not attempts:
+        return
+
+    reviewed_at = reviewed_at or datetime.utcnow()
+
+    outcomes_by_question: Dict[int, List[bool]] = OrderedDict()
+    for question_id, is_correct in attempts:
+        outcomes_by_question.setdefault(question_id, []).append(bool(is_correct))
+
+    result = await db.execute(
+        select(ReviewState)
+        .where(ReviewState.question_id == any_(
+            bindparam("question_ids", list(outcomes_by_question), type_=ARRAY(Integer))
+        ))
+        .order_by(ReviewState.question_id)
+        .with_for_update()
+    )
+    current = {
+        state.question_id: ReviewSchedule(
+            state.ease_factor, state.interval_days, state.repetitions, state.lapses, state.due_at
+        )
+        for state in result.scalars().all()
+    }
+
+    rows = [
+        _state_row(
+            question_id,
+            apply_review(current.get(question_id), review_outcome(outcomes), reviewed_at),
+            reviewed_at
+        )
+        for question_id, outcomes in outcomes_by_question.items()
+    ]
+
+    statement = pg_insert(ReviewState).values(rows)
+    await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[ReviewState.question_id],
+            set_={
+                column: statement.excluded[column]
+                for column in ("due_at", "ease_factor", "interval_days", "repetitions", "lapses", "last_reviewed_at")
+            },
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def backfill_review_states(db: AsyncSession, batch_size: int = 1000) -> int:
+    """
+    Rebuild review_states by replaying attempt_history.
+
+    Attempts are applied at their own timestamps, so due dates come out as if
+    the scheduler had always been running. Attempts of a question sharing a
+    timestamp came from one batch submission and count as one review, as
+    they did live. Returns the number of questions written.
+    """
+    await db.execute(delete(ReviewState))
+
+    stream = await db.stream(
+        select(AttemptHistory.question_id, AttemptHistory.is_correct, AttemptHistory.attempted_at)
+        .order_by(AttemptHistory.question_id, AttemptHistory.attempted_at, AttemptHistory.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+    pending = []
+    written = 0
+    current_id = None
+    state: Optional[ReviewSchedule] = None
+    outcomes: List[bool] = []
+    last_reviewed_at = None
+
+    async for question_id, is_correct, attempted_at in stream:
+        if outcomes and (question_id, attempted_at) != (current_id, last_reviewed_at):
+            state = apply_review(state, review_outcome(outcomes), last_reviewed_at)
+            outcomes = []
+        if question_id != current_id:
+            if current_id is not None:
+                pending.append(_state_row(current_id, state, last_reviewed_at))
+            current_id = question_id
+            state = None
+
+        outcomes.append(is_correct)
+        last_reviewed_at = attempted_at
+
+        if len(pending) >= batch_size:
+            await db.execute(insert(ReviewState), pending)
+            written += len(pending)
+            pending = []
+
+    if current_id is not None:
+        state = apply_review(state, review_outcome(outcomes), last_reviewed_at)
+        pending.append(_state_row(current_id, state, last_reviewed_at))
+    if pending:
+        await db.execute(insert(ReviewState), pending)
+        written += len(pending)
+
+    return written
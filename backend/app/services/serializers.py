@@ -0,0 +1,85 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, TypedDict
+
+from sqlalchemy import select, any_, bindparam, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Question, Choice
+
+
+class ChoicePayload(TypedDict):
+    label: str
+    text: str
+
+
+class _QuestionPayloadBase(TypedDict):
+    id: int
+    type: str
+    stem: str
+    choices: List[ChoicePayload]
+
+
+class QuestionPayload(_QuestionPayloadBase, total=False):
+    """A question as the API returns it; quiz views leave out answer and explanation."""
+    answer: str
+    explanation: Optional[str]
+
+
+async def load_choices(db: AsyncSession, question_ids: Sequence[int]) -> Dict[int, List[Choice]]:
+    """
+    Load the choices of many questions with one query, grouped by question id.
+    
+    The ids are sent as a single array parameter (`= ANY(:ids)`), so the
+    statement count stays constant however many questions are requested.
+    """
+    if not question_ids:
+        return {}
+    
+    result = await db.execute(
+        select(Choice)
+        .where(Choice.question_id == any_(bindparam("question_ids", list(question_ids), type_=ARRAY(Integer))))
+        .order_by(Choice.question_id, Choice.order_index)
+    )
+    
+    choices_by_question: Dict[int, List[Choice]] = defaultdict(list)
+    for choice in result.scalars().all():
+        choices_by_question[choice.question_id].append(choice)
+    return choices_by_question
+
+
+def serialize_choices(choices: Iterable[Choice]) -> List[ChoicePayload]:
+    return [{"label": c.label, "text": c.text} for c in choices]
+
+
+def serialize_question(
+    question: Question,
+    choices: Iterable[Choice],
+    include_answer: bool = True
+) -> QuestionPayload:
+    """Build the API payload for a question; quiz views omit answer and explanation."""
+    payload = {
+        "id": question.id,
+        "type": question.type.value,
+        "stem": question.stem,
+    }
+    if include_answer:
+        payload["answer"] = question.answer
+        payload["explanation"] = question.explanation
+    payload["choices"] = serialize_choices(choices)
+    return payload
+
+
+async def serialize_questions(
+    db: AsyncSession,
+    questions: Sequence[Question],
+    include_answer: bool = True,
+    choices_by_question: Optional[Dict[int, List[Choice]]] = None
+) -> List[QuestionPayload]:
+    """Serialize questions, loading all of their choices in one batched query."""
+    if choices_by_question is None:
+        choices_by_question = await load_choices(db, [q.id for q in questions])
+    return [
+        serialize_question(q, choices_by_question.get(q.id, ()), include_answer)
+        for q in questions
+    ]
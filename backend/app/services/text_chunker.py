@@ -0,0 +1,91 @@
+import math
+import re
+from typing import List
+
+
+# Blank lines, or a line that starts a new heading / numbered section
+SECTION_BREAK_PATTERN = re.compile(
+    r'\n\s*\n|\n(?=\s*(?:제\s*\d+\s*[장절편]|#{1,6}\s|\d+(?:\.\d+)*\.?\s+\S|[IVX]+\.\s))'
+)
+SENTENCE_BREAK_PATTERN = re.compile(r'(?<=[\.\?!。？！])\s+|\n')
+
+
+def estimate_tokens(text: str, chars_per_token: float) -> int:
+    """Cheap token estimate based on character count."""
+    return math.ceil(len(text) / chars_per_token)
+
+
+def _split_oversized(block: str, max_chars: int) -> List[str]:
+    """Split a block larger than the budget on sentence boundaries, then hard-wrap."""
+    pieces = []
+    current = ""
+    for sentence in SENTENCE_BREAK_PATTERN.split(block):
+        if not sentence:
+            continue
+        while len(sentence) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_into_chunks(text: str, max_tokens: int, chars_per_token: float) -> List[str]:
+    """
+    Split text on section/paragraph boundaries into chunks within a token budget.
+    
+    Adjacent paragraphs are packed together greedily; only paragraphs that are
+    larger than the budget on their own are split further.
+    """
+    max_chars = max(1, int(max_tokens * chars_per_token))
+    chunks = []
+    current = []
+    current_len = 0
+    
+    for block in SECTION_BREAK_PATTERN.split(text):
+        block = block.strip()
+        if not block:
+            continue
+        
+        pieces = [block] if len(block) <= max_chars else _split_oversized(block, max_chars)
+        for piece in pieces:
+            if current and current_len + 2 + len(piece) > max_chars:
+                chunks.append("\n\n".join(current))
+                current = []
+                current_len = 0
+            current.append(piece)
+            current_len += len(piece) + (2 if current_len else 0)
+    
+    if current:
+        chunks.append("\n\n".join(current))
+    
+    return chunks
+
+
+def distribute_questions(num_questions: int, chunks: List[str]) -> List[int]:
+    """
+    Spread num_questions across chunks in proportion to their length.
+    
+    Uses largest-remainder rounding so the counts always sum to num_questions.
+    """
+    if not chunks or num_questions <= 0:
+        return [0] * len(chunks)
+    
+    total = sum(len(chunk) for chunk in chunks) or 1
+    shares = [num_questions * len(chunk) / total for chunk in chunks]
+    counts = [int(share) for share in shares]
+    
+    remaining = num_questions - sum(counts)
+    by_remainder = sorted(range(len(chunks)), key=lambda i: shares[i] - counts[i], reverse=True)
+    for i in by_remainder[:remaining]:
+        counts[i] += 1
+    
+    return counts
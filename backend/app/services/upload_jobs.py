@@ -0,0 +1,294 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select, update, or_
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import QuestionSet, UploadJob, JobStatus
+from app.services.parsing_service import parse_pdf, parse_docx
+from app.services.llm_service import generate_questions_from_document
+from app.services.question_store import save_questions_to_db
+from app.services.document_cache import store_parsed_document
+
+
+logger = logging.getLogger(__name__)
+
+
+class UploadJobError(Exception):
+    """A job failure whose message is safe to show to the user."""
+    pass
+
+
+class QueueFullError(Exception):
+    """Raised when the upload queue has no room for another job."""
+    pass
+
+
+def serialize_job(job: UploadJob) -> Dict[str, Any]:
+    """Convert a job row to its API representation."""
+    return {
+        "job_id": job.id,
+        "status": job.status.value,
+        "stage": job.stage,
+        "file_name": job.file_name,
+        "file_size": job.file_size,
+        "content_hash": job.content_hash,
+        "pages_total": job.pages_total,
+        "pages_done": job.pages_done,
+        "processing_mode": job.processing_mode,
+        "question_set_id": job.question_set_id,
+        "questions_count": job.questions_count,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "updated_at": job.updated_at.isoformat() if job.updated_at else None,
+    }
+
+
+async def update_job(job_id: int, **values):
+    """Persist job progress in its own short transaction."""
+    async with AsyncSessionLocal() as session:
+        await session.execute(update(UploadJob).where(UploadJob.id == job_id).values(**values))
+        await session.commit()
+
+
+async def claim_job(job_id: int) -> Optional[UploadJob]:
+    """
+    Atomically move a QUEUED job to RUNNING and return it.
+    
+    Returns None when the job is not queued, e.g. because a worker in
+    another process claimed it first.
+    """
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            update(UploadJob)
+            .where(UploadJob.id == job_id, UploadJob.status == JobStatus.QUEUED)
+            .values(status=JobStatus.RUNNING, stage="parsing", heartbeat_at=datetime.utcnow())
+            .returning(UploadJob)
+        )
+        job = result.scalar_one_or_none()
+        await session.commit()
+        return job
+
+
+async def requeue_expired_jobs(lease: timedelta) -> List[int]:
+    """Put RUNNING jobs whose worker stopped heartbeating back in QUEUED; returns their ids."""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            update(UploadJob)
+            .where(
+                UploadJob.status == JobStatus.RUNNING,
+                or_(UploadJob.heartbeat_at.is_(None), UploadJob.heartbeat_at < datetime.utcnow() - lease)
+            )
+            .values(status=JobStatus.QUEUED, stage="queued")
+            .returning(UploadJob.id)
+        )
+        job_ids = sorted(result.scalars().all())
+        await session.commit()
+        return job_ids
+
+
+class UploadJobQueue:
+    """
+    In-process worker pool for upload jobs, backed by the upload_jobs table.
+    
+    The queue is bounded: when it is full, submit() raises QueueFullError so
+    the API can push back instead of buffering unbounded work. Parsing and
+    LLM generation each have their own concurrency limit, independent of the
+    number of workers.
+    
+    Several API processes may share the table: a job only runs after it has
+    been claimed with a conditional UPDATE, and a running job keeps a
+    heartbeat. Jobs whose heartbeat is older than the lease (their process
+    died or was restarted) are taken over by whichever process notices first.
+    """
+    
+    def __init__(self, workers: int, max_pending: int, parse_slots: int, llm_slots: int, lease_seconds: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.parse_slots = parse_slots
+        self.llm_slots = llm_slots
+        self.lease = timedelta(seconds=lease_seconds)
+        self._queue: Optional[asyncio.Queue] = None
+        self._parse_semaphore: Optional[asyncio.Semaphore] = None
+        self._llm_semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: List[asyncio.Task] = []
+    
+    async def start(self):
+        """Start workers and pick up queued jobs and jobs whose lease has expired."""
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._parse_semaphore = asyncio.Semaphore(self.parse_slots)
+        self._llm_semaphore = asyncio.Semaphore(self.llm_slots)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        
+        await requeue_expired_jobs(self.lease)
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(UploadJob.id)
+                .where(UploadJob.status == JobStatus.QUEUED)
+                .order_by(UploadJob.id)
+            )
+            pending_ids = list(result.scalars().all())
+        
+        # Jobs still queued in another live process are enqueued here too;
+        # the claim in _run lets only one of them run it.
+        if pending_ids:
+            # Recovered jobs may exceed max_pending; wait for room instead of failing them
+            self._tasks.append(asyncio.create_task(self._requeue(pending_ids)))
+        self._tasks.append(asyncio.create_task(self._reclaim_expired()))
+    
+    async def stop(self):
+        """Cancel workers; interrupted jobs stay RUNNING and are taken over once their lease expires."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+    
+    def has_capacity(self) -> bool:
+        return self._queue is not None and not self._queue.full()
+    
+    def submit(self, job_id: int):
+        """Enqueue a job without waiting; raises QueueFullError on back-pressure."""
+        if self._queue is None:
+            raise QueueFullError("Upload queue is not running")
+        try:
+            self._queue.put_nowait(job_id)
+        except asyncio.QueueFull:
+            raise QueueFullError("Upload queue is full")
+    
+    async def _requeue(self, job_ids: List[int]):
+        for job_id in job_ids:
+            await self._queue.put(job_id)
+    
+    async def _reclaim_expired(self):
+        """Periodically take over jobs abandoned by a process that died while running them."""
+        while True:
+            await asyncio.sleep(self.lease.total_seconds())
+            try:
+                await self._requeue(await requeue_expired_jobs(self.lease))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Could not reclaim expired upload jobs")
+    
+    async def _heartbeat(self, job_id: int):
+        while True:
+            await asyncio.sleep(self.lease.total_seconds() / 3)
+            try:
+                await update_job(job_id, heartbeat_at=datetime.utcnow())
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Heartbeat of upload job %s failed", job_id)
+    
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Usually the database itself failing; keep the worker alive for the next job
+                logger.exception("Upload job %s could not be processed", job_id)
+            finally:
+                self._queue.task_done()
+    
+    async def _run(self, job_id: int):
+        file_path = None
+        try:
+            job = await claim_job(job_id)
+            if job is None:
+                return
+            
+            file_path = job.file_path
+            heartbeat = asyncio.create_task(self._heartbeat(job_id))
+            try:
+                await self._process(job)
+            finally:
+                heartbeat.cancel()
+        except asyncio.CancelledError:
+            raise
+        except UploadJobError as e:
+            await self._fail(job_id, file_path, str(e))
+        except Exception as e:
+            logger.exception("Upload job %s failed", job_id)
+            await self._fail(job_id, file_path, f"파일 처리 중 오류 발생: {str(e)}")
+    
+    async def _fail(self, job_id: int, file_path: Optional[str], message: str):
+        if file_path and os.path.exists(file_path):
+            os.remove(file_path)
+        await update_job(job_id, status=JobStatus.FAILED, stage="failed", error=message)
+    
+    async def _process(self, job: UploadJob):
+        """Run parse -> generate -> persist for one job, reporting progress by stage."""
+        
+        async def report_pages(pages_done: int, pages_total: int):
+            await update_job(job.id, pages_done=pages_done, pages_total=pages_total)
+        
+        # Step 1: Try to extract questions from the file
+        async with self._parse_semaphore:
+            if job.file_type == "pdf":
+                questions_data, text_content = await parse_pdf(job.file_path, report_pages)
+            else:
+                questions_data, text_content = await parse_docx(job.file_path)
+        
+        processing_mode = "extracted"  # 문제 추출 모드
+        
+        # Step 2: If no questions found, generate using AI
+        if not questions_data:
+            processing_mode = "generated"  # AI 생성 모드
+            
+            if not text_content or len(text_content.strip()) < 100:
+                raise UploadJobError("파일에서 충분한 텍스트를 추출할 수 없습니다.")
+            
+            await update_job(job.id, stage="generating", processing_mode=processing_mode)
+            async with self._llm_semaphore:
+                questions_data = await generate_questions_from_document(
+                    content=text_content,
+                    num_questions=10,
+                    question_type="multiple_choice"
+                )
+        
+        # Step 3: Persist the question set
+        await update_job(job.id, stage="saving", processing_mode=processing_mode)
+        async with AsyncSessionLocal() as session:
+            question_set = QuestionSet(
+                name=job.file_name,
+                description=f"{'문제 추출' if processing_mode == 'extracted' else 'AI 생성'}: {job.file_name}",
+                file_name=job.file_name,
+                file_path=job.file_path,
+                content_hash=job.content_hash
+            )
+            session.add(question_set)
+            await session.flush()
+            
+            questions_count = await save_questions_to_db(questions_data, question_set, session)
+            
+            await session.execute(
+                update(UploadJob).where(UploadJob.id == job.id).values(
+                    status=JobStatus.COMPLETED,
+                    stage="done",
+                    question_set_id=question_set.id,
+                    questions_count=questions_count,
+                )
+            )
+            await session.commit()
+        
+        # Only now is the result known to be real: a failed parse or generation
+        # raised above, and a cached failure would be replayed on every re-upload
+        if job.content_hash and questions_data:
+            # Re-uploads of the same bytes skip straight to saving next time
+            await store_parsed_document(job.content_hash, job.file_type, processing_mode, questions_data)
+
+
+upload_queue = UploadJobQueue(
+    workers=settings.upload_job_workers,
+    max_pending=settings.upload_job_queue_size,
+    parse_slots=settings.upload_job_parse_slots,
+    llm_slots=settings.upload_job_llm_slots,
+    lease_seconds=settings.upload_job_lease_seconds,
+)
@@ -0,0 +1,32 @@
+import time
+
+import pytest
+
+from app.config import settings
+from app.models import QuestionSet
+from app.services.question_store import bulk_insert_questions
+
+from tests.factories import multiple_choice_data
+
+
+pytestmark = [pytest.mark.anyio, pytest.mark.db, pytest.mark.benchmark]
+
+
+@pytest.mark.parametrize("near_duplicate_action", ["off", "flag"])
+async def test_bulk_insert_throughput(db, monkeypatch, near_duplicate_action):
+    monkeypatch.setattr(settings, "near_duplicate_action", near_duplicate_action)
+    
+    print(f"\nnear_duplicate_action={near_duplicate_action}, copy threshold {settings.bulk_copy_threshold}")
+    for count in (100, 1000, 10000):
+        data = multiple_choice_data(count, start=count)
+        question_set = QuestionSet(name=f"{count}")
+        db.add(question_set)
+        await db.commit()
+        
+        started = time.perf_counter()
+        question_ids = await bulk_insert_questions(db, question_set.id, data)
+        await db.commit()
+        elapsed = time.perf_counter() - started
+        
+        assert len(question_ids) == count
+        print(f"  {count:>6} questions: {elapsed:7.3f} s, {count / elapsed:9.0f} questions/s")
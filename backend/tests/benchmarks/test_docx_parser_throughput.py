@@ -0,0 +1,37 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from app.services.docx_parser import parse_docx_text
+
+
+pytestmark = pytest.mark.benchmark
+
+FIXTURES = Path(__file__).parent.parent / "fixtures" / "docx"
+
+
+def renumbered_corpus(copies: int) -> str:
+    """Concatenate the fixture texts, renumbering questions so the boundaries stay distinct."""
+    lines = []
+    number = 0
+    for _ in range(copies):
+        for path in sorted(FIXTURES.glob("*.txt")):
+            for line in path.read_text(encoding="utf-8").strip().split("\n"):
+                head, dot, rest = line.partition(". ")
+                if dot and head.isdigit():
+                    number += 1
+                    line = f"{number}. {rest}"
+                lines.append(line)
+    return "\n".join(lines)
+
+
+def test_docx_parser_throughput():
+    text = renumbered_corpus(copies=200)
+    
+    started = time.perf_counter()
+    questions = parse_docx_text(text)
+    elapsed = time.perf_counter() - started
+    
+    assert len(questions) == 200 * 9
+    print(f"\n{len(questions)} questions in {elapsed:.3f}s ({len(questions) / elapsed:,.0f} questions/s)")
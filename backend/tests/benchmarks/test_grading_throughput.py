@@ -0,0 +1,35 @@
+import time
+
+import pytest
+
+from app.models import QuestionType
+from app.services.grading import GradingEngine
+
+
+pytestmark = pytest.mark.benchmark
+
+CASES = [
+    (QuestionType.MULTIPLE_CHOICE, "B", "B"),
+    (QuestionType.SHORT_ANSWER, "광합성", "광합성"),
+    (QuestionType.SHORT_ANSWER, "미토콘드리아", "미토콘드리야"),
+    (QuestionType.SHORT_ANSWER, "엽록체에서 일어난다", "엽록체 에서 일어남"),
+    (QuestionType.ESSAY, "세포 호흡은 포도당을 분해하여 에너지를 얻는 과정이다", "세포호흡은 포도당을 분해해서 에너지를 얻는 과정"),
+]
+
+
+@pytest.mark.parametrize("threshold", [1.0, 0.85], ids=["exact", "fuzzy"])
+def test_grading_throughput(threshold):
+    engine = GradingEngine(fuzzy_threshold=threshold)
+    keyed = [
+        (question_type, *engine.build_answer_key(answer), user_answer)
+        for question_type, answer, user_answer in CASES
+    ]
+    rounds = 20000
+    
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for question_type, answer_key, accepted, user_answer in keyed:
+            engine.grade(question_type, answer_key, accepted, user_answer)
+    elapsed = time.perf_counter() - started
+    
+    print(f"\n{threshold=}: {rounds * len(keyed) / elapsed:,.0f} grades/s")
@@ -0,0 +1,48 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from app.config import settings
+from app.services.parsing_service import count_pdf_pages, parse_pdf, run_in_parser_pool, shutdown_parser_pool
+
+from tests.pdf_fixtures import question_pdf_pages, write_text_pdf
+
+
+pytestmark = [pytest.mark.anyio, pytest.mark.benchmark]
+
+PAGES = 80
+WORKER_COUNTS = (1, 2, 4, 8)
+
+
+async def time_parse(file_path: str, workers: int, monkeypatch) -> tuple:
+    monkeypatch.setattr(settings, "parse_workers", workers)
+    shutdown_parser_pool()
+    # Start every worker before timing; the first task only spawns one
+    await asyncio.gather(*(run_in_parser_pool(count_pdf_pages, file_path) for _ in range(workers)))
+    
+    started = time.perf_counter()
+    result = await parse_pdf(file_path)
+    return time.perf_counter() - started, result
+
+
+async def test_pdf_parse_throughput_by_worker_count(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "pdf_min_pages_per_shard", 1)
+    file_path = write_text_pdf(tmp_path / "bank.pdf", question_pdf_pages(PAGES))
+    
+    print(f"\n{PAGES} pages, {os.cpu_count()} CPUs")
+    timings = {}
+    results = []
+    try:
+        for workers in WORKER_COUNTS:
+            elapsed, result = await time_parse(file_path, workers, monkeypatch)
+            timings[workers] = elapsed
+            results.append(result)
+            print(f"{workers} workers: {elapsed:6.2f}s, {PAGES / elapsed:6.1f} pages/s, "
+                  f"{timings[1] / elapsed:.2f}x")
+    finally:
+        shutdown_parser_pool()
+    
+    assert all(result == results[0] for result in results)
+    assert len(results[0][0]) == PAGES * 10
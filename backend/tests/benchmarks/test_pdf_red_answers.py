@@ -0,0 +1,28 @@
+import time
+
+import pytest
+
+from tests.pdf_fixtures import synthetic_analysis
+
+
+pytestmark = pytest.mark.benchmark
+
+
+def time_red_answers(questions: int) -> float:
+    analysis, expected = synthetic_analysis(questions)
+    started = time.perf_counter()
+    answers = analysis.red_answers
+    elapsed = time.perf_counter() - started
+    assert answers == expected
+    return elapsed
+
+
+def test_red_answer_detection_scales_linearly():
+    time_red_answers(1000)  # Warm up
+    small = min(time_red_answers(1000) for _ in range(3))
+    large = min(time_red_answers(10000) for _ in range(3))
+    
+    print(f"\nred answers: 1k questions {small * 1000:.1f} ms, 10k questions {large * 1000:.1f} ms "
+          f"({large / small:.1f}x for 10x the questions)")
+    # Linear is 10x; the old per-question slicing was quadratic (~100x)
+    assert large / small < 20
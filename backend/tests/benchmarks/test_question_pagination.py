@@ -0,0 +1,52 @@
+import time
+
+import pytest
+from sqlalchemy import text
+
+from app.services.pagination import encode_cursor
+
+from tests.factories import seed_question_bank
+
+
+pytestmark = [pytest.mark.anyio, pytest.mark.db, pytest.mark.benchmark]
+
+QUESTIONS = 50_000
+PAGE_SIZE = 50
+DEEP_PAGE = 500
+ROUNDS = 5
+
+
+async def best_time(client, params: dict) -> tuple:
+    """Fastest of ROUNDS requests (the first also warms the payload cache) and the page's ids."""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        response = await client.get("/api/questions/", params={"limit": PAGE_SIZE, **params})
+        best = min(best, time.perf_counter() - started)
+        assert response.status_code == 200
+    body = response.json()
+    items = body["items"] if isinstance(body, dict) else body
+    return best, [item["id"] for item in items]
+
+
+async def test_deep_cursor_page_costs_about_the_same_as_the_first(db, client):
+    await seed_question_bank(db, QUESTIONS, set_count=10)
+    offset = PAGE_SIZE * (DEEP_PAGE - 1)
+    # The cursor a client would hold after walking to the end of page DEEP_PAGE - 1
+    last_row = (await db.execute(
+        text("SELECT question_set_id, order_index, id FROM questions ORDER BY 1, 2, 3 OFFSET :offset LIMIT 1"),
+        {"offset": offset - 1},
+    )).one()
+    
+    offset_first, _ = await best_time(client, {})
+    offset_deep, offset_ids = await best_time(client, {"offset": offset})
+    cursor_first, _ = await best_time(client, {"pagination": "cursor"})
+    cursor_deep, cursor_ids = await best_time(client, {"cursor": encode_cursor(tuple(last_row))})
+    
+    print(f"\n{QUESTIONS} questions, {PAGE_SIZE} per page, best of {ROUNDS}")
+    print(f"  offset: page 1 {offset_first * 1000:7.2f} ms, page {DEEP_PAGE} {offset_deep * 1000:7.2f} ms")
+    print(f"  cursor: page 1 {cursor_first * 1000:7.2f} ms, page {DEEP_PAGE} {cursor_deep * 1000:7.2f} ms")
+    
+    assert cursor_ids == offset_ids
+    # Seeking is an index lookup either way; allow for timer noise on fast requests
+    assert cursor_deep < cursor_first * 2 + 0.005
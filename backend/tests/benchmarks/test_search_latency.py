@@ -0,0 +1,37 @@
+import time
+
+import pytest
+
+from tests.factories import seed_question_bank
+
+
+pytestmark = [pytest.mark.anyio, pytest.mark.db, pytest.mark.benchmark]
+
+QUESTIONS = 50_000
+PAGE_SIZE = 20
+ROUNDS = 5
+# Whole words hit the full-text index, a fragment from inside a word only the trigram one
+QUERIES = ["광합성", "광합성 엽록체", "합성"]
+
+
+async def best_time(client, query: str) -> tuple:
+    """Fastest of ROUNDS searches and the number of hits on the first page."""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        response = await client.get("/api/questions/search", params={"q": query, "limit": PAGE_SIZE})
+        best = min(best, time.perf_counter() - started)
+        assert response.status_code == 200
+    return best, len(response.json()["items"])
+
+
+async def test_search_over_a_large_corpus(db, client):
+    await seed_question_bank(db, QUESTIONS, set_count=10)
+    
+    print(f"\n{QUESTIONS} questions, {PAGE_SIZE} per page, best of {ROUNDS}")
+    for query in QUERIES:
+        elapsed, hits = await best_time(client, query)
+        print(f"  {query!r:16} {elapsed * 1000:7.2f} ms, {hits} hits")
+        assert hits == PAGE_SIZE
+        # A sequential scan ranking every row takes seconds at this size
+        assert elapsed < 0.5
@@ -0,0 +1,71 @@
+import json
+import time
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.models import Choice, Question, QuestionType
+from app.responses import json_dumps
+from app.services.payload_cache import CachedQuestion, render_questions
+from app.services.serializers import serialize_question
+
+from tests.factories import multiple_choice_data
+
+
+pytestmark = pytest.mark.benchmark
+
+QUESTION_COUNT = 3000
+ROUNDS = 20
+
+
+def transient_questions(count: int):
+    """Unsaved ORM rows shaped like a stored question bank."""
+    questions = []
+    for index, data in enumerate(multiple_choice_data(count), start=1):
+        question = Question(
+            id=index, type=QuestionType.MULTIPLE_CHOICE,
+            stem=data["stem"], answer=data["answer"], explanation=data["explanation"],
+        )
+        choices = [Choice(label=c["label"], text=c["text"]) for c in data["choices"]]
+        questions.append((question, choices))
+    return questions
+
+
+def best_of(rounds: int, encode) -> tuple:
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        body = encode()
+        best = min(best, time.perf_counter() - started)
+    return best, body
+
+
+def test_question_list_serialization():
+    questions = transient_questions(QUESTION_COUNT)
+    cached = [CachedQuestion.encode(question, choices) for question, choices in questions]
+    
+    def default_response():
+        # What FastAPI does for a returned list of dicts
+        payloads = [serialize_question(question, choices) for question, choices in questions]
+        return JSONResponse(jsonable_encoder(payloads)).body
+    
+    def fast():
+        return json_dumps([serialize_question(question, choices) for question, choices in questions])
+    
+    def fragments():
+        return render_questions(cached)
+    
+    results = {name: best_of(ROUNDS, encode) for name, encode in (
+        ("jsonable_encoder + json", default_response),
+        ("json_dumps", fast),
+        ("cached fragments", fragments),
+    )}
+    
+    expected = json.loads(results["jsonable_encoder + json"][1])
+    print(f"\n{QUESTION_COUNT} questions, best of {ROUNDS}")
+    for name, (elapsed, body) in results.items():
+        assert json.loads(body) == expected
+        print(f"{name:>24}: {elapsed * 1000:7.2f} ms, {len(body):,} bytes")
+    
+    assert results["cached fragments"][0] < results["jsonable_encoder + json"][0]
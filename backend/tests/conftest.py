@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    # app.database builds its engine from settings at import time
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+
+
+def pytest_collection_modifyitems(config, items):
+    if TEST_DATABASE_URL:
+        return
+    skip_db = pytest.mark.skip(reason="set TEST_DATABASE_URL to a disposable PostgreSQL database")
+    for item in items:
+        if "db" in item.keywords:
+            item.add_marker(skip_db)
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def migrated_engine(anyio_backend):
+    """The app's engine on a freshly migrated schema (everything in it is dropped first)."""
+    from sqlalchemy import text
+    from app.database import engine, init_db
+    
+    # Statement logging costs real time per query and skews the latency tests
+    engine.echo = False
+    
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP SCHEMA public CASCADE"))
+        await conn.execute(text("CREATE SCHEMA public"))
+    await init_db()
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db(migrated_engine):
+    """A session on empty tables; everything written is truncated afterwards."""
+    from sqlalchemy import text
+    from app.database import AsyncSessionLocal, Base
+    from app.services.payload_cache import question_payloads
+    
+    question_payloads.clear()
+    async with AsyncSessionLocal() as session:
+        yield session
+    
+    tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+    async with migrated_engine.begin() as conn:
+        await conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+    question_payloads.clear()
+
+
+@pytest.fixture
+async def client():
+    """
+    HTTP client for the API; the lifespan (upload workers) is not started.
+    
+    Requests rejected before any query run without a database; tests that
+    reach one also request `db`.
+    """
+    import httpx
+    from app.main import app
+    
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http_client:
+        yield http_client
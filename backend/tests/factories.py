@@ -0,0 +1,89 @@
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import QuestionSet
+from app.services.question_store import bulk_insert_questions
+
+
+def multiple_choice_data(count: int, start: int = 0) -> List[Dict[str, Any]]:
+    """Distinct four-choice questions (distinct enough not to be near-duplicates)."""
+    return [
+        {
+            "type": "multiple_choice",
+            "stem": f"{index}번 문제: {index * 7919 % 100003}의 약수가 아닌 것은 무엇인가? ({index:x})",
+            "choices": [
+                {"label": label, "text": f"{label}-{index}-{index * offset % 9973}"}
+                for offset, label in enumerate("ABCD", start=1)
+            ],
+            "answer": "B",
+            "explanation": f"{index} 해설",
+        }
+        for index in range(start, start + count)
+    ]
+
+
+async def create_question_set(
+    db: AsyncSession,
+    count: int,
+    name: str = "테스트 세트",
+    start: int = 0
+) -> Tuple[int, List[int]]:
+    """Store a question set with `count` multiple-choice questions; returns (set id, question ids)."""
+    question_set = QuestionSet(name=name)
+    db.add(question_set)
+    await db.flush()
+    question_ids = await bulk_insert_questions(db, question_set.id, multiple_choice_data(count, start))
+    await db.commit()
+    return question_set.id, [question_id for question_id in question_ids if question_id is not None]
+
+
+# Vocabulary of the generated bank; stems pair two of these words
+SEED_WORDS = (
+    "광합성", "세포", "호흡", "엽록체", "미토콘드리아", "유전자", "단백질", "효소", "삼투", "확산",
+    "생태계", "먹이사슬", "광물", "지층", "화산", "지진", "전류", "저항", "자기장", "속력",
+    "가속도", "관성", "원소", "분자", "산화", "환원", "중화", "용해도", "기압", "전선",
+)
+
+
+async def seed_question_bank(db: AsyncSession, count: int, set_count: int = 1) -> List[int]:
+    """
+    Insert `count` four-choice questions spread over `set_count` sets, in SQL.
+    
+    For large-table benchmarks: generated server-side in three statements,
+    without near-duplicate signatures. Returns the set ids.
+    """
+    result = await db.execute(
+        text(
+            "INSERT INTO question_sets (name, created_at) "
+            "SELECT '벤치마크 ' || s, now() FROM generate_series(1, :set_count) AS s RETURNING id"
+        ),
+        {"set_count": set_count},
+    )
+    set_ids = sorted(result.scalars().all())
+    await db.execute(
+        text(
+            "INSERT INTO questions (question_set_id, type, stem, answer, explanation, order_index, created_at) "
+            "SELECT sets[1 + i % cardinality(sets)], 'MULTIPLE_CHOICE', "
+            "i || '번: ' || words[1 + i % cardinality(words)] || '와 ' "
+            "|| words[1 + (i / cardinality(words)) % cardinality(words)] || '의 관계로 옳은 것은?', "
+            "'B', words[1 + (i * 7) % cardinality(words)] || '에 대한 해설 ' || i, i, now() "
+            "FROM generate_series(0, :count - 1) AS i, "
+            "(SELECT CAST(:set_ids AS integer[]) AS sets, CAST(:words AS text[]) AS words) AS params"
+        ),
+        {"count": count, "set_ids": set_ids, "words": list(SEED_WORDS)},
+    )
+    await db.execute(
+        text(
+            "INSERT INTO choices (question_id, label, text, order_index) "
+            "SELECT q.id, l.label, l.label || '-' || q.id, l.position FROM questions AS q "
+            "CROSS JOIN (VALUES ('A', 0), ('B', 1), ('C', 2), ('D', 3)) AS l(label, position) "
+            "WHERE q.question_set_id = ANY(CAST(:set_ids AS integer[]))"
+        ),
+        {"set_ids": set_ids},
+    )
+    await db.commit()
+    await db.execute(text("ANALYZE questions"))
+    await db.execute(text("ANALYZE choices"))
+    return set_ids
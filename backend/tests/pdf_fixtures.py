@@ -0,0 +1,106 @@
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from app.services.pdf_parser import PdfDocumentAnalysis, PdfPageAnalysis, scan_chars
+
+
+RED = (1, 0, 0)
+BLACK = (0, 0, 0)
+CHOICE_SYMBOLS = "①②③④"
+LINE_HEIGHT = 12.0
+
+
+def question_lines(number: int) -> Tuple[List[Tuple[str, int]], int]:
+    """Lines of one synthetic question as (text, red symbol index or -1); returns the answer index too."""
+    answer = number % 4
+    lines = [(f"{number}. 다음 중 {number}번 보기에 대한 설명으로 옳은 것은?", -1)]
+    for index, symbol in enumerate(CHOICE_SYMBOLS):
+        lines.append((f"{symbol} 보기 {number}-{index + 1}", 0 if index == answer else -1))
+    return lines, answer
+
+
+def page_chars(lines: List[Tuple[str, int]]) -> List[Dict]:
+    """pdfplumber-style char dicts; the glyph at each line's red index is colored red."""
+    chars = []
+    for line_number, (text, red_index) in enumerate(lines):
+        top = line_number * LINE_HEIGHT
+        for position, glyph in enumerate(text):
+            chars.append({
+                "text": glyph,
+                "top": top,
+                "non_stroking_color": RED if position == red_index else BLACK,
+            })
+    return chars
+
+
+def synthetic_analysis(questions: int, questions_per_page: int = 40) -> Tuple[PdfDocumentAnalysis, Dict[int, str]]:
+    """A document analysis of `questions` four-choice questions with red answers, and the expected answers."""
+    pages = []
+    expected = {}
+    for first in range(1, questions + 1, questions_per_page):
+        lines = []
+        for number in range(first, min(first + questions_per_page, questions + 1)):
+            question, answer = question_lines(number)
+            lines.extend(question)
+            expected[number] = "ABCD"[answer]
+        glyph_text, red_offsets, red_labels = scan_chars(page_chars(lines))
+        text = "\n".join(line for line, _ in lines)
+        pages.append(PdfPageAnalysis(len(pages) + 1, text, glyph_text, red_offsets, red_labels, 595.0, 842.0))
+    return PdfDocumentAnalysis(pages), expected
+
+
+def _pdf_string(text: str) -> str:
+    return "(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+def write_text_pdf(path: Path, pages: List[List[str]]) -> str:
+    """
+    Write a minimal PDF with one line of ASCII text per entry, in Helvetica.
+    
+    Real page objects and content streams, so pdfplumber does its full
+    per-glyph work on them; the tests have no PDF writer dependency.
+    """
+    font_id = 3
+    page_ids = [4 + 2 * index for index in range(len(pages))]
+    objects = {
+        1: "<< /Type /Catalog /Pages 2 0 R >>",
+        2: f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(pages)} >>",
+        font_id: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for page_id, lines in zip(page_ids, pages):
+        operations = ["BT", "/F1 10 Tf", "12 TL", "40 800 Td"]
+        operations.extend(f"{_pdf_string(line)} Tj T*" for line in lines)
+        operations.append("ET")
+        stream = "\n".join(operations)
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {page_id + 1} 0 R >>"
+        )
+        objects[page_id + 1] = f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream"
+    
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = len(output)
+        output += f"{object_id} 0 obj\n{objects[object_id]}\nendobj\n".encode("latin-1")
+    xref_at = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for object_id in sorted(objects):
+        output += f"{offsets[object_id]:010d} 00000 n \n".encode("latin-1")
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n".encode("latin-1")
+    Path(path).write_bytes(bytes(output))
+    return str(path)
+
+
+def question_pdf_pages(page_count: int, questions_per_page: int = 10) -> List[List[str]]:
+    """Pages of ASCII four-choice questions (A-D markers), numbered across pages."""
+    pages = []
+    number = 0
+    for _ in range(page_count):
+        lines = []
+        for _ in range(questions_per_page):
+            number += 1
+            lines.append(f"{number}. Which statement about item {number} is correct?")
+            lines.extend(f"{label}. Option {label} for item {number}" for label in "ABCD")
+        pages.append(lines)
+    return pages
@@ -0,0 +1,33 @@
+import asyncio
+
+import pytest
+from sqlalchemy import insert
+
+from app.models import Bookmark
+
+from tests.factories import create_question_set
+
+
+pytestmark = [pytest.mark.anyio, pytest.mark.db]
+
+
+async def test_bookmark_created_concurrently_is_already_bookmarked(db, client):
+    _, question_ids = await create_question_set(db, 1)
+    
+    # Another request's insert, not yet committed: the endpoint cannot see it
+    await db.execute(insert(Bookmark).values(question_id=question_ids[0]))
+    create = asyncio.create_task(client.post("/api/bookmarks/", json={"question_id": question_ids[0]}))
+    await asyncio.sleep(0.2)
+    assert not create.done()  # Waiting on the unique constraint
+    await db.commit()
+    response = await create
+    
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Question already bookmarked"
+    assert len((await client.get("/api/bookmarks/")).json()) == 1
+
+
+async def test_bookmark_of_missing_question_is_not_found(db, client):
+    response = await client.post("/api/bookmarks/", json={"question_id": 12345})
+    
+    assert response.status_code == 404
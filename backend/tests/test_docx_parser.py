@@ -0,0 +1,78 @@
+import json
+from pathlib import Path
+
+import pytest
+from docx import Document
+
+from app.services.docx_parser import parse_docx_questions, parse_docx_text
+from app.services.pdf_parser import parse_multiple_choice
+from app.services.question_grammar import find_choices
+
+FIXTURES = Path(__file__).parent / "fixtures" / "docx"
+FIXTURE_NAMES = sorted(path.stem for path in FIXTURES.glob("*.txt"))
+
+
+def load_fixture(name: str):
+    text = (FIXTURES / f"{name}.txt").read_text(encoding="utf-8").strip()
+    expected = json.loads((FIXTURES / f"{name}.json").read_text(encoding="utf-8"))
+    return text, expected
+
+
+@pytest.mark.parametrize("name", FIXTURE_NAMES)
+def test_fixture_parses_to_expected_questions(name):
+    text, expected = load_fixture(name)
+    
+    assert parse_docx_text(text) == expected
+
+
+@pytest.mark.parametrize("name", FIXTURE_NAMES)
+def test_fixture_parses_the_same_from_a_docx_file(name, tmp_path):
+    text, expected = load_fixture(name)
+    document = Document()
+    for line in text.split("\n"):
+        document.add_paragraph(line)
+    path = tmp_path / f"{name}.docx"
+    document.save(str(path))
+    
+    assert parse_docx_questions(str(path)) == expected
+
+
+def test_lone_reference_marker_in_stem_is_not_a_choice_list():
+    questions = parse_docx_text("1. 다음 (1)에 들어갈 알맞은 말을 쓰시오.\n정답: 광합성")
+    
+    assert questions == [{
+        "type": "short_answer",
+        "stem": "다음 (1)에 들어갈 알맞은 말을 쓰시오.",
+        "answer": "광합성",
+        "explanation": "",
+    }]
+
+
+def test_delimiter_after_circled_marker_is_stripped():
+    choices, _ = find_choices("문제\n①. 사과\n②) 배", min_choices=2)
+    
+    assert [choice["text"] for choice in choices] == ["사과", "배"]
+
+
+def test_choice_run_starts_at_first_marker_after_stem_reference():
+    text = "다음 (1)에 들어갈 말은?\n(1) 가 (2) 나 (3) 다"
+    
+    choices, first_choice_pos = find_choices(text, min_choices=2)
+    
+    assert [choice["text"] for choice in choices] == ["가", "나", "다"]
+    assert text[:first_choice_pos].strip() == "다음 (1)에 들어갈 말은?"
+
+
+def test_out_of_order_markers_are_not_a_choice_list():
+    assert find_choices("② 배 ① 사과", min_choices=2) == ([], None)
+
+
+def test_pdf_parser_skips_stem_reference():
+    text = "1. 다음 ①에 해당하는 것은?\n① 사과\n② 배\n③ 감\n2. 빈칸 ①을 채우시오."
+    
+    questions = parse_multiple_choice(text, {1: "B"})
+    
+    assert len(questions) == 1
+    assert questions[0]["stem"] == "다음 ①에 해당하는 것은?"
+    assert [choice["text"] for choice in questions[0]["choices"]] == ["사과", "배", "감"]
+    assert questions[0]["answer"] == "B"
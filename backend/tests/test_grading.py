@@ -0,0 +1,70 @@
+import pytest
+
+from app.models import QuestionType
+from app.services.grading import GradingEngine, edit_distance, grading_engine, normalize_answer
+
+
+exact = GradingEngine(fuzzy_threshold=1.0)
+fuzzy = GradingEngine(fuzzy_threshold=0.85)
+
+
+def grade(engine, answer, user_answer, question_type=QuestionType.SHORT_ANSWER, accepted=()):
+    answer_key, accepted_keys = engine.build_answer_key(answer, accepted)
+    return engine.grade(question_type, answer_key, accepted_keys, user_answer)
+
+
+def test_default_engine_is_exact():
+    assert grading_engine.fuzzy_threshold == 1.0
+    assert not grade(grading_engine, "미토콘드리아", "미토콘드리야")
+
+
+@pytest.mark.parametrize("answer,user_answer", [
+    ("광합성", " 광 합성. "),
+    ("Photosynthesis", "photosynthesis!"),
+    ("2,000,000", "2000000"),
+])
+def test_spacing_punctuation_and_case_are_ignored(answer, user_answer):
+    assert grade(exact, answer, user_answer)
+
+
+def test_accepted_answers_count_as_correct():
+    assert grade(exact, "이산화탄소", "CO2", accepted=["CO2", "탄산가스"])
+
+
+@pytest.mark.parametrize("engine", [exact, fuzzy], ids=["exact", "fuzzy"])
+@pytest.mark.parametrize("answer,user_answer", [
+    ("2,000,000", "3,000,000"),
+    ("1234567", "1234568"),
+    ("hyperthyroidism", "hypothyroidism"),
+    ("제2차 세계대전", "제1차 세계대전"),
+    ("산소", "수소"),
+    ("cat", "car"),
+])
+def test_wrong_answers_are_wrong(engine, answer, user_answer):
+    assert not grade(engine, answer, user_answer)
+
+
+@pytest.mark.parametrize("answer,user_answer", [
+    ("미토콘드리아", "미토콘드리야"),
+    ("엽록체에서 일어난다", "엽록체에서 일어남다"),
+])
+def test_opt_in_fuzzy_accepts_one_jamo_typo(answer, user_answer):
+    assert grade(fuzzy, answer, user_answer)
+    assert not grade(exact, answer, user_answer)
+
+
+def test_fuzzy_never_applies_to_multiple_choice():
+    assert not grade(fuzzy, "B", "C", question_type=QuestionType.MULTIPLE_CHOICE)
+
+
+def test_empty_answer_is_wrong():
+    assert not grade(fuzzy, "미토콘드리아", "   ")
+
+
+def test_edit_distance_stops_at_cutoff():
+    assert edit_distance("kitten", "sitting", 3) == 3
+    assert edit_distance("kitten", "sitting", 1) == 2
+
+
+def test_normalize_answer():
+    assert normalize_answer(" A. b, C? ") == "abc"
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from app.config import settings
+from app.services import llm_service
+from app.services.llm_service import generate_questions_from_document
+
+
+pytestmark = pytest.mark.anyio
+
+VALID_RESPONSE = json.dumps([
+    {
+        "stem": "광합성이 일어나는 세포 소기관은?",
+        "choices": [{"label": "A", "text": "엽록체"}, {"label": "B", "text": "핵"}],
+        "answer": "A",
+        "explanation": "엽록체에서 광합성이 일어난다.",
+    }
+], ensure_ascii=False)
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Stub the model: each call pops the next response from the returned list."""
+    monkeypatch.setattr(settings, "llm_cache_enabled", False)
+    responses = []
+    
+    async def generate(prompt, **kwargs):
+        return responses.pop(0)
+    
+    monkeypatch.setattr(llm_service.ollama_client, "generate", generate)
+    return responses
+
+
+def paragraphs(count: int, length: int) -> str:
+    return "\n\n".join(f"{index}번 단락 " + "가" * length for index in range(count))
+
+
+async def test_single_chunk_parse_failure_raises(llm):
+    llm.append("죄송합니다, JSON을 만들 수 없습니다.")
+    
+    with pytest.raises(Exception, match="Failed to generate questions"):
+        await generate_questions_from_document(paragraphs(1, 200), num_questions=3)
+
+
+async def test_multi_chunk_parse_failure_raises(llm, monkeypatch):
+    monkeypatch.setattr(settings, "llm_chunk_max_tokens", 200)
+    content = paragraphs(3, 250)
+    llm.extend(["not json"] * 3)
+    
+    with pytest.raises(Exception, match="Failed to generate questions"):
+        await generate_questions_from_document(content, num_questions=3)
+
+
+async def test_failed_chunks_are_dropped_when_others_succeed(llm, monkeypatch):
+    monkeypatch.setattr(settings, "llm_chunk_max_tokens", 200)
+    content = paragraphs(2, 250)
+    llm.extend(["not json", VALID_RESPONSE])
+    
+    questions = await generate_questions_from_document(content, num_questions=2)
+    
+    assert [q["stem"] for q in questions] == ["광합성이 일어나는 세포 소기관은?"]
+
+
+async def test_single_chunk_returns_generated_questions(llm):
+    llm.append(VALID_RESPONSE)
+    
+    questions = await generate_questions_from_document(paragraphs(1, 200), num_questions=1)
+    
+    assert questions[0]["type"] == "multiple_choice"
+    assert questions[0]["answer"] == "A"
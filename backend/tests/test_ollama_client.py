@@ -0,0 +1,146 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.services.ollama_client import OllamaClient, OllamaError
+
+
+pytestmark = pytest.mark.anyio
+
+
+class StubOllama:
+    """
+    A stub /api/generate behind httpx.MockTransport.
+    
+    Each response streams `tokens` as NDJSON lines. With `gated`, every line
+    after the first waits for `release` to be set, so a test can hold
+    generations open.
+    """
+    
+    def __init__(self, tokens, gated=False):
+        self.tokens = tokens
+        self.release = asyncio.Event()
+        if not gated:
+            self.release.set()
+        self.prompts = []
+        self.open = 0
+        self.peak = 0
+        self.closed = 0
+    
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/api/generate"
+        self.prompts.append(json.loads(request.content)["prompt"])
+        return httpx.Response(200, stream=StubStream(self))
+    
+    def client(self, **kwargs) -> OllamaClient:
+        return OllamaClient(
+            base_url="http://ollama.test", model="stub",
+            transport=httpx.MockTransport(self.handler), **kwargs
+        )
+
+
+class StubStream(httpx.AsyncByteStream):
+    def __init__(self, stub: StubOllama):
+        self.stub = stub
+        stub.open += 1
+        stub.peak = max(stub.peak, stub.open)
+    
+    async def __aiter__(self):
+        for index, token in enumerate(self.stub.tokens):
+            if index:
+                await self.stub.release.wait()
+            yield (json.dumps({"response": token, "done": False}) + "\n").encode()
+        yield (json.dumps({"response": "", "done": True}) + "\n").encode()
+    
+    async def aclose(self):
+        self.stub.open -= 1
+        self.stub.closed += 1
+
+
+async def test_stream_generate_yields_tokens_in_order():
+    stub = StubOllama(["[", '{"stem": "광합성"}', "]"])
+    client = stub.client()
+    
+    tokens = [token async for token in client.stream_generate("프롬프트")]
+    
+    assert tokens == ["[", '{"stem": "광합성"}', "]"]
+    assert await client.generate("프롬프트") == '[{"stem": "광합성"}]'
+    assert stub.prompts == ["프롬프트", "프롬프트"]
+    await client.aclose()
+
+
+async def test_error_line_raises():
+    async def handler(request):
+        return httpx.Response(200, text=json.dumps({"error": "model not found"}) + "\n")
+    
+    client = OllamaClient(base_url="http://ollama.test", model="stub", transport=httpx.MockTransport(handler))
+    with pytest.raises(OllamaError, match="model not found"):
+        await client.generate("프롬프트")
+    await client.aclose()
+
+
+async def test_timeout_raises_and_frees_the_slot():
+    stub = StubOllama(["다음"])
+    calls = 0
+    
+    async def handler(request):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise httpx.ReadTimeout("timed out", request=request)
+        return await stub.handler(request)
+    
+    client = OllamaClient(
+        base_url="http://ollama.test", model="stub", max_in_flight=1,
+        transport=httpx.MockTransport(handler),
+    )
+    with pytest.raises(OllamaError, match="timed out"):
+        await client.generate("프롬프트")
+    # The failed request gave its only slot back
+    assert await asyncio.wait_for(client.generate("프롬프트"), 1) == "다음"
+    await client.aclose()
+
+
+async def test_in_flight_requests_are_capped():
+    stub = StubOllama(["가", "나"], gated=True)
+    client = stub.client(max_in_flight=2)
+    
+    generations = [asyncio.create_task(client.generate(f"프롬프트 {i}")) for i in range(5)]
+    await asyncio.sleep(0.05)
+    assert stub.open == 2
+    
+    stub.release.set()
+    assert await asyncio.gather(*generations) == ["가나"] * 5
+    assert stub.peak == 2
+    await client.aclose()
+
+
+async def test_slow_consumer_does_not_hold_a_slot():
+    stub = StubOllama(["가", "나", "다"])
+    client = stub.client(max_in_flight=1)
+    
+    slow = client.stream_generate("느린 소비자")
+    assert await slow.__anext__() == "가"
+    # The response is read to the end while the first caller sits on its token
+    assert await asyncio.wait_for(client.generate("다음"), 1) == "가나다"
+    assert [token async for token in slow] == ["나", "다"]
+    await client.aclose()
+
+
+async def test_closing_the_stream_cancels_the_request():
+    stub = StubOllama(["가", "나"], gated=True)
+    client = stub.client(max_in_flight=1)
+    
+    stream = client.stream_generate("끊길 요청")
+    assert await stream.__anext__() == "가"
+    assert stub.open == 1
+    
+    # What a client disconnect does to the SSE endpoint's generators
+    await stream.aclose()
+    assert stub.open == 0 and stub.closed == 1
+    
+    stub.release.set()
+    assert await asyncio.wait_for(client.generate("다음"), 1) == "가나"
+    await client.aclose()
@@ -0,0 +1,41 @@
+import base64
+import json
+
+import pytest
+
+from app.services.pagination import decode_cursor, encode_cursor
+
+
+def raw_cursor(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor((3, 17, 250)), (int, int, int)) == [3, 17, 250]
+
+
+def test_float_fields_accept_integral_scores():
+    assert decode_cursor(encode_cursor((1, 42)), (float, int)) == [1.0, 42]
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    raw_cursor({"a": 1}),
+    raw_cursor([1, 2]),
+    raw_cursor([1, 2, "3"]),
+    raw_cursor([1, 2, 3.5]),
+    raw_cursor([1, 2, None]),
+    raw_cursor([1, True, 3]),
+    raw_cursor([1, 2, 2 ** 40]),
+    raw_cursor([[1], 2, 3]),
+])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, (int, int, int))
+
+
+def test_non_finite_score_is_rejected():
+    cursor = base64.urlsafe_b64encode(b"[NaN,1]").decode("ascii")
+    
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, (float, int))
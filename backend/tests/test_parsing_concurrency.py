@@ -0,0 +1,146 @@
+import asyncio
+import math
+import os
+import time
+
+import docx
+import pytest
+
+from app.config import settings
+from app.services.near_duplicates import compute_signatures
+from app.services.parsing_service import _parse_docx_file, parse_docx, parse_pdf, shutdown_parser_pool
+from app.services.pdf_parser import analyze_pdf, parse_pdf_analysis
+from app.services.question_store import compute_question_signatures
+
+from tests.factories import create_question_set
+from tests.pdf_fixtures import question_pdf_pages, write_text_pdf
+
+
+pytestmark = pytest.mark.anyio
+
+# Stall allowed on top of an idle loop; parsing the test document inline stalls it ~1 s
+BASE_STALL_SECONDS = 0.1
+# The pool's workers share the CPUs with the event loop; on a box with fewer
+# CPUs than processes the loop only gets its share and everything slows down
+CONTENDED_SLOWDOWN = 2 * math.ceil((settings.parse_workers + 1) / (os.cpu_count() or 1))
+PROBE_INTERVAL_SECONDS = 0.005
+BASELINE_SECONDS = 0.5
+
+
+def write_docx(path, questions: int):
+    document = docx.Document()
+    for number in range(1, questions + 1):
+        document.add_paragraph(f"{number}. 다음 중 {number}번 문제에 대한 설명으로 옳은 것은?")
+        for symbol in "①②③④":
+            document.add_paragraph(f"{symbol} 보기 {number}{symbol}")
+        document.add_paragraph("정답: ②")
+    document.save(path)
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def big_docx(tmp_path_factory):
+    return write_docx(tmp_path_factory.mktemp("docx") / "big.docx", 2000)
+
+
+@pytest.fixture
+async def parser_pool(tmp_path):
+    # Start the workers before measuring anything
+    await parse_docx(write_docx(tmp_path / "small.docx", 1))
+    yield
+    shutdown_parser_pool()
+
+
+async def slowest_probe_while(background, probe) -> tuple:
+    """
+    Run `probe` repeatedly until `background` finishes.
+    
+    Returns (slowest probe, background result). A probe's time includes a
+    short sleep, minus its length, so time the loop spends blocked between
+    probes counts as well.
+    """
+    task = asyncio.ensure_future(background)
+    slowest = 0.0
+    probes = 0
+    while not task.done():
+        started = time.perf_counter()
+        await probe()
+        await asyncio.sleep(PROBE_INTERVAL_SECONDS)
+        slowest = max(slowest, time.perf_counter() - started - PROBE_INTERVAL_SECONDS)
+        probes += 1
+    assert probes > 1, "the background work finished before it could be observed"
+    return slowest, await task
+
+
+async def stall_budget(probe) -> float:
+    """Largest acceptable probe time during parsing, from the same probe on an idle loop."""
+    baseline, _ = await slowest_probe_while(asyncio.sleep(BASELINE_SECONDS), probe)
+    return max(baseline, BASE_STALL_SECONDS) * CONTENDED_SLOWDOWN
+
+
+async def idle():
+    await asyncio.sleep(0)
+
+
+async def test_parsing_in_pool_does_not_stall_the_event_loop(big_docx, parser_pool):
+    budget = await stall_budget(idle)
+    
+    slowest, (questions, _) = await slowest_probe_while(parse_docx(big_docx), idle)
+    
+    assert len(questions) == 2000
+    assert slowest < budget, f"event loop stalled for {slowest:.3f}s (budget {budget:.3f}s)"
+
+
+async def test_pool_results_match_inline_parsing(big_docx, parser_pool):
+    assert await parse_docx(big_docx) == _parse_docx_file(big_docx)
+
+
+async def test_sharded_pdf_parse_matches_a_single_pass(parser_pool, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "pdf_min_pages_per_shard", 2)
+    file_path = write_text_pdf(tmp_path / "bank.pdf", question_pdf_pages(6, questions_per_page=3))
+    analysis = analyze_pdf(file_path)
+    
+    questions, text = await parse_pdf(file_path)
+    
+    assert len(questions) == 18
+    assert (questions, text) == (parse_pdf_analysis(analysis), analysis.text)
+
+
+def question_texts(count: int) -> list:
+    return [f"다음 중 {number}번 문제에 대한 설명으로 옳은 것은? 보기 {number}" for number in range(count)]
+
+
+async def test_signatures_in_pool_do_not_stall_the_event_loop(parser_pool):
+    texts = question_texts(2000)
+    budget = await stall_budget(idle)
+    
+    slowest, signatures = await slowest_probe_while(compute_question_signatures(texts), idle)
+    
+    assert len(signatures) == 2000
+    assert slowest < budget, f"event loop stalled for {slowest:.3f}s (budget {budget:.3f}s)"
+
+
+async def test_pool_signatures_match_inline_signatures(parser_pool):
+    texts = question_texts(50)
+    
+    assert await compute_question_signatures(texts) == compute_signatures(texts)
+
+
+@pytest.mark.db
+async def test_quiz_submissions_stay_fast_while_uploads_parse(big_docx, parser_pool, db, client):
+    _, question_ids = await create_question_set(db, 1)
+    
+    async def submit():
+        response = await client.post(
+            "/api/quiz/submit", json={"question_id": question_ids[0], "user_answer": "B"}
+        )
+        assert response.status_code == 200
+    
+    await submit()
+    budget = await stall_budget(submit)
+    
+    slowest, _ = await slowest_probe_while(
+        asyncio.gather(parse_docx(big_docx), parse_docx(big_docx)), submit
+    )
+    
+    assert slowest < budget, f"quiz submit took {slowest:.3f}s during parsing (budget {budget:.3f}s)"
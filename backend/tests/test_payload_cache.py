@@ -0,0 +1,106 @@
+import json
+
+import pytest
+from sqlalchemy import text
+
+from app.config import settings
+from app.models import Choice, Question, QuestionType
+from app.services import payload_cache
+from app.services.payload_cache import CachedQuestion, QuestionPayloadCache, question_payloads
+
+from app.services.serializers import serialize_question
+
+from tests.factories import create_question_set
+
+
+pytestmark = pytest.mark.anyio
+
+
+def entry(size: int = 10) -> CachedQuestion:
+    return CachedQuestion(b'{"id":1', b"", [b"x" * size])
+
+
+@pytest.mark.parametrize("include_answer", [True, False])
+def test_rendered_fragments_match_the_serialized_payload(include_answer):
+    question = Question(
+        id=7, type=QuestionType.MULTIPLE_CHOICE, stem='따옴표 " 와 \\ 가 있는 문제', answer="B", explanation=None
+    )
+    choices = [Choice(label="A", text="가"), Choice(label="B", text="나\n다")]
+    
+    rendered = CachedQuestion.encode(question, choices).render(include_answer=include_answer)
+    
+    assert json.loads(rendered) == serialize_question(question, choices, include_answer=include_answer)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(payload_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = QuestionPayloadCache(max_bytes=10_000, ttl_seconds=60)
+    cache.put(1, entry())
+    
+    clock[0] += 59
+    assert cache.get(1) is not None
+    
+    clock[0] += 1
+    assert cache.get(1) is None
+    assert (len(cache), cache.size_bytes, cache.expirations) == (0, 0, 1)
+
+
+def test_put_restarts_the_ttl(clock):
+    cache = QuestionPayloadCache(max_bytes=10_000, ttl_seconds=60)
+    cache.put(1, entry())
+    clock[0] += 45
+    cache.put(1, entry())
+    clock[0] += 45
+    
+    assert cache.get(1) is not None
+
+
+def test_max_age_shortens_the_ttl_for_one_lookup(clock):
+    cache = QuestionPayloadCache(max_bytes=10_000, ttl_seconds=60)
+    cache.put(1, entry())
+    clock[0] += 10
+    
+    assert cache.get(1, max_age=90) is not None
+    assert cache.get(1, max_age=10) is None
+    assert cache.expirations == 1
+
+
+def test_least_recently_used_entries_are_evicted_first(clock):
+    one = entry()
+    cache = QuestionPayloadCache(max_bytes=one.size_bytes * 2, ttl_seconds=60)
+    cache.put(1, one)
+    cache.put(2, entry())
+    cache.get(1)
+    
+    cache.put(3, entry())
+    
+    assert cache.get(2) is None
+    assert cache.get(1) is not None and cache.get(3) is not None
+    assert cache.size_bytes == one.size_bytes * 2
+
+
+@pytest.mark.db
+async def test_question_deleted_elsewhere_is_served_for_the_unchecked_ttl_at_most(db, client, clock):
+    _, question_ids = await create_question_set(db, 2)
+    deleted = question_ids[0]
+    assert (await client.get(f"/api/questions/{deleted}")).status_code == 200
+    assert question_payloads.get(deleted) is not None
+    
+    # Bypasses the ORM, like a delete made by another worker
+    await db.execute(text("DELETE FROM choices WHERE question_id = :id"), {"id": deleted})
+    await db.execute(text("DELETE FROM questions WHERE id = :id"), {"id": deleted})
+    await db.commit()
+    
+    # Lists read their ids from the database, so they drop it at once
+    listed = (await client.get("/api/questions/")).json()
+    assert [question["id"] for question in listed] == question_ids[1:]
+    # A direct fetch skips the existence query until the entry is older than the unchecked TTL
+    assert (await client.get(f"/api/questions/{deleted}")).status_code == 200
+    clock[0] += settings.question_cache_unchecked_ttl_seconds
+    assert (await client.get(f"/api/questions/{deleted}")).status_code == 404
@@ -0,0 +1,60 @@
+from app.services.pdf_parser import map_red_choices, parse_pdf_analysis, plan_page_shards, scan_chars
+
+from tests.pdf_fixtures import BLACK, RED, page_chars, synthetic_analysis
+
+
+def test_scan_chars_breaks_lines_and_records_red_symbols():
+    chars = page_chars([("1. 문제", -1), ("① 가", -1), ("② 나", 0)])
+    
+    text, red_offsets, red_labels = scan_chars(chars)
+    
+    assert text == "1. 문제\n① 가\n② 나"
+    assert red_labels == ["B"]
+    assert text[red_offsets[0]] == "②"
+
+
+def test_red_symbol_in_black_text_is_ignored():
+    chars = [{"text": "①", "top": 0.0, "non_stroking_color": BLACK}]
+    
+    assert scan_chars(chars)[1:] == ([], [])
+
+
+def test_first_red_symbol_of_each_question_wins():
+    text = "1. 문제\n① 가 ② 나\n2. 문제\n③ 다"
+    red_offsets = [text.index("①"), text.index("②"), text.index("③")]
+    
+    assert map_red_choices(text, red_offsets, ["A", "B", "C"]) == {1: "A", 2: "C"}
+
+
+def test_question_without_red_symbol_has_no_answer():
+    text = "1. 문제\n① 가\n2. 문제\n② 나"
+    
+    assert map_red_choices(text, [text.index("②")], ["B"]) == {2: "B"}
+
+
+def test_red_answers_across_pages():
+    analysis, expected = synthetic_analysis(95, questions_per_page=10)
+    
+    assert analysis.red_answers == expected
+
+
+def test_parse_pdf_analysis_uses_red_answers():
+    analysis, expected = synthetic_analysis(12)
+    
+    questions = parse_pdf_analysis(analysis)
+    
+    assert [q["answer"] for q in questions] == [expected[number] for number in range(1, 13)]
+    assert questions[0]["choices"][0] == {"label": "A", "text": "보기 1-1"}
+
+
+def test_red_color_needs_three_components():
+    chars = [{"text": "①", "top": 0.0, "non_stroking_color": (1,)}, {"text": "②", "top": 0.0, "non_stroking_color": RED}]
+    
+    assert scan_chars(chars)[2] == ["B"]
+
+
+def test_page_shards_cover_every_page_once():
+    shards = plan_page_shards(95, 4, 10)
+    
+    assert shards[0][0] == 0 and shards[-1][1] == 95
+    assert all(a[1] == b[0] for a, b in zip(shards, shards[1:]))
@@ -0,0 +1,97 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event, insert
+
+from app.models import Bookmark, QuestionStat
+from app.services.payload_cache import question_payloads
+from app.services.question_stats import FREQUENTLY_WRONG_MIN_ATTEMPTS
+
+from tests.factories import create_question_set
+
+
+pytestmark = [pytest.mark.anyio, pytest.mark.db]
+
+
+@contextmanager
+def count_statements(engine):
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+async def add_questions(db, count: int, start: int):
+    """Store questions that every listing endpoint below returns: bookmarked and frequently wrong."""
+    _, question_ids = await create_question_set(db, count, start=start)
+    await db.execute(insert(Bookmark), [{"question_id": question_id} for question_id in question_ids])
+    await db.execute(insert(QuestionStat), [
+        {
+            "question_id": question_id,
+            "attempts": FREQUENTLY_WRONG_MIN_ATTEMPTS,
+            "corrects": 0,
+            "accuracy": 0.0,
+            "rolling_accuracy": 0.0,
+        }
+        for question_id in question_ids
+    ])
+    await db.commit()
+    return question_ids
+
+
+ENDPOINTS = [
+    ("GET", "/api/questions/?limit=100", None),
+    ("GET", "/api/questions/?pagination=cursor&limit=100", None),
+    ("POST", "/api/quiz/start", {}),
+    ("GET", "/api/quiz/bookmarked", None),
+    ("GET", "/api/quiz/frequently-wrong", None),
+]
+
+
+@pytest.mark.parametrize("method,url,body", ENDPOINTS)
+async def test_statement_count_does_not_grow_with_questions(db, client, migrated_engine, method, url, body):
+    counts = []
+    returned = []
+    start = 0
+    for count in (3, 60):
+        await add_questions(db, count, start)
+        start += count
+        # Cold payload cache, so choices are actually loaded
+        question_payloads.clear()
+        
+        with count_statements(migrated_engine) as statements:
+            response = await client.request(method, url, json=body)
+        
+        assert response.status_code == 200
+        payload = response.json()
+        items = payload if isinstance(payload, list) else payload.get("items", payload.get("questions"))
+        returned.append(len(items))
+        counts.append(len(statements))
+    
+    assert returned == [3, 63]
+    assert counts[0] == counts[1], counts
+
+
+async def test_choices_are_returned_in_order(db, client):
+    await add_questions(db, 2, 0)
+    
+    response = await client.get("/api/questions/")
+    
+    assert [[c["label"] for c in q["choices"]] for q in response.json()] == [list("ABCD")] * 2
+
+
+async def test_cached_question_is_served_without_a_query(db, client, migrated_engine):
+    _, question_ids = await create_question_set(db, 1)
+    assert (await client.get(f"/api/questions/{question_ids[0]}")).status_code == 200
+    
+    with count_statements(migrated_engine) as statements:
+        response = await client.get(f"/api/questions/{question_ids[0]}")
+    
+    assert response.status_code == 200
+    assert statements == []
@@ -0,0 +1,105 @@
+import json
+
+import pytest
+from sqlalchemy import text
+
+from app.services.question_search import build_search_statement
+
+
+pytestmark = [pytest.mark.anyio, pytest.mark.db]
+
+
+# (hot query, table it reads, index it must use)
+HOT_QUERIES = [
+    (
+        "SELECT * FROM choices WHERE question_id = ANY(:ids) ORDER BY question_id, order_index",
+        {"ids": [1, 2, 3]},
+        "choices", "ix_choices_question_order",
+    ),
+    (
+        "SELECT question_set_id, order_index, id FROM questions WHERE question_set_id = :set_id "
+        "ORDER BY question_set_id, order_index, id LIMIT 50",
+        {"set_id": 1},
+        "questions", "ix_questions_keyset",
+    ),
+    (
+        "SELECT question_set_id, order_index, id FROM questions "
+        "WHERE (question_set_id, order_index, id) > (:set_id, :order_index, :id) "
+        "ORDER BY question_set_id, order_index, id LIMIT 50",
+        {"set_id": 1, "order_index": 10, "id": 10},
+        "questions", "ix_questions_keyset",
+    ),
+    (
+        "SELECT id FROM questions WHERE type = 'SHORT_ANSWER' AND question_set_id = ANY(:set_ids)",
+        {"set_ids": [1, 2]},
+        "questions", "ix_questions_type_set",
+    ),
+    (
+        "SELECT question_id FROM question_stats WHERE accuracy < 0.5 AND attempts >= 3",
+        {},
+        "question_stats", "ix_question_stats_accuracy_attempts",
+    ),
+    (
+        "SELECT id FROM bookmarks WHERE question_id = :question_id",
+        {"question_id": 1},
+        "bookmarks", "uq_bookmarks_question_id",
+    ),
+    (
+        "SELECT * FROM attempt_history WHERE question_id = :question_id ORDER BY attempted_at DESC LIMIT 20",
+        {"question_id": 1},
+        "attempt_history", "ix_attempt_history_question_attempted",
+    ),
+    (
+        "SELECT question_id FROM review_states WHERE due_at <= now() ORDER BY due_at LIMIT 20",
+        {},
+        "review_states", "ix_review_states_due_at",
+    ),
+]
+
+
+def plan_scans(node, scans=None):
+    """(node type, relation, index) of every scan in an EXPLAIN (FORMAT JSON) plan."""
+    if scans is None:
+        scans = []
+    if "Relation Name" in node or "Index Name" in node:
+        scans.append((node["Node Type"], node.get("Relation Name"), node.get("Index Name")))
+    for child in node.get("Plans", ()):
+        plan_scans(child, scans)
+    return scans
+
+
+def result_scans(result) -> list:
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan_scans(plan[0]["Plan"])
+
+
+async def explain_scans(db, sql: str, params: dict) -> list:
+    return result_scans(await db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"), params))
+
+
+@pytest.mark.parametrize("sql,params,table,index", HOT_QUERIES, ids=[query[3] for query in HOT_QUERIES])
+async def test_hot_query_uses_its_index(db, sql, params, table, index):
+    # The test tables are tiny, where a sequential scan is always cheapest.
+    # Disabling it checks that an index matching the query shape exists.
+    await db.execute(text("SET LOCAL enable_seqscan = off"))
+    scans = await explain_scans(db, sql, params)
+    
+    assert ("Seq Scan", table, None) not in scans, scans
+    assert index in {scan_index for _, _, scan_index in scans}, scans
+
+
+@pytest.mark.parametrize("query", ["광합성", "광합성 엽록체", "합성"])
+async def test_search_uses_both_gin_indexes(db, query):
+    # The statement the endpoint runs, with its own bind parameters
+    compiled = build_search_statement(query).limit(21).compile(dialect=db.bind.dialect)
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    
+    await db.execute(text("SET LOCAL enable_seqscan = off"))
+    connection = await db.connection()
+    scans = result_scans(await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params))
+    
+    assert ("Seq Scan", "questions", None) not in scans, scans
+    indexes = {scan_index for _, _, scan_index in scans}
+    assert {"ix_questions_search_vector", "ix_questions_search_trgm"} <= indexes, scans
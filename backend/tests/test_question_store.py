@@ -0,0 +1,84 @@
+import pytest
+from sqlalchemy import select
+
+from app.config import settings
+from app.models import Choice, Question, QuestionSet, QuestionSignature
+from app.services.question_store import bulk_insert_questions, clone_questions
+
+from tests.factories import create_question_set, multiple_choice_data
+
+
+pytestmark = [pytest.mark.anyio, pytest.mark.db]
+
+
+async def stored_questions(db, question_set_id):
+    result = await db.execute(
+        select(Question).where(Question.question_set_id == question_set_id).order_by(Question.order_index)
+    )
+    return result.scalars().all()
+
+
+async def stored_choices(db, question_id):
+    result = await db.execute(
+        select(Choice.label, Choice.text).where(Choice.question_id == question_id).order_by(Choice.order_index)
+    )
+    return [tuple(row) for row in result.all()]
+
+
+@pytest.mark.parametrize("copy_threshold", [10_000, 1], ids=["insert", "copy"])
+async def test_bulk_insert_keeps_input_order(db, monkeypatch, copy_threshold):
+    monkeypatch.setattr(settings, "bulk_copy_threshold", copy_threshold)
+    data = multiple_choice_data(25)
+    question_set = QuestionSet(name="세트")
+    db.add(question_set)
+    await db.flush()
+    
+    question_ids = await bulk_insert_questions(db, question_set.id, data)
+    await db.commit()
+    
+    questions = await stored_questions(db, question_set.id)
+    assert [q.id for q in questions] == question_ids
+    assert [q.stem for q in questions] == [item["stem"] for item in data]
+    assert await stored_choices(db, question_ids[3]) == [(c["label"], c["text"]) for c in data[3]["choices"]]
+    
+    result = await db.execute(select(QuestionSignature.question_id).order_by(QuestionSignature.question_id))
+    assert result.scalars().all() == sorted(question_ids)
+
+
+async def test_malformed_item_writes_nothing(db):
+    question_set = QuestionSet(name="세트")
+    db.add(question_set)
+    await db.flush()
+    data = multiple_choice_data(3)
+    del data[2]["answer"]
+    
+    with pytest.raises(KeyError):
+        await bulk_insert_questions(db, question_set.id, data)
+    
+    assert await stored_questions(db, question_set.id) == []
+
+
+async def test_near_duplicates_are_skipped_when_configured(db, monkeypatch):
+    monkeypatch.setattr(settings, "near_duplicate_action", "skip")
+    question_set_id, _ = await create_question_set(db, 3)
+    
+    data = multiple_choice_data(1) + multiple_choice_data(1, start=50)
+    question_ids = await bulk_insert_questions(db, question_set_id, data, start_index=3)
+    
+    assert question_ids[0] is None
+    assert question_ids[1] is not None
+
+
+async def test_clone_copies_questions_and_choices(db):
+    source_id, source_ids = await create_question_set(db, 4)
+    target = QuestionSet(name="복제")
+    db.add(target)
+    await db.flush()
+    
+    copied = await clone_questions(db, source_id, target.id)
+    await db.commit()
+    
+    clones = await stored_questions(db, target.id)
+    assert copied == 4
+    assert [q.stem for q in clones] == [q.stem for q in await stored_questions(db, source_id)]
+    assert await stored_choices(db, clones[0].id) == await stored_choices(db, source_ids[0])
@@ -0,0 +1,60 @@
+import pytest
+
+from tests.factories import create_question_set
+from tests.test_pagination import raw_cursor
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("limit", [0, -5, 101])
+async def test_list_limit_out_of_range_is_rejected(client, limit):
+    response = await client.get("/api/questions/", params={"limit": limit, "pagination": "cursor"})
+    
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("cursor", [raw_cursor([1, 2]), raw_cursor([1, "x", 3]), raw_cursor([1, 2, 2 ** 40])])
+async def test_tampered_list_cursor_is_a_bad_request(client, cursor):
+    response = await client.get("/api/questions/", params={"cursor": cursor})
+    
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("limit", [0, -1, 101])
+async def test_search_limit_out_of_range_is_rejected(client, limit):
+    response = await client.get("/api/questions/search", params={"q": "광합성", "limit": limit})
+    
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("limit", [0, -1, 51])
+async def test_similar_limit_out_of_range_is_rejected(client, limit):
+    response = await client.get("/api/questions/1/similar", params={"limit": limit})
+    
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("cursor", [raw_cursor([1.5]), raw_cursor(["x", 3]), raw_cursor([float("nan"), 3])])
+async def test_tampered_search_cursor_is_a_bad_request(client, cursor):
+    response = await client.get("/api/questions/search", params={"q": "광합성", "cursor": cursor})
+    
+    assert response.status_code == 400
+
+
+@pytest.mark.db
+async def test_cursor_pages_cover_every_question_once(db, client):
+    _, first_ids = await create_question_set(db, 4)
+    _, second_ids = await create_question_set(db, 3, start=10)
+    
+    seen = []
+    cursor = None
+    while True:
+        params = {"pagination": "cursor", "limit": 3, **({"cursor": cursor} if cursor else {})}
+        page = (await client.get("/api/questions/", params=params)).json()
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    
+    assert seen == first_ids + second_ids
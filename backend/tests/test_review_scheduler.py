@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.models import ReviewState
+from app.services.review_scheduler import (
+    FIRST_INTERVAL_DAYS,
+    RELEARN_DELAY,
+    SECOND_INTERVAL_DAYS,
+    apply_review,
+    backfill_review_states,
+    review_outcome,
+)
+
+from tests.factories import create_question_set
+
+
+pytestmark = pytest.mark.anyio
+
+START = datetime(2026, 3, 2, 9, 0)
+
+
+def test_first_correct_review_schedules_the_first_interval():
+    state = apply_review(None, True, START)
+    
+    assert state.repetitions == 1
+    assert state.due_at == START + timedelta(days=FIRST_INTERVAL_DAYS)
+
+
+def test_correct_review_when_due_grows_the_interval():
+    state = apply_review(None, True, START)
+    
+    state = apply_review(state, True, state.due_at)
+    
+    assert state.repetitions == 2
+    assert state.interval_days == SECOND_INTERVAL_DAYS
+
+
+def test_correct_review_before_due_leaves_the_schedule_unchanged():
+    state = apply_review(None, True, START)
+    
+    assert apply_review(state, True, START + timedelta(hours=1)) == state
+
+
+def test_wrong_review_before_due_still_lapses():
+    state = apply_review(apply_review(None, True, START), True, START + timedelta(days=1))
+    
+    lapsed = apply_review(state, False, START + timedelta(days=2))
+    
+    assert (lapsed.repetitions, lapsed.lapses) == (0, 1)
+    assert lapsed.due_at == START + timedelta(days=2) + RELEARN_DELAY
+
+
+def test_retry_within_relearn_delay_does_not_count():
+    lapsed = apply_review(None, False, START)
+    
+    assert apply_review(lapsed, True, START + RELEARN_DELAY / 2) == lapsed
+    assert apply_review(lapsed, True, START + RELEARN_DELAY).repetitions == 1
+
+
+@pytest.mark.parametrize("outcomes, expected", [
+    ([True], True),
+    ([True, True, True], True),
+    ([True, False], False),
+    ([False, True], False),
+])
+def test_repeats_in_one_submission_pass_only_if_all_correct(outcomes, expected):
+    assert review_outcome(outcomes) is expected
+
+
+async def review_state(db, question_id):
+    result = await db.execute(
+        select(ReviewState).where(ReviewState.question_id == question_id).execution_options(populate_existing=True)
+    )
+    state = result.scalar_one()
+    return state.repetitions, state.lapses, state.interval_days, state.due_at
+
+
+@pytest.mark.db
+async def test_repeats_in_a_batch_count_as_one_review(db, client):
+    _, question_ids = await create_question_set(db, 2)
+    
+    response = await client.post("/api/quiz/submit-batch", json={"submission_id": "repeats", "answers": [
+        {"question_id": question_ids[0], "user_answer": "B"},
+        {"question_id": question_ids[0], "user_answer": "B"},
+        {"question_id": question_ids[0], "user_answer": "B"},
+        {"question_id": question_ids[1], "user_answer": "B"},
+        {"question_id": question_ids[1], "user_answer": "A"},
+    ]})
+    assert response.status_code == 200
+    
+    assert (await review_state(db, question_ids[0]))[:3] == (1, 0, FIRST_INTERVAL_DAYS)
+    assert (await review_state(db, question_ids[1]))[:3] == (0, 1, 0.0)
+
+
+@pytest.mark.db
+async def test_backfill_replays_batches_as_they_were_scheduled(db, client):
+    _, question_ids = await create_question_set(db, 2)
+    answers = [
+        {"question_id": question_ids[0], "user_answer": "B"},
+        {"question_id": question_ids[0], "user_answer": "B"},
+        {"question_id": question_ids[1], "user_answer": "A"},
+        {"question_id": question_ids[1], "user_answer": "A"},
+    ]
+    for submission in range(2):
+        response = await client.post(
+            "/api/quiz/submit-batch", json={"submission_id": f"replay-{submission}", "answers": answers}
+        )
+        assert response.status_code == 200
+    live = [await review_state(db, question_id) for question_id in question_ids]
+    
+    await backfill_review_states(db)
+    await db.commit()
+    
+    assert [await review_state(db, question_id) for question_id in question_ids] == live
@@ -0,0 +1,73 @@
+import pytest
+
+from app.config import settings
+from app.routers.upload import MULTIPART_OVERHEAD_BYTES
+
+
+pytestmark = pytest.mark.anyio
+
+LIMIT_BYTES = 1024
+
+
+@pytest.fixture
+def small_upload_limit(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "max_upload_bytes", LIMIT_BYTES)
+    monkeypatch.setattr(settings, "file_storage_path", str(tmp_path))
+    return tmp_path
+
+
+MULTIPART_HEAD = (
+    b"--boundary\r\n"
+    b'Content-Disposition: form-data; name="file"; filename="big.pdf"\r\n'
+    b"Content-Type: application/pdf\r\n\r\n"
+)
+
+
+def multipart_body(size: int) -> bytes:
+    return MULTIPART_HEAD + b"x" * size + b"\r\n--boundary--\r\n"
+
+
+async def test_oversized_content_length_is_rejected_before_reading(client, small_upload_limit):
+    body_read = False
+    
+    async def body():
+        nonlocal body_read
+        body_read = True
+        yield multipart_body(LIMIT_BYTES + MULTIPART_OVERHEAD_BYTES + 1)
+    
+    size = len(multipart_body(LIMIT_BYTES + MULTIPART_OVERHEAD_BYTES + 1))
+    response = await client.post(
+        "/api/upload/pdf",
+        content=body(),
+        headers={"Content-Type": "multipart/form-data; boundary=boundary", "Content-Length": str(size)},
+    )
+    
+    assert response.status_code == 413
+    assert not body_read
+    assert list(small_upload_limit.iterdir()) == []
+
+
+async def test_oversized_chunked_body_is_rejected_while_streaming(client, small_upload_limit):
+    chunks_sent = 0
+    
+    async def body():
+        nonlocal chunks_sent
+        yield MULTIPART_HEAD
+        for _ in range(1000):
+            chunks_sent += 1
+            yield b"x" * 1024
+    
+    response = await client.post(
+        "/api/upload/pdf",
+        content=body(),
+        headers={"Content-Type": "multipart/form-data; boundary=boundary"},
+    )
+    
+    assert response.status_code == 413
+    assert chunks_sent < 1000
+
+
+async def test_other_routes_are_not_capped(client, small_upload_limit):
+    response = await client.post("/api/quiz/submit-batch", content=b"x" * (LIMIT_BYTES + MULTIPART_OVERHEAD_BYTES + 1))
+    
+    assert response.status_code != 413
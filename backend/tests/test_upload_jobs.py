@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+import docx
+import pytest
+from sqlalchemy import func, select
+
+from app.config import settings
+from app.models import ParsedDocument
+from app.services import llm_service
+from app.services.parsing_service import shutdown_parser_pool
+from app.services.upload_jobs import upload_queue
+
+
+pytestmark = [pytest.mark.anyio, pytest.mark.db]
+
+GENERATED = json.dumps([
+    {
+        "stem": "광합성이 일어나는 세포 소기관은?",
+        "choices": [{"label": "A", "text": "엽록체"}, {"label": "B", "text": "핵"}],
+        "answer": "A",
+        "explanation": "엽록체에서 광합성이 일어난다.",
+    }
+], ensure_ascii=False)
+
+
+@pytest.fixture
+async def upload_workers(db, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "file_storage_path", str(tmp_path / "uploads"))
+    await upload_queue.start()
+    yield
+    await upload_queue.stop()
+    shutdown_parser_pool()
+
+
+@pytest.fixture
+def llm_responses(monkeypatch):
+    responses = []
+    
+    async def generate(prompt, **kwargs):
+        return responses.pop(0)
+    
+    monkeypatch.setattr(llm_service.ollama_client, "generate", generate)
+    return responses
+
+
+def lecture_notes(path) -> bytes:
+    """A DOCX of learning material without questions, so it goes to the LLM."""
+    document = docx.Document()
+    document.add_paragraph("광합성은 식물이 빛 에너지를 이용해 이산화탄소와 물로 포도당을 만드는 과정이다. " * 3)
+    document.add_paragraph("광합성은 엽록체에서 일어나며 산소가 부산물로 만들어진다.")
+    document.save(path)
+    return path.read_bytes()
+
+
+async def upload_and_wait(client, content: bytes) -> dict:
+    response = await client.post(
+        "/api/upload/docx", files={"file": ("notes.docx", content, "application/octet-stream")}
+    )
+    assert response.status_code == 202
+    job = response.json()
+    for _ in range(200):
+        if job["status"] in ("completed", "failed"):
+            return job
+        await asyncio.sleep(0.05)
+        job = (await client.get(f"/api/upload/jobs/{job['job_id']}")).json()
+    raise AssertionError(f"upload job did not finish: {job}")
+
+
+async def test_failed_generation_is_not_reused_by_a_reupload(db, client, upload_workers, llm_responses, tmp_path):
+    content = lecture_notes(tmp_path / "notes.docx")
+    
+    llm_responses.append("죄송합니다. 문제를 만들 수 없습니다.")
+    failed = await upload_and_wait(client, content)
+    
+    assert failed["status"] == "failed"
+    assert await db.scalar(select(func.count()).select_from(ParsedDocument)) == 0
+    
+    llm_responses.append(GENERATED)
+    retried = await upload_and_wait(client, content)
+    
+    assert retried["status"] == "completed"
+    assert retried["processing_mode"] == "generated"
+    assert retried["questions_count"] == 1
+    assert await db.scalar(select(func.count()).select_from(ParsedDocument)) == 1
@@ -11,31 +11,54 @@ export const apiClient = axios.create({
 
 // Upload API
 export const uploadAPI = {
-    uploadPDF: (file: File) => {
+    uploadPDF: (file: File, forceReprocess = false) => {
         const formData = new FormData();
         formData.append('file', file);
         return apiClient.post('/api/upload/pdf', formData, {
             headers: { 'Content-Type': 'multipart/form-data' },
+            params: forceReprocess ? { force_reprocess: true } : undefined,
         });
     },
 
-    uploadDOCX: (file: File) => {
+    uploadDOCX: (file: File, forceReprocess = false) => {
         const formData = new FormData();
         formData.append('file', file);
         return apiClient.post('/api/upload/docx', formData, {
             headers: { 'Content-Type': 'multipart/form-data' },
+            params: forceReprocess ? { force_reprocess: true } : undefined,
         });
     },
+
+    getJob: (jobId: number) =>
+        apiClient.get(`/api/upload/jobs/${jobId}`),
+
+    // Poll a background upload job until it completes or fails
+    waitForJob: async (jobId: number, intervalMs = 1000) => {
+        for (;;) {
+            const response = await uploadAPI.getJob(jobId);
+            if (response.data.status === 'completed') return response;
+            if (response.data.status === 'failed') {
+                throw { response: { data: { detail: response.data.error } } };
+            }
+            await new Promise((resolve) => setTimeout(resolve, intervalMs));
+        }
+    },
 };
 
 // Questions API
 export const questionsAPI = {
-    getQuestions: (params?: { question_set_id?: number; question_type?: string; limit?: number; offset?: number }) =>
+    getQuestions: (params?: { question_set_id?: number; question_type?: string; limit?: number; offset?: number; pagination?: 'offset' | 'cursor'; cursor?: string }) =>
         apiClient.get('/api/questions/', { params }),
 
+    searchQuestions: (params: { q: string; question_set_id?: number; question_type?: string; limit?: number; cursor?: string }) =>
+        apiClient.get('/api/questions/search', { params }),
+
     getQuestion: (id: number) =>
         apiClient.get(`/api/questions/${id}`),
 
+    getSimilarQuestions: (id: number, params?: { threshold?: number; limit?: number }) =>
+        apiClient.get(`/api/questions/${id}/similar`, { params }),
+
     generateQuestions: (data: { content: string; num_questions?: number; question_type?: string; question_set_name?: string }) =>
         apiClient.post('/api/questions/generate', data),
 
@@ -69,9 +92,38 @@ export const quizAPI = {
     }) =>
         apiClient.post('/api/quiz/start', data),
 
+    createSession: (data: {
+        question_set_ids?: number[];
+        question_type?: string;
+        shuffle_questions?: boolean;
+        shuffle_choices?: boolean;
+        bookmarked_only?: boolean;
+        frequently_wrong_only?: boolean;
+        limit?: number;
+        seed?: number;
+    }) =>
+        apiClient.post('/api/quiz/sessions', data),
+
+    getNextSessionQuestions: (sessionId: string, size?: number) =>
+        apiClient.get(`/api/quiz/sessions/${sessionId}/next`, { params: { size } }),
+
     submitAnswer: (data: { question_id: number; user_answer: string; time_spent_seconds?: number }) =>
         apiClient.post('/api/quiz/submit', data),
 
+    submitAnswersBatch: (data: {
+        submission_id: string;
+        answers: { question_id: number; user_answer: string; time_spent_seconds?: number }[];
+    }) =>
+        apiClient.post('/api/quiz/submit-batch', data),
+
+    getReviewQuestions: (data?: {
+        question_set_ids?: number[];
+        question_type?: string;
+        limit?: number;
+        include_new?: boolean;
+    }) =>
+        apiClient.post('/api/quiz/review', data ?? {}),
+
     getBookmarkedQuestions: () =>
         apiClient.get('/api/quiz/bookmarked'),
 
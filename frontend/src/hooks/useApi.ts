@@ -27,7 +27,10 @@ export const useUploadPDF = () => {
     const queryClient = useQueryClient();
 
     return useMutation({
-        mutationFn: (file: File) => uploadAPI.uploadPDF(file),
+        mutationFn: async (file: File) => {
+            const response = await uploadAPI.uploadPDF(file);
+            return uploadAPI.waitForJob(response.data.job_id);
+        },
         onSuccess: () => {
             queryClient.invalidateQueries({ queryKey: ['questions'] });
             queryClient.invalidateQueries({ queryKey: ['questionSets'] });
@@ -39,7 +42,10 @@ export const useUploadDOCX = () => {
     const queryClient = useQueryClient();
 
     return useMutation({
-        mutationFn: (file: File) => uploadAPI.uploadDOCX(file),
+        mutationFn: async (file: File) => {
+            const response = await uploadAPI.uploadDOCX(file);
+            return uploadAPI.waitForJob(response.data.job_id);
+        },
         onSuccess: () => {
             queryClient.invalidateQueries({ queryKey: ['questions'] });
             queryClient.invalidateQueries({ queryKey: ['questionSets'] });
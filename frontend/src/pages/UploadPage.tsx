@@ -1,5 +1,14 @@
 import { useState } from 'react';
 import { useUploadPDF, useUploadDOCX } from '../hooks/useApi';
+import type { UploadJob } from '../types';
+
+const PROCESSING_MODE_TEXT: Record<NonNullable<UploadJob['processing_mode']>, string> = {
+    extracted: '문제를 직접 추출했습니다',
+    generated: 'AI가 문제를 생성했습니다',
+    reused: '이미 처리된 파일입니다. 기존 문제집을 그대로 사용했습니다',
+    cloned: '같은 내용의 파일이 있어 기존 문제를 복사했습니다',
+    cached: '이전 처리 결과로 문제집을 다시 만들었습니다',
+};
 
 export default function UploadPage() {
     const [selectedFile, setSelectedFile] = useState<File | null>(null);
@@ -40,9 +49,9 @@ export default function UploadPage() {
             const mutation = isPDF ? uploadPDFMutation : uploadDOCXMutation;
             const response = await mutation.mutateAsync(selectedFile);
             const data = response.data;
-            const modeText = data.processing_mode === 'extracted'
-                ? '문제를 직접 추출했습니다'
-                : 'AI가 문제를 생성했습니다';
+            const modeText = data.processing_mode
+                ? PROCESSING_MODE_TEXT[data.processing_mode]
+                : PROCESSING_MODE_TEXT.generated;
 
             setUploadResult({
                 success: true,
@@ -17,6 +17,7 @@ export interface QuestionSet {
     name: string;
     description?: string;
     file_name?: string;
+    content_hash?: string;
     created_at: string;
 }
 
@@ -43,3 +44,18 @@ export interface SubmitAnswerResponse {
     explanation?: string;
     user_answer: string;
 }
+
+export interface UploadJob {
+    job_id: number;
+    status: 'queued' | 'running' | 'completed' | 'failed';
+    stage: string;
+    file_name: string;
+    file_size?: number;
+    content_hash?: string;
+    pages_total?: number;
+    pages_done?: number;
+    processing_mode?: 'extracted' | 'generated' | 'reused' | 'cloned' | 'cached';
+    question_set_id?: number;
+    questions_count?: number;
+    error?: string;
+}